@@ -0,0 +1,79 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2017 Digi International Inc. All Rights Reserved.
+
+"""
+Measures the time to escape and unescape random payloads of 1 byte, 100
+bytes and 2 KB, as the escaped API mode does with every frame.
+
+Run it from the root of the repository (or with the library installed)::
+
+    PYTHONPATH=. python benchmarks/escaping.py [--number N] [--repeat R]
+
+Times are the best of ``R`` runs of ``N`` calls, in microseconds per call:
+
+* ``escape``: escape of a bytearray.
+* ``unescape``: unescape of the escaped bytearray.
+* ``unescape (view)``: unescape of a memoryview slice of a bigger buffer,
+  as the packet listener does, into a reused buffer.
+"""
+
+import argparse
+import random
+import timeit
+
+from digi.xbee.packets.base import XBeePacket
+
+
+SIZES = (1, 100, 2048)
+
+
+def best_time(function, number, repeat):
+    """
+    Returns the best time of a call to the provided function.
+
+    Args:
+        function (Function): the function to measure.
+        number (Integer): number of calls of every run.
+        repeat (Integer): number of runs.
+
+    Returns:
+        Float: the best time of a call, in microseconds.
+    """
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Escape/unescape benchmark of the escaped API mode.")
+    parser.add_argument("--number", type=int, default=2000, help="calls per run (default: 2000)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs, the best one is reported (default: 5)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random payloads (default: 0)")
+    args = parser.parse_args()
+
+    rand = random.Random(args.seed)
+    print("%8s %10s %10s %16s" % ("size", "escape", "unescape", "unescape (view)"))
+    for size in SIZES:
+        data = bytearray(rand.getrandbits(8) for _ in range(size))
+        escaped = XBeePacket._escape_data(data)
+        # The escaped data in the middle of a bigger buffer, as read from the serial port.
+        view = memoryview(b"\x00" * 16 + bytes(escaped) + b"\x00" * 16)[16:16 + len(escaped)]
+        if XBeePacket._unescape_data(escaped) != data or XBeePacket._unescape_data(view) != data:
+            raise ValueError("Payload of %d bytes does not survive an escape/unescape round trip" % size)
+
+        buffer = bytearray()
+
+        def unescape_view():
+            del buffer[:]
+            XBeePacket._unescape_data(view, buffer)
+
+        print("%8d %10.2f %10.2f %16.2f" % (
+            size,
+            best_time(lambda: XBeePacket._escape_data(data), args.number, args.repeat),
+            best_time(lambda: XBeePacket._unescape_data(escaped), args.number, args.repeat),
+            best_time(unescape_view, args.number, args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2017 Digi International Inc. All Rights Reserved.
+
+"""
+Measures the time to encode and decode a sample frame of every frame type
+of :mod:`digi.xbee.packets`, in API and escaped API modes.
+
+Run it from the root of the repository (or with the library installed)::
+
+    PYTHONPATH=. python benchmarks/packets.py [--number N] [--repeat R]
+
+Times are the best of ``R`` runs of ``N`` calls, in microseconds per call:
+
+* ``encode``: :meth:`.XBeePacket.output` of the frame.
+* ``decode``: :func:`.factory.build_frame` of the encoded frame, or the
+  ``create_packet`` method of its class for the frame types the factory does
+  not build (the ones only sent to the XBee device).
+"""
+
+import argparse
+from ipaddress import IPv4Address
+import timeit
+
+from digi.xbee.packets.aft import ApiFrameType
+from digi.xbee.packets.cellular import TXSMSPacket, RXSMSPacket
+from digi.xbee.packets.common import ATCommPacket, ATCommResponsePacket, ReceivePacket, RemoteATCommandPacket, \
+    RemoteATCommandResponsePacket, TransmitPacket, TransmitStatusPacket, ModemStatusPacket, \
+    IODataSampleRxIndicatorPacket, ExplicitAddressingPacket, ExplicitRXIndicatorPacket, \
+    NodeIdentificationIndicatorPacket
+from digi.xbee.packets.devicecloud import DeviceRequestPacket, DeviceResponsePacket, DeviceResponseStatusPacket, \
+    FrameErrorPacket, SendDataRequestPacket, SendDataResponsePacket
+from digi.xbee.packets.factory import build_frame
+from digi.xbee.packets.network import RXIPv4Packet, TXIPv4Packet
+from digi.xbee.packets.raw import TX64Packet, TX16Packet, TXStatusPacket, RX16IOPacket, RX64IOPacket, RX16Packet, \
+    RX64Packet
+from digi.xbee.packets.wifi import IODataSampleRxIndicatorWifiPacket, RemoteATCommandWifiPacket, \
+    RemoteATCommandResponseWifiPacket
+from digi.xbee.packets.zigbee import CreateSourceRoutePacket, ManyToOneRouteRequestPacket, \
+    RouteRecordIndicatorPacket
+from digi.xbee.packets.base import GenericXBeePacket
+from digi.xbee.models.address import XBee16BitAddress, XBee64BitAddress
+from digi.xbee.models.mode import OperatingMode
+from digi.xbee.models.options import SendDataRequestOptions
+from digi.xbee.models.protocol import IPProtocol, Role
+from digi.xbee.models.status import ATCommandStatus, DeviceCloudStatus, FrameError, ModemStatus, \
+    NodeIdentificationEvent, TransmitStatus
+
+
+X64 = XBee64BitAddress.from_hex_string("0013A20040A1B2C3")
+X16 = XBee16BitAddress.from_hex_string("7D11")  # Needs escaping.
+IP = IPv4Address("192.168.1.125")
+DATA = bytearray(b"temperature=21.5;humidity=48;status=ok")
+# 1 sample, DIO0-3 and AD0 enabled.
+IO_DATA = bytearray((0x01, 0x00, 0x0F, 0x01, 0x00, 0x0A, 0x02, 0x1F))
+# 1 sample, DIO0-3 and AD0 enabled (802.15.4 format).
+IO_DATA_802 = bytearray((0x01, 0x02, 0x0F, 0x00, 0x0A, 0x02, 0x1F))
+
+
+def sample_packets():
+    """
+    Returns a sample packet of every frame type.
+
+    Returns:
+        List: list of :class:`.XBeePacket`.
+    """
+    return [
+        GenericXBeePacket(DATA),
+        ATCommPacket(1, "NI", bytearray(b"node")),
+        ATCommResponsePacket(1, "NI", ATCommandStatus.OK, bytearray(b"node")),
+        ReceivePacket(X64, X16, 0x01, DATA),
+        RX64Packet(X64, 40, 0x00, DATA),
+        RX16Packet(X16, 40, 0x00, DATA),
+        RemoteATCommandPacket(1, X64, X16, 0x02, "D0", bytearray((0x05,))),
+        RemoteATCommandResponsePacket(1, X64, X16, "D0", ATCommandStatus.OK, bytearray((0x05,))),
+        TransmitPacket(1, X64, X16, 0, 0, DATA),
+        TransmitStatusPacket(1, X16, 0, TransmitStatus.SUCCESS),
+        ModemStatusPacket(ModemStatus.HARDWARE_RESET),
+        TXStatusPacket(1, TransmitStatus.SUCCESS),
+        RX16IOPacket(X16, 40, 0x00, IO_DATA_802),
+        RX64IOPacket(X64, 40, 0x00, IO_DATA_802),
+        IODataSampleRxIndicatorPacket(X64, X16, 0x01, IO_DATA),
+        NodeIdentificationIndicatorPacket(X64, X16, 0x02, X16, X64, "node", XBee16BitAddress.UNKNOWN_ADDRESS,
+                                          Role.ROUTER, NodeIdentificationEvent.JOIN, 0xC105, 0x101E),
+        ExplicitAddressingPacket(1, X64, X16, 0xE8, 0xE8, 0x0011, 0xC105, 0, 0, DATA),
+        ExplicitRXIndicatorPacket(X64, X16, 0xE8, 0xE8, 0x0011, 0xC105, 0x01, DATA),
+        TXSMSPacket(1, "+34600000000", "temperature=21.5"),
+        TXIPv4Packet(1, IP, 9750, 9750, IPProtocol.UDP, 0, DATA),
+        RXSMSPacket("+34600000000", "temperature=21.5"),
+        RXIPv4Packet(IP, 9750, 9750, IPProtocol.UDP, DATA),
+        RemoteATCommandWifiPacket(1, IP, 0x02, "D0", bytearray((0x05,))),
+        SendDataRequestPacket(1, "sensors/data.txt", "text/plain", SendDataRequestOptions.OVERWRITE, DATA),
+        DeviceResponsePacket(1, 0x10, DATA),
+        RemoteATCommandResponseWifiPacket(1, IP, "D0", ATCommandStatus.OK, bytearray((0x05,))),
+        IODataSampleRxIndicatorWifiPacket(IP, 40, 0x00, IO_DATA),
+        SendDataResponsePacket(1, DeviceCloudStatus.SUCCESS),
+        DeviceRequestPacket(0x10, "target", DATA),
+        DeviceResponseStatusPacket(1, DeviceCloudStatus.SUCCESS),
+        FrameErrorPacket(FrameError.INVALID_CHECKSUM),
+        CreateSourceRoutePacket(1, X64, X16, 0, [X16, XBee16BitAddress.from_hex_string("1234")]),
+        RouteRecordIndicatorPacket(X64, X16, 0x01, [X16, XBee16BitAddress.from_hex_string("1234")]),
+        ManyToOneRouteRequestPacket(X64, X16),
+        TX64Packet(1, X64, 0, DATA),
+        TX16Packet(1, X16, 0, DATA),
+    ]
+
+
+def check_coverage(packets):
+    """
+    Checks that there is a sample packet of every frame type.
+
+    Args:
+        packets (List): the sample packets.
+
+    Raises:
+        ValueError: if a frame type has no sample packet.
+    """
+    sampled = {packet.get_frame_type() for packet in packets}
+    missing = [frame_type.name for frame_type in ApiFrameType if frame_type not in sampled]
+    if missing:
+        raise ValueError("No sample packet for: " + ", ".join(missing))
+
+
+def get_decoder(packet, operating_mode):
+    """
+    Returns the function that decodes the frames of the provided packet.
+
+    Args:
+        packet (:class:`.XBeePacket`): the sample packet.
+        operating_mode (:class:`.OperatingMode`): the operating mode of the frames to decode.
+
+    Returns:
+        Function: function that receives the encoded frame and returns the decoded packet.
+    """
+    try:
+        build_frame(packet.output(escaped=operating_mode == OperatingMode.ESCAPED_API_MODE), operating_mode)
+    except NotImplementedError:
+        return lambda raw: type(packet).create_packet(raw, operating_mode)
+    return lambda raw: build_frame(raw, operating_mode)
+
+
+def best_time(function, number, repeat):
+    """
+    Returns the best time of a call to the provided function.
+
+    Args:
+        function (Function): the function to measure.
+        number (Integer): number of calls of every run.
+        repeat (Integer): number of runs.
+
+    Returns:
+        Float: the best time of a call, in microseconds.
+    """
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Encode/decode benchmark of every frame type.")
+    parser.add_argument("--number", type=int, default=2000, help="calls per run (default: 2000)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs, the best one is reported (default: 5)")
+    args = parser.parse_args()
+
+    packets = sample_packets()
+    check_coverage(packets)
+
+    print("%-36s %5s %10s %10s %10s %10s" % ("frame", "bytes", "encode", "decode", "enc (esc)", "dec (esc)"))
+    for packet in packets:
+        raw = packet.output()
+        escaped = packet.output(escaped=True)
+        decode = get_decoder(packet, OperatingMode.API_MODE)
+        decode_escaped = get_decoder(packet, OperatingMode.ESCAPED_API_MODE)
+        if decode(raw).output() != raw or decode_escaped(escaped).output() != raw:
+            raise ValueError("%s does not survive an encode/decode round trip" % type(packet).__name__)
+        print("%-36s %5d %10.2f %10.2f %10.2f %10.2f" % (
+            type(packet).__name__, len(raw),
+            best_time(packet.output, args.number, args.repeat),
+            best_time(lambda: decode(raw), args.number, args.repeat),
+            best_time(lambda: packet.output(escaped=True), args.number, args.repeat),
+            best_time(lambda: decode_escaped(escaped), args.number, args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
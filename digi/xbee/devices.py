@@ -5,11 +5,15 @@
 # Copyright (c) 2017 Digi International Inc. All Rights Reserved.
 
 from abc import ABCMeta, abstractmethod
+from collections import deque
+import heapq
 import logging
 from ipaddress import IPv4Address
+from queue import Queue
 from threading import Event
 import threading
 import time
+import zlib
 
 import serial
 from serial.serialutil import SerialTimeoutException
@@ -28,10 +32,14 @@ from digi.xbee.models.status import ATCommandStatus, TransmitStatus, PowerLevel,
     NetworkDiscoveryStatus
 from digi.xbee.packets import factory
 from digi.xbee.packets.aft import ApiFrameType
-from digi.xbee.packets.common import ATCommPacket, TransmitPacket, RemoteATCommandPacket, ExplicitAddressingPacket
+from digi.xbee.packets.common import ATCommPacket, TransmitPacket, RemoteATCommandPacket, ExplicitAddressingPacket, \
+    TransmitTemplate
 from digi.xbee.packets.network import TXIPv4Packet
 from digi.xbee.packets.raw import TX64Packet, TX16Packet
+from digi.xbee.packets.zigbee import CreateSourceRoutePacket
 from digi.xbee.util import utils
+from digi.xbee.util.executor import TaskExecutor
+from digi.xbee.util.metrics import MetricsRegistry
 from digi.xbee.exception import XBeeException, TimeoutException, InvalidOperatingModeException, \
     ATCommandException, OperationNotSupportedException
 from digi.xbee.io import IOSample, IOMode
@@ -145,7 +153,9 @@ class AbstractXBeeDevice(object):
             self._64bit_addr = addr64
 
         addr16 = device.get_16bit_addr()
-        if addr16 is not None and addr16 != self._16bit_addr:
+        if (addr16 is not None and
+            addr16 != self._16bit_addr and
+                (addr16 != XBee16BitAddress.UNKNOWN_ADDRESS or self._16bit_addr is None)):
             self._16bit_addr = addr16
 
     @abstractmethod
@@ -1198,6 +1208,16 @@ class XBeeDevice(AbstractXBeeDevice):
         self.__cv = threading.Condition()
         self.__modem_status_received = False
 
+        self.__payload_codec = None
+        self.__batch_unpacking = False
+        self.__duplicate_filter = None
+        self.__io_sample_store = None
+        self.__io_sample_filter = None
+        self.__executor = None
+        self.__owns_executor = False
+        self.__executor_lock = threading.Lock()
+        self.__metrics = None
+
     @classmethod
     def create_xbee_device(cls, comm_port_data):
         """
@@ -1278,12 +1298,20 @@ class XBeeDevice(AbstractXBeeDevice):
         the serial port is closed.
         """
         if self._network is not None:
+            self._network.stop_maintenance()
             self._network.stop_discovery_process()
 
         if self._packet_listener is not None:
             self._packet_listener.stop()
-            # Wait 100 ms before closing the port.
-            time.sleep(0.1)
+            # Wait up to 100 ms for the listener to finish before closing the port.
+            if self._packet_listener.is_alive() and self._packet_listener is not threading.current_thread():
+                self._packet_listener.join(0.1)
+
+        with self.__executor_lock:
+            if self.__owns_executor:
+                self.__executor.shutdown(cancel_pending=True)
+                self.__executor = None
+                self.__owns_executor = False
 
         if self._serial_port is not None and self._serial_port.isOpen():
             self._serial_port.close()
@@ -1384,7 +1412,7 @@ class XBeeDevice(AbstractXBeeDevice):
                                 x16addr,
                                 0,
                                 TransmitOptions.NONE.value,
-                                data)
+                                self._encode_payload(data))
         return self.send_packet_sync_and_get_response(packet)
 
     @AbstractXBeeDevice._before_send_method
@@ -1431,14 +1459,14 @@ class XBeeDevice(AbstractXBeeDevice):
             packet = TX64Packet(self.get_next_frame_id(),
                                 x64addr,
                                 TransmitOptions.NONE.value,
-                                data)
+                                self._encode_payload(data))
         else:
             packet = TransmitPacket(self.get_next_frame_id(),
                                     x64addr,
                                     XBee16BitAddress.UNKNOWN_ADDRESS,
                                     0,
                                     TransmitOptions.NONE.value,
-                                    data)
+                                    self._encode_payload(data))
         return self.send_packet_sync_and_get_response(packet)
 
     @AbstractXBeeDevice._before_send_method
@@ -1484,7 +1512,7 @@ class XBeeDevice(AbstractXBeeDevice):
         packet = TX16Packet(self.get_next_frame_id(),
                             x16addr,
                             TransmitOptions.NONE.value,
-                            data)
+                            self._encode_payload(data))
         return self.send_packet_sync_and_get_response(packet)
 
     @AbstractXBeeDevice._before_send_method
@@ -1522,14 +1550,13 @@ class XBeeDevice(AbstractXBeeDevice):
 
         protocol = self.get_protocol()
         if protocol in [XBeeProtocol.ZIGBEE, XBeeProtocol.DIGI_POINT]:
-            if remote_xbee_device.get_64bit_addr() is not None and remote_xbee_device.get_16bit_addr() is not None:
-                return self._send_data_64_16(remote_xbee_device.get_64bit_addr(), remote_xbee_device.get_16bit_addr(),
-                                             data)
+            x16addr = self.__get_16bit_addr_to_send(remote_xbee_device)
+            if remote_xbee_device.get_64bit_addr() is not None and x16addr is not None:
+                return self._send_data_64_16(remote_xbee_device.get_64bit_addr(), x16addr, data)
             elif remote_xbee_device.get_64bit_addr() is not None:
                 return self._send_data_64(remote_xbee_device.get_64bit_addr(), data)
             else:
-                return self._send_data_64_16(XBee64BitAddress.UNKNOWN_ADDRESS, remote_xbee_device.get_16bit_addr(),
-                                             data)
+                return self._send_data_64_16(XBee64BitAddress.UNKNOWN_ADDRESS, x16addr, data)
         elif protocol == XBeeProtocol.RAW_802_15_4:
             if remote_xbee_device.get_64bit_addr() is not None:
                 return self._send_data_64(remote_xbee_device.get_64bit_addr(), data)
@@ -1583,7 +1610,7 @@ class XBeeDevice(AbstractXBeeDevice):
                                 x16addr,
                                 0,
                                 TransmitOptions.NONE.value,
-                                data)
+                                self._encode_payload(data))
         self.send_packet(packet)
 
     @AbstractXBeeDevice._before_send_method
@@ -1624,14 +1651,14 @@ class XBeeDevice(AbstractXBeeDevice):
             packet = TX64Packet(self.get_next_frame_id(),
                                 x64addr,
                                 TransmitOptions.NONE.value,
-                                data)
+                                self._encode_payload(data))
         else:
             packet = TransmitPacket(self.get_next_frame_id(),
                                     x64addr,
                                     XBee16BitAddress.UNKNOWN_ADDRESS,
                                     0,
                                     TransmitOptions.NONE.value,
-                                    data)
+                                    self._encode_payload(data))
         self.send_packet(packet)
 
     @AbstractXBeeDevice._before_send_method
@@ -1671,7 +1698,7 @@ class XBeeDevice(AbstractXBeeDevice):
         packet = TX16Packet(self.get_next_frame_id(),
                             x16addr,
                             TransmitOptions.NONE.value,
-                            data)
+                            self._encode_payload(data))
         self.send_packet(packet)
 
     @AbstractXBeeDevice._before_send_method
@@ -1698,11 +1725,11 @@ class XBeeDevice(AbstractXBeeDevice):
 
         protocol = self.get_protocol()
         if protocol in [XBeeProtocol.ZIGBEE, XBeeProtocol.DIGI_POINT]:
-            if remote_xbee_device.get_64bit_addr() is not None and remote_xbee_device.get_16bit_addr() is not None:
-                self._send_data_async_64_16(remote_xbee_device.get_64bit_addr(), remote_xbee_device.get_16bit_addr(),
-                                            data)
+            x16addr = self.__get_16bit_addr_to_send(remote_xbee_device)
+            if remote_xbee_device.get_64bit_addr() is not None and x16addr is not None:
+                self._send_data_async_64_16(remote_xbee_device.get_64bit_addr(), x16addr, data)
             else:
-                self._send_data_async_64(remote_xbee_device.get_16bit_addr(), data)
+                self._send_data_async_64(remote_xbee_device.get_64bit_addr(), data)
         elif protocol == XBeeProtocol.RAW_802_15_4:
             if remote_xbee_device.get_64bit_addr() is not None:
                 self._send_data_async_64(remote_xbee_device.get_64bit_addr(), data)
@@ -1736,6 +1763,218 @@ class XBeeDevice(AbstractXBeeDevice):
         """
         return self._send_data_64(XBee64BitAddress.BROADCAST_ADDRESS, data)
 
+    def create_transmit_template(self, remote_xbee_device, transmit_options=TransmitOptions.NONE.value,
+                                 src_endpoint=None, dest_endpoint=None, cluster_id=None, profile_id=None):
+        """
+        Creates a template to send data repeatedly to the provided remote XBee
+        device with the same options.
+
+        The template encodes once the destination, options and, if provided,
+        endpoints, cluster ID and profile ID, so every send only has to add the
+        frame ID and the payload. Use it with :meth:`.XBeeDevice.send_template_data`
+        and :meth:`.XBeeDevice.send_template_data_async`.
+
+        Args:
+            remote_xbee_device (:class:`.RemoteXBeeDevice`): the remote XBee device to send data to.
+            transmit_options (Integer, optional): bitfield of transmit options. See :class:`.TransmitOptions`.
+            src_endpoint (Integer, optional): source endpoint of explicit transmissions. 1 byte.
+            dest_endpoint (Integer, optional): destination endpoint of explicit transmissions. 1 byte.
+            cluster_id (Integer, optional): Cluster ID of explicit transmissions. Must be between 0x0 and 0xFFFF.
+            profile_id (Integer, optional): Profile ID of explicit transmissions. Must be between 0x0 and 0xFFFF.
+
+        Returns:
+            :class:`.TransmitTemplate`: the created template.
+
+        Raises:
+            ValueError: if ``remote_xbee_device`` is ``None`` or has no 64-bit address.
+            OperationNotSupportedException: if the protocol of the XBee device is 802.15.4.
+            All exceptions raised by :meth:`.TransmitTemplate.__init__`.
+
+        .. seealso::
+           | :class:`.RemoteXBeeDevice`
+           | :class:`.TransmitOptions`
+           | :class:`.TransmitTemplate`
+        """
+        if remote_xbee_device is None:
+            raise ValueError("Remote XBee device cannot be None")
+        if remote_xbee_device.get_64bit_addr() is None:
+            raise ValueError("64-bit address of the remote XBee device cannot be None")
+        if self.get_protocol() == XBeeProtocol.RAW_802_15_4:
+            raise OperationNotSupportedException("Transmit templates are not supported in 802.15.4 protocol")
+
+        x16addr = self.__get_16bit_addr_to_send(remote_xbee_device)
+        if x16addr is None:
+            x16addr = XBee16BitAddress.UNKNOWN_ADDRESS
+
+        return TransmitTemplate(remote_xbee_device.get_64bit_addr(), x16addr, 0, transmit_options,
+                                src_endpoint, dest_endpoint, cluster_id, profile_id)
+
+    @AbstractXBeeDevice._before_send_method
+    @AbstractXBeeDevice._after_send_method
+    def send_template_data(self, template, data):
+        """
+        Blocking method. Sends data using the provided transmit template.
+
+        This method will wait for the packet response.
+
+        The default timeout for this method is :attr:`.XBeeDevice._DEFAULT_TIMEOUT_SYNC_OPERATIONS`.
+
+        Args:
+            template (:class:`.TransmitTemplate`): the template to send the data with.
+            data (Bytearray): the raw data to send.
+
+        Returns:
+            :class:`.XBeePacket`: the response.
+
+        Raises:
+            ValueError: if ``template`` or ``data`` is ``None``.
+            TimeoutException: if this method can't read a response packet in
+                :attr:`.XBeeDevice._DEFAULT_TIMEOUT_SYNC_OPERATIONS` seconds.
+            InvalidOperatingModeException: if the XBee device's operating mode is not API or ESCAPED API. This
+                method only checks the cached value of the operating mode.
+            XBeeException: if the XBee device's serial port is closed.
+            XBeeException: if the status of the response received is not OK.
+
+        .. seealso::
+           | :meth:`.XBeeDevice.create_transmit_template`
+           | :class:`.TransmitTemplate`
+           | :class:`.XBeePacket`
+        """
+        return self.send_packet_sync_and_get_response(self._build_template_packet(template, data))
+
+    @AbstractXBeeDevice._before_send_method
+    def send_template_data_async(self, template, data):
+        """
+        Non-blocking method. Sends data using the provided transmit template.
+
+        This method won't wait for the response.
+
+        Args:
+            template (:class:`.TransmitTemplate`): the template to send the data with.
+            data (Bytearray): the raw data to send.
+
+        Raises:
+            ValueError: if ``template`` or ``data`` is ``None``.
+            InvalidOperatingModeException: if the XBee device's operating mode is not API or ESCAPED API. This
+                method only checks the cached value of the operating mode.
+            XBeeException: if the XBee device's serial port is closed.
+
+        .. seealso::
+           | :meth:`.XBeeDevice.create_transmit_template`
+           | :class:`.TransmitTemplate`
+        """
+        self.send_packet(self._build_template_packet(template, data))
+
+    def create_data_stream(self, remote_xbee_device, transmit_options=TransmitOptions.DISABLE_ACK.value):
+        """
+        Creates a stream to send data to the provided remote XBee device
+        without transmit status.
+
+        Frames sent through the stream use frame ID 0, so the XBee device does
+        not answer them with a transmit status frame, halving the serial
+        traffic. Combined with transmit options like
+        :attr:`.TransmitOptions.DISABLE_ACK` (or
+        :attr:`.TransmitOptions.DISABLE_RETRIES_AND_REPAIR` in ZigBee), it
+        trades reliability for latency and throughput, which suits streams of
+        samples where the newest one always wins.
+
+        Args:
+            remote_xbee_device (:class:`.RemoteXBeeDevice`): the remote XBee device to send data to.
+            transmit_options (Integer, optional, default=:attr:`.TransmitOptions.DISABLE_ACK`): bitfield of
+                transmit options. See :class:`.TransmitOptions`.
+
+        Returns:
+            :class:`.DataStream`: the created stream.
+
+        Raises:
+            ValueError: if ``remote_xbee_device`` is ``None`` or has no address.
+
+        .. seealso::
+           | :class:`.DataStream`
+           | :class:`.RemoteXBeeDevice`
+           | :class:`.TransmitOptions`
+        """
+        return DataStream(self, remote_xbee_device, transmit_options)
+
+    @AbstractXBeeDevice._before_send_method
+    def _send_stream_packet(self, packet):
+        """
+        Sends the provided packet of a data stream without waiting for any
+        response.
+
+        This is only for internal use.
+
+        Args:
+            packet (:class:`.XBeePacket`): the packet to send.
+
+        Raises:
+            InvalidOperatingModeException: if the XBee device's operating mode is not API or ESCAPED API. This
+                method only checks the cached value of the operating mode.
+            XBeeException: if the XBee device's serial port is closed.
+
+        .. seealso::
+           | :class:`.DataStream`
+        """
+        self.send_packet(packet)
+
+    def create_message_batcher(self, linger_time=None, max_payload=None):
+        """
+        Creates a batcher that packs small messages sent to the same remote
+        XBee device into a single RF payload.
+
+        The receiving XBee device must enable batch unpacking (see
+        :meth:`.XBeeDevice.set_batch_unpacking`) to get the messages apart.
+
+        Args:
+            linger_time (Float, optional): maximum time (in seconds) a message waits for others before being
+                sent. ``None`` to use the default value.
+            max_payload (Integer, optional): maximum size (in bytes) of the RF payloads. ``None`` to read it
+                from the XBee device (``NP`` parameter).
+
+        Returns:
+            :class:`.MessageBatcher`: the created batcher.
+
+        Raises:
+            ValueError: if ``linger_time`` is negative or ``max_payload`` is too small.
+            TimeoutException: if ``max_payload`` is ``None`` and the response to the ``NP`` command is not received
+                before the read timeout expires.
+            ATCommandException: if ``max_payload`` is ``None`` and the XBee device does not support the ``NP``
+                command.
+
+        .. seealso::
+           | :class:`.MessageBatcher`
+        """
+        if max_payload is None:
+            max_payload = utils.bytes_to_int(self.get_parameter("NP"))
+        return MessageBatcher(self, max_payload, linger_time)
+
+    def set_batch_unpacking(self, enabled):
+        """
+        Enables or disables the unpacking of received payloads packed by a
+        :class:`.MessageBatcher`.
+
+        If enabled, every message of a batched payload is delivered as a
+        separate received packet, that is, as a separate message to the data
+        reception callbacks and the read data methods.
+
+        Args:
+            enabled (Boolean): ``True`` to unpack batched payloads, ``False`` otherwise.
+
+        .. seealso::
+           | :class:`.MessageBatcher`
+        """
+        self.__batch_unpacking = enabled
+
+    def is_batch_unpacking(self):
+        """
+        Returns whether the received payloads packed by a
+        :class:`.MessageBatcher` are unpacked or not.
+
+        Returns:
+            Boolean: ``True`` if batched payloads are unpacked, ``False`` otherwise.
+        """
+        return self.__batch_unpacking
+
     @AbstractXBeeDevice._before_send_method
     def read_data(self, timeout=None):
         """
@@ -2382,6 +2621,8 @@ class XBeeDevice(AbstractXBeeDevice):
 
         if self._sync_packet is None:
             # if packet is None, timeout has expired:
+            if self.__metrics is not None:
+                self.__metrics.increment(MetricsRegistry.SYNC_TIMEOUTS, label=packet_to_send.get_frame_type())
             raise TimeoutException("Response not received in the configured timeout.")
         else:
             # Get a reference for the new packet, clear sync packet
@@ -2424,8 +2665,18 @@ class XBeeDevice(AbstractXBeeDevice):
         if not self._packet_listener.is_running():
             raise XBeeException("Packet listener is not running.")
 
+        # Register the destination before writing so that the transmit status
+        # can never be processed before it.
+        self._network._register_transmit(packet)
+
         escape = self._operating_mode == OperatingMode.ESCAPED_API_MODE
         out = packet.output(escape)
+        # Register the packet before writing for the same reason.
+        if self.__metrics is not None:
+            # Every escaped byte is preceded by exactly one 0x7D, so the
+            # unescaped length needs no second serialization.
+            self.__metrics._frame_sent(packet, len(out) - out.count(SpecialByte.ESCAPE_BYTE.value, 1)
+                                       if escape else len(out))
         self._serial_port.write(out)
         self._log.debug(self.LOG_PATTERN.format(port=self.__port,
                                                 event="SENT",
@@ -2434,6 +2685,87 @@ class XBeeDevice(AbstractXBeeDevice):
 
         return self._get_packet_by_id(packet.frame_id) if sync else None
 
+    def __get_16bit_addr_to_send(self, remote_xbee_device):
+        """
+        Returns the 16-bit address to use to send data to the provided remote
+        XBee device.
+
+        The 16-bit address learned by the network for the remote XBee device
+        (from transmit status, receive and route record frames) takes
+        precedence over the one of the provided object. If the network knows
+        that address is no longer valid, it returns
+        :attr:`.XBee16BitAddress.UNKNOWN_ADDRESS` so the XBee device discovers
+        it again.
+
+        Args:
+            remote_xbee_device (:class:`.RemoteXBeeDevice`): the remote XBee device to send data to.
+
+        Returns:
+            :class:`.XBee16BitAddress`: the 16-bit address to use, ``None`` if it is not known.
+        """
+        x16addr = self.__get_learned_16bit_addr(remote_xbee_device.get_64bit_addr())
+        if x16addr is not None:
+            return x16addr
+        return remote_xbee_device.get_16bit_addr()
+
+    def __get_learned_16bit_addr(self, x64addr):
+        """
+        Returns the 16-bit address learned by the network for the remote XBee
+        device with the provided 64-bit address.
+
+        Args:
+            x64addr (:class:`.XBee64BitAddress`): the 64-bit address of the remote XBee device.
+
+        Returns:
+            :class:`.XBee16BitAddress`: the learned 16-bit address, ``None`` if it is not known.
+        """
+        if (x64addr is not None and
+                x64addr != XBee64BitAddress.UNKNOWN_ADDRESS and
+                x64addr != XBee64BitAddress.BROADCAST_ADDRESS):
+            device = self._network.get_device_by_64(x64addr)
+            if device is not None:
+                return device.get_16bit_addr()
+        return None
+
+    def _build_template_packet(self, template, data, frame_id=None):
+        """
+        Builds and returns the packet to send the provided data with the
+        provided transmit template.
+
+        If the network has learned a different 16-bit address for the
+        destination, the template is updated first. The data is encoded with
+        the payload codec of the XBee device, if any.
+
+        This is only for internal use.
+
+        Args:
+            template (:class:`.TransmitTemplate`): the template to send the data with.
+            data (Bytearray): the raw data to send.
+            frame_id (Integer, optional): the frame ID of the packet, ``None`` to use the next frame ID of
+                the XBee device.
+
+        Returns:
+            :class:`.PreparedTransmitPacket`: the packet to send.
+
+        Raises:
+            ValueError: if ``template`` or ``data`` is ``None``.
+            OperationNotSupportedException: if the XBee device is remote.
+        """
+        if template is None:
+            raise ValueError("Template cannot be None")
+        if data is None:
+            raise ValueError("Data cannot be None")
+
+        if self.is_remote():
+            raise OperationNotSupportedException("Cannot send data to a remote device from a remote device")
+
+        x16addr = self.__get_learned_16bit_addr(template.x64bit_dest_addr)
+        if x16addr is not None and x16addr != template.x16bit_dest_addr:
+            template.x16bit_dest_addr = x16addr
+
+        return template.build_packet(self.get_next_frame_id() if frame_id is None else frame_id,
+                                     self._encode_payload(data))
+
     def __build_xbee_message(self, packet, explicit=False):
         """
         Builds and returns the XBee message corresponding to the provided ``packet``. The result is an
@@ -2463,11 +2795,11 @@ class XBeeDevice(AbstractXBeeDevice):
             remote = RemoteXBeeDevice(self, x64addr, x16addr)
 
         if explicit:
-            msg = ExplicitXBeeMessage(packet.rf_data, remote, time.clock(), packet.source_endpoint,
+            msg = ExplicitXBeeMessage(packet.rf_data, remote, packet.timestamp, packet.source_endpoint,
                                       packet.dest_endpoint, packet.cluster_id,
                                       packet.profile_id, packet.is_broadcast())
         else:
-            msg = XBeeMessage(packet.rf_data, remote, time.clock(), packet.is_broadcast())
+            msg = XBeeMessage(packet.rf_data, remote, packet.timestamp, packet.is_broadcast())
 
         return msg
 
@@ -2502,7 +2834,7 @@ class XBeeDevice(AbstractXBeeDevice):
             x16addr = XBee16BitAddress.UNKNOWN_ADDRESS
         else:
             x64addr = remote_xbee_device.get_64bit_addr()
-            x16addr = remote_xbee_device.get_16bit_addr()
+            x16addr = self.__get_16bit_addr_to_send(remote_xbee_device)
 
         # If the device does not have 16-bit address, set it to Unknown.
         if x16addr is None:
@@ -2510,7 +2842,7 @@ class XBeeDevice(AbstractXBeeDevice):
 
         return ExplicitAddressingPacket(self._get_next_frame_id(), x64addr,
                                         x16addr, src_endpoint, dest_endpoint,
-                                        cluster_id, profile_id, 0, 0, data)
+                                        cluster_id, profile_id, 0, 0, self._encode_payload(data))
 
     def get_next_frame_id(self):
         """
@@ -2521,128 +2853,242 @@ class XBeeDevice(AbstractXBeeDevice):
         """
         return self._get_next_frame_id()
 
-    serial_port = property(__get_serial_port)
-    """:class:`.XBeeSerialPort`. The serial port associated to the XBee device."""
+    def set_payload_codec(self, codec):
+        """
+        Sets the codec to encode the payloads sent with the data sending
+        methods of the XBee device (including transmit templates and data
+        streams) and decode the received ones.
 
-    operating_mode = property(__get_operating_mode)
-    """:class:`.OperatingMode`. The operating mode of the XBee device."""
+        The codec must be enabled in both ends of the link. Received payloads
+        that were not encoded by a codec are delivered as they are.
 
+        Args:
+            codec (:class:`.PayloadCodec`): the codec to use, ``None`` to disable it.
 
-class Raw802Device(XBeeDevice):
-    """
-    This class represents a local 802.15.4 XBee device.
-    """
+        .. seealso::
+           | :class:`.PayloadCodec`
+        """
+        self.__payload_codec = codec
 
-    def __init__(self, port, baud_rate):
+    def get_payload_codec(self):
         """
-        Class constructor. Instantiates a new :class:`Raw802Device` with the provided parameters.
+        Returns the codec of the payloads sent and received by the XBee device.
 
-        Args:
-            port (Integer or String): serial port identifier.
-                Integer: number of XBee device, numbering starts at zero.
-                Device name: depending on operating system. e.g. '/dev/ttyUSB0' on GNU/Linux or 'COM3' on Windows.
-            baud_rate (Integer): the serial port baud rate.
+        Returns:
+            :class:`.PayloadCodec`: the codec, ``None`` if it is disabled.
 
-        Raises:
-            All exceptions raised by :meth:`.XBeeDevice.__init__` constructor.
-        
         .. seealso::
-           | :class:`.XBeeDevice`
-           | :meth:`.XBeeDevice.__init__`
+           | :class:`.PayloadCodec`
         """
-        super().__init__(port, baud_rate)
+        return self.__payload_codec
 
-    def open(self):
+    def set_duplicate_filter(self, dup_filter):
         """
-        Override.
-        
-        Raises:
-            XBeeException: if the protocol is invalid.
-            All exceptions raised by :meth:`.XBeeDevice.open`.
+        Sets the filter that discards the received frames that are copies of
+        others received shortly before.
+
+        Discarded frames are neither queued nor notified to any callback. The
+        same filter can be set to several local XBee devices.
+
+        Args:
+            dup_filter (:class:`.DuplicateFilter`): the filter to use, ``None`` to disable it.
 
         .. seealso::
-           | :meth:`.XBeeDevice.open`
+           | :class:`.DuplicateFilter`
         """
-        super().open()
-        if not self.is_remote() and self.get_protocol() != XBeeProtocol.RAW_802_15_4:
-            raise XBeeException("Invalid protocol.")
+        self.__duplicate_filter = dup_filter
 
-    def get_network(self):
+    def get_duplicate_filter(self):
         """
-        Override.
+        Returns the filter that discards duplicate received frames.
+
+        Returns:
+            :class:`.DuplicateFilter`: the filter, ``None`` if it is disabled.
 
         .. seealso::
-           | :meth:`.XBeeDevice.get_network`
+           | :class:`.DuplicateFilter`
         """
-        if self._network is None:
-            self._network = Raw802Network(self)
-        return self._network
+        return self.__duplicate_filter
 
-    def get_protocol(self):
+    def set_io_sample_store(self, io_sample_store):
         """
-        Override.
-        
+        Sets the store where the IO samples received from remote XBee devices
+        are appended, before notifying them to the :class:`.IOSampleReceived`
+        callbacks.
+
+        Args:
+            io_sample_store (:class:`.IOSampleStore`): the store to use, ``None`` to stop storing samples.
+
         .. seealso::
-           | :meth:`.XBeeDevice.get_protocol`
+           | :class:`.IOSampleStore`
         """
-        return XBeeProtocol.RAW_802_15_4
+        self.__io_sample_store = io_sample_store
 
-    def get_ai_status(self):
+    def get_io_sample_store(self):
         """
-        Override.
+        Returns the store where the received IO samples are appended.
+
+        Returns:
+            :class:`.IOSampleStore`: the store, ``None`` if received IO samples are not stored.
 
         .. seealso::
-           | :meth:`.AbstractXBeeDevice._get_ai_status`
+           | :class:`.IOSampleStore`
         """
-        return super()._get_ai_status()
+        return self.__io_sample_store
 
-    def send_data_64(self, x64addr, data):
+    def set_io_sample_filter(self, io_sample_filter):
         """
-        Override.
+        Sets the filter that drops the received IO samples whose values did
+        not change enough since the last one of the same remote XBee device.
+
+        Dropped samples are neither stored nor notified to the
+        :class:`.IOSampleReceived` callbacks. They are still notified to the
+        packet received callbacks.
+
+        Args:
+            io_sample_filter (:class:`.IOSampleFilter`): the filter to use, ``None`` to disable it.
 
         .. seealso::
-           | :meth:`.XBeeDevice.send_data_64`
+           | :class:`.IOSampleFilter`
         """
-        return super()._send_data_64(x64addr, data)
+        self.__io_sample_filter = io_sample_filter
 
-    def send_data_async_64(self, x64addr, data):
+    def get_io_sample_filter(self):
         """
-        Override.
+        Returns the filter that drops unchanged received IO samples.
+
+        Returns:
+            :class:`.IOSampleFilter`: the filter, ``None`` if it is disabled.
 
         .. seealso::
-           | :meth:`.XBeeDevice.send_data_async_64`
+           | :class:`.IOSampleFilter`
         """
-        super()._send_data_async_64(x64addr, data)
+        return self.__io_sample_filter
 
-    def send_data_16(self, x16addr, data):
+    def set_executor(self, executor):
         """
-        Override.
+        Sets the executor that runs the background jobs of the XBee device,
+        such as the discovery process of its network.
+
+        The same executor can be shared by several XBee devices to bound the
+        total number of threads. It is not shut down when the XBee device is
+        closed.
+
+        Args:
+            executor (:class:`.TaskExecutor`): the executor to use, ``None`` to use one owned by the XBee
+                device.
 
         .. seealso::
-           | :meth:`.XBeeDevice._send_data_16`
+           | :class:`.TaskExecutor`
+           | :meth:`.XBeeDevice.get_executor`
         """
-        return super()._send_data_16(x16addr, data)
+        with self.__executor_lock:
+            if self.__owns_executor:
+                self.__executor.shutdown()
+            self.__executor = executor
+            self.__owns_executor = False
 
-    def send_data_async_16(self, x16addr, data):
+    def get_executor(self):
         """
-        Override.
+        Returns the executor that runs the background jobs of the XBee device.
+
+        If no executor has been set, the XBee device creates its own the first
+        time it is needed and shuts it down when it is closed. Blocking
+        operations can also be submitted to it, for example
+        ``xbee.get_executor().submit(xbee.reset)``.
+
+        Returns:
+            :class:`.TaskExecutor`: the executor of the XBee device.
 
         .. seealso::
-           | :meth:`.XBeeDevice._send_data_async_16`
+           | :class:`.TaskExecutor`
+           | :meth:`.XBeeDevice.set_executor`
         """
-        super()._send_data_async_16(x16addr, data)
+        with self.__executor_lock:
+            if self.__executor is None:
+                self.__executor = TaskExecutor(name="XBee-%s" % self.__port)
+                self.__owns_executor = True
+            return self.__executor
 
+    def set_metrics(self, metrics):
+        """
+        Sets the registry that collects the counters and latency histograms
+        of the frames sent and received by the XBee device.
 
-class DigiMeshDevice(XBeeDevice):
-    """
-    This class represents a local DigiMesh XBee device.
-    """
+        Metrics are not collected while no registry is set, so they have no
+        cost.
 
-    def __init__(self, port, baud_rate):
+        Args:
+            metrics (:class:`.MetricsRegistry`): the registry to use, ``None`` to stop collecting metrics.
+
+        .. seealso::
+           | :class:`.MetricsRegistry`
+           | :meth:`.XBeeDevice.enable_metrics`
         """
-        Class constructor. Instantiates a new :class:`DigiMeshDevice` with the provided parameters.
+        self.__metrics = metrics
 
-        Args:
+    def get_metrics(self):
+        """
+        Returns the registry that collects the metrics of the XBee device.
+
+        Returns:
+            :class:`.MetricsRegistry`: the registry, ``None`` if metrics are not collected.
+
+        .. seealso::
+           | :class:`.MetricsRegistry`
+        """
+        return self.__metrics
+
+    def enable_metrics(self):
+        """
+        Starts collecting the metrics of the XBee device in a new registry,
+        unless they are already being collected.
+
+        Returns:
+            :class:`.MetricsRegistry`: the registry that collects the metrics.
+
+        .. seealso::
+           | :class:`.MetricsRegistry`
+           | :meth:`.XBeeDevice.set_metrics`
+        """
+        if self.__metrics is None:
+            self.__metrics = MetricsRegistry()
+        return self.__metrics
+
+    def _encode_payload(self, data):
+        """
+        Encodes the provided payload with the codec of the XBee device, if any.
+
+        This is only for internal use.
+
+        Args:
+            data (Bytearray): the payload to encode.
+
+        Returns:
+            Bytearray: the payload to send.
+        """
+        codec = self.__payload_codec
+        if codec is None:
+            return data
+        return codec.encode(data)
+
+    serial_port = property(__get_serial_port)
+    """:class:`.XBeeSerialPort`. The serial port associated to the XBee device."""
+
+    operating_mode = property(__get_operating_mode)
+    """:class:`.OperatingMode`. The operating mode of the XBee device."""
+
+
+class Raw802Device(XBeeDevice):
+    """
+    This class represents a local 802.15.4 XBee device.
+    """
+
+    def __init__(self, port, baud_rate):
+        """
+        Class constructor. Instantiates a new :class:`Raw802Device` with the provided parameters.
+
+        Args:
             port (Integer or String): serial port identifier.
                 Integer: number of XBee device, numbering starts at zero.
                 Device name: depending on operating system. e.g. '/dev/ttyUSB0' on GNU/Linux or 'COM3' on Windows.
@@ -2650,17 +3096,18 @@ class DigiMeshDevice(XBeeDevice):
 
         Raises:
             All exceptions raised by :meth:`.XBeeDevice.__init__` constructor.
-
+        
         .. seealso::
            | :class:`.XBeeDevice`
            | :meth:`.XBeeDevice.__init__`
         """
         super().__init__(port, baud_rate)
+        self._network = Raw802Network(self)
 
     def open(self):
         """
         Override.
-
+        
         Raises:
             XBeeException: if the protocol is invalid.
             All exceptions raised by :meth:`.XBeeDevice.open`.
@@ -2669,7 +3116,7 @@ class DigiMeshDevice(XBeeDevice):
            | :meth:`.XBeeDevice.open`
         """
         super().open()
-        if self.get_protocol() != XBeeProtocol.DIGI_MESH:
+        if not self.is_remote() and self.get_protocol() != XBeeProtocol.RAW_802_15_4:
             raise XBeeException("Invalid protocol.")
 
     def get_network(self):
@@ -2680,7 +3127,7 @@ class DigiMeshDevice(XBeeDevice):
            | :meth:`.XBeeDevice.get_network`
         """
         if self._network is None:
-            self._network = DigiMeshNetwork(self)
+            self._network = Raw802Network(self)
         return self._network
 
     def get_protocol(self):
@@ -2690,7 +3137,16 @@ class DigiMeshDevice(XBeeDevice):
         .. seealso::
            | :meth:`.XBeeDevice.get_protocol`
         """
-        return XBeeProtocol.DIGI_MESH
+        return XBeeProtocol.RAW_802_15_4
+
+    def get_ai_status(self):
+        """
+        Override.
+
+        .. seealso::
+           | :meth:`.AbstractXBeeDevice._get_ai_status`
+        """
+        return super()._get_ai_status()
 
     def send_data_64(self, x64addr, data):
         """
@@ -2710,64 +3166,43 @@ class DigiMeshDevice(XBeeDevice):
         """
         super()._send_data_async_64(x64addr, data)
 
-    def read_expl_data(self, timeout=None):
+    def send_data_16(self, x16addr, data):
         """
         Override.
-        
-        .. seealso::
-           | :meth:`.XBeeDevice.read_expl_data`
-        """
-        return super()._read_expl_data(timeout=timeout)
 
-    def read_expl_data_from(self, remote_xbee_device, timeout=None):
-        """
-        Override.
-        
         .. seealso::
-           | :meth:`.XBeeDevice.read_expl_data_from`
+           | :meth:`.XBeeDevice._send_data_16`
         """
-        return super()._read_expl_data_from(remote_xbee_device, timeout=timeout)
+        return super()._send_data_16(x16addr, data)
 
-    def send_expl_data(self, remote_xbee_device, data, src_endpoint, dest_endpoint,
-                       cluster_id, profile_id):
+    def send_data_async_16(self, x16addr, data):
         """
         Override.
-        
-        .. seealso::
-           | :meth:`.XBeeDevice.send_expl_data`
-        """
-        return super()._send_expl_data(remote_xbee_device, data, src_endpoint, dest_endpoint, cluster_id,
-                                       profile_id)
 
-    def send_expl_data_broadcast(self, data, src_endpoint, dest_endpoint, cluster_id, profile_id):
-        """
-        Override.
-        
         .. seealso::
-           | :meth:`.XBeeDevice._send_expl_data_broadcast`
+           | :meth:`.XBeeDevice._send_data_async_16`
         """
-        return super()._send_expl_data_broadcast(data, src_endpoint, dest_endpoint, cluster_id, profile_id)
+        super()._send_data_async_16(x16addr, data)
 
-    def send_expl_data_async(self, remote_xbee_device, data, src_endpoint, dest_endpoint,
-                             cluster_id, profile_id):
-        """
-        Override.
-        
-        .. seealso::
-           | :meth:`.XBeeDevice.send_expl_data_async`
-        """
-        super()._send_expl_data_async(remote_xbee_device, data, src_endpoint,
-                                      dest_endpoint, cluster_id, profile_id)
 
+class DigiMeshDevice(XBeeDevice):
+    """
+    This class represents a local DigiMesh XBee device.
+
+    In synchronous sleep networks, the device keeps a clock of the wake
+    windows of the network (learned from the ``SP`` and ``ST`` parameters and
+    from the network woke up/went to sleep modem status frames), so data can
+    be scheduled to be sent while the network is awake.
+    """
 
-class DigiPointDevice(XBeeDevice):
+    __WAKE_WINDOW_MARGIN = 0.05  # seconds
     """
-    This class represents a local DigiPoint XBee device.
+    Time before the end of a wake window in which no more data is sent.
     """
 
     def __init__(self, port, baud_rate):
         """
-        Class constructor. Instantiates a new :class:`DigiPointDevice` with the provided parameters.
+        Class constructor. Instantiates a new :class:`DigiMeshDevice` with the provided parameters.
 
         Args:
             port (Integer or String): serial port identifier.
@@ -2776,13 +3211,24 @@ class DigiPointDevice(XBeeDevice):
             baud_rate (Integer): the serial port baud rate.
 
         Raises:
-            All exceptions raised by :meth:`XBeeDevice.__init__` constructor.
+            All exceptions raised by :meth:`.XBeeDevice.__init__` constructor.
 
         .. seealso::
            | :class:`.XBeeDevice`
            | :meth:`.XBeeDevice.__init__`
         """
         super().__init__(port, baud_rate)
+        self._network = DigiMeshNetwork(self)
+
+        self.__sleep_period = None
+        self.__wake_time = None
+        self.__sleep_timing_read = False
+        self.__last_wake = None
+        self.__last_sleep = None
+        self.__scheduled = deque()
+        self.__scheduler_condition = threading.Condition()
+        self.__scheduler_thread = None
+        self.__scheduler_stop = False
 
     def open(self):
         """
@@ -2796,8 +3242,10 @@ class DigiPointDevice(XBeeDevice):
            | :meth:`.XBeeDevice.open`
         """
         super().open()
-        if self.get_protocol() != XBeeProtocol.DIGI_POINT:
+        if self.get_protocol() != XBeeProtocol.DIGI_MESH:
             raise XBeeException("Invalid protocol.")
+        with self.__scheduler_condition:
+            self.__scheduler_stop = False
 
     def get_network(self):
         """
@@ -2807,7 +3255,7 @@ class DigiPointDevice(XBeeDevice):
            | :meth:`.XBeeDevice.get_network`
         """
         if self._network is None:
-            self._network = DigiPointNetwork(self)
+            self._network = DigiMeshNetwork(self)
         return self._network
 
     def get_protocol(self):
@@ -2817,25 +3265,324 @@ class DigiPointDevice(XBeeDevice):
         .. seealso::
            | :meth:`.XBeeDevice.get_protocol`
         """
-        return XBeeProtocol.DIGI_POINT
+        return XBeeProtocol.DIGI_MESH
 
-    def send_data_64_16(self, x64addr, x16addr, data):
+    def close(self):
         """
         Override.
 
+        Data scheduled with :meth:`.DigiMeshDevice.send_data_scheduled` that
+        has not been sent yet is discarded.
+
         .. seealso::
-           | :meth:`.XBeeDevice.send_data_64_16`
+           | :meth:`.XBeeDevice.close`
         """
-        return super()._send_data_64_16(x64addr, x16addr, data)
+        with self.__scheduler_condition:
+            self.__scheduler_stop = True
+            self.__scheduled.clear()
+            self.__scheduler_condition.notify()
+        super().close()
 
-    def send_data_async_64_16(self, x64addr, x16addr, data):
+    def get_xbee_device_callbacks(self):
         """
         Override.
 
         .. seealso::
-           | :meth:`.XBeeDevice.send_data_async_64_16`
+           | :meth:`.XBeeDevice.get_xbee_device_callbacks`
         """
-        super()._send_data_async_64_16(x64addr, x16addr, data)
+        api_callbacks = super().get_xbee_device_callbacks()
+
+        def sleep_status_callback(received_packet):
+            """
+            Callback that updates the wake window clock with the network woke
+            up and went to sleep modem status frames.
+            """
+            if received_packet.get_frame_type() != ApiFrameType.MODEM_STATUS:
+                return
+            if received_packet.modem_status == ModemStatus.NETWORK_WOKE_UP:
+                self.__network_woke_up(time.monotonic())
+            elif received_packet.modem_status == ModemStatus.NETWORK_WENT_TO_SLEEP:
+                self.__network_went_to_sleep(time.monotonic())
+
+        api_callbacks += sleep_status_callback
+        return api_callbacks
+
+    def read_sleep_timing(self):
+        """
+        Reads the sleep period (``SP``) and wake time (``ST``) of the network
+        from the XBee device.
+
+        Returns:
+            Tuple (Float, Float): the sleep period and the wake time, in seconds.
+
+        Raises:
+            TimeoutException: if the response is not received before the read timeout expires.
+            XBeeException: if the XBee device's serial port is closed.
+            InvalidOperatingModeException: if the XBee device's operating mode is not API or ESCAPED API. This
+                method only checks the cached value of the operating mode.
+            ATCommandException: if the response is not as expected.
+        """
+        sleep_period = utils.bytes_to_int(self.get_parameter("SP")) / 100
+        wake_time = utils.bytes_to_int(self.get_parameter("ST")) / 1000
+        with self.__scheduler_condition:
+            self.__sleep_period = sleep_period
+            self.__wake_time = wake_time
+            self.__sleep_timing_read = True
+            self.__scheduler_condition.notify()
+        return sleep_period, wake_time
+
+    def get_sleep_period(self):
+        """
+        Returns the sleep period of the network, read from the XBee device or
+        learned from the network woke up modem status frames.
+
+        Returns:
+            Float: the sleep period in seconds, ``None`` if it is not known.
+        """
+        return self.__sleep_period
+
+    def get_wake_time(self):
+        """
+        Returns the wake time of the network, read from the XBee device or
+        learned from the network woke up/went to sleep modem status frames.
+
+        Returns:
+            Float: the wake time in seconds, ``None`` if it is not known.
+        """
+        return self.__wake_time
+
+    def get_next_wake_window(self):
+        """
+        Returns the current wake window of the network if it is awake, or the
+        next one.
+
+        Returns:
+            Tuple (Float, Float): start and end of the wake window, as ``time.monotonic()`` values. The end is
+                ``None`` if the wake time is unknown. ``None`` if the wake window cannot be determined.
+        """
+        with self.__scheduler_condition:
+            return self.__get_wake_window(time.monotonic())
+
+    def is_network_awake(self):
+        """
+        Returns whether the network is awake or not, according to the wake
+        window clock.
+
+        Returns:
+            Boolean: ``True`` if the network is awake, ``False`` if it is sleeping or it is not known.
+        """
+        now = time.monotonic()
+        with self.__scheduler_condition:
+            window = self.__get_wake_window(now)
+        return window is not None and window[0] <= now
+
+    def send_data_scheduled(self, remote_xbee_device, data, timeout=None):
+        """
+        Non-blocking method. Sends data to a remote XBee device in the next
+        wake window of the network.
+
+        If the network is awake, the data is sent immediately. Otherwise, it is
+        queued and sent asynchronously (see :meth:`.XBeeDevice.send_data_async`)
+        as soon as the network wakes up, according to the wake window clock
+        or to a network woke up modem status frame.
+
+        If there is no wake window clock (no network woke up or went to sleep
+        modem status has been received, as in networks that do not sleep),
+        the data is sent immediately, even if the sleep timing has been read:
+        it tells how long the windows are, but not when they start.
+
+        Args:
+            remote_xbee_device (:class:`.RemoteXBeeDevice`): the remote XBee device to send data to.
+            data (Bytearray): the raw data to send.
+            timeout (Float, optional): maximum time (in seconds) the data waits for a wake window. When it
+                expires, the data is sent anyway. ``None`` to wait for the wake window without limit.
+
+        Raises:
+            ValueError: if ``remote_xbee_device`` or ``data`` is ``None``, or ``timeout`` is negative.
+            XBeeException: if the XBee device is not open.
+            All exceptions raised by :meth:`.XBeeDevice.send_data_async` when the data is sent immediately.
+
+        .. seealso::
+           | :meth:`.DigiMeshDevice.get_next_wake_window`
+           | :meth:`.DigiMeshDevice.read_sleep_timing`
+        """
+        if remote_xbee_device is None:
+            raise ValueError("Remote XBee device cannot be None")
+        if data is None:
+            raise ValueError("Data cannot be None")
+        if timeout is not None and timeout < 0:
+            raise ValueError("Timeout cannot be negative")
+        if not self.is_open():
+            raise XBeeException("XBee device is not open")
+
+        if not self.__has_wake_window_clock():
+            self.send_data_async(remote_xbee_device, data)
+            return
+
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self.__scheduler_condition:
+            # The device may have been closed after the check above.
+            if self.__scheduler_stop:
+                raise XBeeException("XBee device is not open")
+            self.__scheduled.append((remote_xbee_device, data, deadline))
+            if self.__scheduler_thread is None or not self.__scheduler_thread.is_alive():
+                self.__scheduler_thread = threading.Thread(target=self.__run_scheduler, daemon=True)
+                self.__scheduler_thread.start()
+            self.__scheduler_condition.notify()
+
+    def get_number_scheduled(self):
+        """
+        Returns the number of messages waiting for the next wake window.
+
+        Returns:
+            Integer: the number of scheduled messages.
+        """
+        return len(self.__scheduled)
+
+    def __network_woke_up(self, now):
+        """
+        Updates the wake window clock when the network wakes up.
+
+        Args:
+            now (Float): the ``time.monotonic()`` value when the network woke up.
+        """
+        with self.__scheduler_condition:
+            if not self.__sleep_timing_read and self.__last_wake is not None:
+                period = now - self.__last_wake
+                # A missed wake up would double the learned period.
+                if self.__sleep_period is None or period < self.__sleep_period * 1.5:
+                    self.__sleep_period = period
+            self.__last_wake = now
+            self.__scheduler_condition.notify()
+
+    def __network_went_to_sleep(self, now):
+        """
+        Updates the wake window clock when the network goes to sleep.
+
+        Args:
+            now (Float): the ``time.monotonic()`` value when the network went to sleep.
+        """
+        with self.__scheduler_condition:
+            self.__last_sleep = now
+            if not self.__sleep_timing_read and self.__last_wake is not None:
+                self.__wake_time = now - self.__last_wake
+
+    def __has_wake_window_clock(self):
+        """
+        Returns whether the wake windows of the network can be known, that is,
+        whether the network has been seen waking up or going to sleep. The
+        sleep timing alone does not tell when the windows start.
+
+        Returns:
+            Boolean: ``True`` if there is a wake window clock, ``False`` otherwise.
+        """
+        return self.__last_wake is not None or self.__last_sleep is not None
+
+    def __get_wake_window(self, now):
+        """
+        Returns the current or next wake window of the network. The scheduler
+        lock must be held by the caller.
+
+        Args:
+            now (Float): the current ``time.monotonic()`` value.
+
+        Returns:
+            Tuple (Float, Float): start and end of the wake window, ``None`` if it cannot be determined.
+        """
+        last_wake = self.__last_wake
+        if last_wake is None:
+            return None
+        wake_time = self.__wake_time
+        # Awake since the last wake up event.
+        if self.__last_sleep is None or self.__last_sleep < last_wake:
+            if wake_time is None:
+                return last_wake, None
+            if now < last_wake + wake_time:
+                return last_wake, last_wake + wake_time
+        if self.__sleep_period is None or wake_time is None:
+            return None
+        cycles = int((now - last_wake) / self.__sleep_period)
+        start = last_wake + cycles * self.__sleep_period
+        if now >= start + wake_time:
+            start += self.__sleep_period
+        return start, start + wake_time
+
+    @staticmethod
+    def __get_wait_time(wake_up, deadline, now):
+        """
+        Returns the time the scheduler has to wait until the provided wake up
+        time or deadline, whichever is first.
+
+        Args:
+            wake_up (Float): the ``time.monotonic()`` value to wake up at.
+            deadline (Float): the earliest deadline of the scheduled data, ``None`` if there is not any.
+            now (Float): the current ``time.monotonic()`` value.
+
+        Returns:
+            Float: the time to wait in seconds.
+        """
+        if deadline is not None and deadline < wake_up:
+            wake_up = deadline
+        return wake_up - now
+
+    def __run_scheduler(self):
+        """
+        Sends the scheduled data in the wake windows of the network until the
+        XBee device is closed.
+        """
+        while True:
+            with self.__scheduler_condition:
+                if self.__scheduler_stop:
+                    return
+                if not self.__scheduled:
+                    self.__scheduler_condition.wait()
+                    continue
+                now = time.monotonic()
+                deadlines = [entry[2] for entry in self.__scheduled if entry[2] is not None]
+                next_deadline = min(deadlines) if deadlines else None
+                window = self.__get_wake_window(now)
+                if next_deadline is not None and next_deadline <= now:
+                    # Waited too long for a wake window, send it anyway.
+                    entry = next(entry for entry in self.__scheduled if entry[2] is not None and entry[2] <= now)
+                    self.__scheduled.remove(entry)
+                elif window is None and self.__has_wake_window_clock():
+                    # Wait for a network woke up event.
+                    self.__scheduler_condition.wait(next_deadline - now if next_deadline is not None else None)
+                    continue
+                elif window is not None and window[0] > now:
+                    self.__scheduler_condition.wait(DigiMeshDevice.__get_wait_time(window[0], next_deadline, now))
+                    continue
+                elif (window is not None and window[1] is not None
+                        and window[1] - DigiMeshDevice.__WAKE_WINDOW_MARGIN <= now):
+                    # Too late for this window, wait for the next one.
+                    self.__scheduler_condition.wait(DigiMeshDevice.__get_wait_time(
+                        window[1] + DigiMeshDevice.__WAKE_WINDOW_MARGIN, next_deadline, now))
+                    continue
+                else:
+                    entry = self.__scheduled.popleft()
+                remote, data = entry[0], entry[1]
+            try:
+                self.send_data_async(remote, data)
+            except XBeeException as e:
+                self._log.exception(e)
+
+    def send_data_64(self, x64addr, data):
+        """
+        Override.
+
+        .. seealso::
+           | :meth:`.XBeeDevice.send_data_64`
+        """
+        return super()._send_data_64(x64addr, data)
+
+    def send_data_async_64(self, x64addr, data):
+        """
+        Override.
+
+        .. seealso::
+           | :meth:`.XBeeDevice.send_data_async_64`
+        """
+        super()._send_data_async_64(x64addr, data)
 
     def read_expl_data(self, timeout=None):
         """
@@ -2887,14 +3634,14 @@ class DigiPointDevice(XBeeDevice):
                                       dest_endpoint, cluster_id, profile_id)
 
 
-class ZigBeeDevice(XBeeDevice):
+class DigiPointDevice(XBeeDevice):
     """
-    This class represents a local ZigBee XBee device.
+    This class represents a local DigiPoint XBee device.
     """
 
     def __init__(self, port, baud_rate):
         """
-        Class constructor. Instantiates a new :class:`ZigBeeDevice` with the provided parameters.
+        Class constructor. Instantiates a new :class:`DigiPointDevice` with the provided parameters.
 
         Args:
             port (Integer or String): serial port identifier.
@@ -2903,13 +3650,14 @@ class ZigBeeDevice(XBeeDevice):
             baud_rate (Integer): the serial port baud rate.
 
         Raises:
-            All exceptions raised by :func:`.XBeeDevice.__init__` constructor.
+            All exceptions raised by :meth:`XBeeDevice.__init__` constructor.
 
         .. seealso::
            | :class:`.XBeeDevice`
-           | :meth:`XBeeDevice.__init__`
+           | :meth:`.XBeeDevice.__init__`
         """
         super().__init__(port, baud_rate)
+        self._network = DigiPointNetwork(self)
 
     def open(self):
         """
@@ -2923,7 +3671,7 @@ class ZigBeeDevice(XBeeDevice):
            | :meth:`.XBeeDevice.open`
         """
         super().open()
-        if self.get_protocol() != XBeeProtocol.ZIGBEE:
+        if self.get_protocol() != XBeeProtocol.DIGI_POINT:
             raise XBeeException("Invalid protocol.")
 
     def get_network(self):
@@ -2934,7 +3682,7 @@ class ZigBeeDevice(XBeeDevice):
            | :meth:`.XBeeDevice.get_network`
         """
         if self._network is None:
-            self._network = ZigBeeNetwork(self)
+            self._network = DigiPointNetwork(self)
         return self._network
 
     def get_protocol(self):
@@ -2944,7 +3692,135 @@ class ZigBeeDevice(XBeeDevice):
         .. seealso::
            | :meth:`.XBeeDevice.get_protocol`
         """
-        return XBeeProtocol.ZIGBEE
+        return XBeeProtocol.DIGI_POINT
+
+    def send_data_64_16(self, x64addr, x16addr, data):
+        """
+        Override.
+
+        .. seealso::
+           | :meth:`.XBeeDevice.send_data_64_16`
+        """
+        return super()._send_data_64_16(x64addr, x16addr, data)
+
+    def send_data_async_64_16(self, x64addr, x16addr, data):
+        """
+        Override.
+
+        .. seealso::
+           | :meth:`.XBeeDevice.send_data_async_64_16`
+        """
+        super()._send_data_async_64_16(x64addr, x16addr, data)
+
+    def read_expl_data(self, timeout=None):
+        """
+        Override.
+        
+        .. seealso::
+           | :meth:`.XBeeDevice.read_expl_data`
+        """
+        return super()._read_expl_data(timeout=timeout)
+
+    def read_expl_data_from(self, remote_xbee_device, timeout=None):
+        """
+        Override.
+        
+        .. seealso::
+           | :meth:`.XBeeDevice.read_expl_data_from`
+        """
+        return super()._read_expl_data_from(remote_xbee_device, timeout=timeout)
+
+    def send_expl_data(self, remote_xbee_device, data, src_endpoint, dest_endpoint,
+                       cluster_id, profile_id):
+        """
+        Override.
+        
+        .. seealso::
+           | :meth:`.XBeeDevice.send_expl_data`
+        """
+        return super()._send_expl_data(remote_xbee_device, data, src_endpoint, dest_endpoint, cluster_id,
+                                       profile_id)
+
+    def send_expl_data_broadcast(self, data, src_endpoint, dest_endpoint, cluster_id, profile_id):
+        """
+        Override.
+        
+        .. seealso::
+           | :meth:`.XBeeDevice._send_expl_data_broadcast`
+        """
+        return super()._send_expl_data_broadcast(data, src_endpoint, dest_endpoint, cluster_id, profile_id)
+
+    def send_expl_data_async(self, remote_xbee_device, data, src_endpoint, dest_endpoint,
+                             cluster_id, profile_id):
+        """
+        Override.
+        
+        .. seealso::
+           | :meth:`.XBeeDevice.send_expl_data_async`
+        """
+        super()._send_expl_data_async(remote_xbee_device, data, src_endpoint,
+                                      dest_endpoint, cluster_id, profile_id)
+
+
+class ZigBeeDevice(XBeeDevice):
+    """
+    This class represents a local ZigBee XBee device.
+    """
+
+    def __init__(self, port, baud_rate):
+        """
+        Class constructor. Instantiates a new :class:`ZigBeeDevice` with the provided parameters.
+
+        Args:
+            port (Integer or String): serial port identifier.
+                Integer: number of XBee device, numbering starts at zero.
+                Device name: depending on operating system. e.g. '/dev/ttyUSB0' on GNU/Linux or 'COM3' on Windows.
+            baud_rate (Integer): the serial port baud rate.
+
+        Raises:
+            All exceptions raised by :func:`.XBeeDevice.__init__` constructor.
+
+        .. seealso::
+           | :class:`.XBeeDevice`
+           | :meth:`XBeeDevice.__init__`
+        """
+        super().__init__(port, baud_rate)
+        self._network = ZigBeeNetwork(self)
+
+    def open(self):
+        """
+        Override.
+
+        Raises:
+            XBeeException: if the protocol is invalid.
+            All exceptions raised by :meth:`.XBeeDevice.open`.
+
+        .. seealso::
+           | :meth:`.XBeeDevice.open`
+        """
+        super().open()
+        if self.get_protocol() != XBeeProtocol.ZIGBEE:
+            raise XBeeException("Invalid protocol.")
+
+    def get_network(self):
+        """
+        Override.
+
+        .. seealso::
+           | :meth:`.XBeeDevice.get_network`
+        """
+        if self._network is None:
+            self._network = ZigBeeNetwork(self)
+        return self._network
+
+    def get_protocol(self):
+        """
+        Override.
+        
+        .. seealso::
+           | :meth:`.XBeeDevice.get_protocol`
+        """
+        return XBeeProtocol.ZIGBEE
 
     def get_ai_status(self):
         """
@@ -2964,6 +3840,29 @@ class ZigBeeDevice(XBeeDevice):
         """
         super()._force_disassociate()
 
+    def send_packet(self, packet, sync=False):
+        """
+        Override.
+
+        If the packet is a transmit request or an explicit addressing packet
+        and the route to its destination is known by the network (learned from
+        a route record indicator), a create source route packet is sent before
+        it, so the packet is source routed instead of triggering a route
+        discovery.
+
+        .. seealso::
+           | :meth:`.XBeeDevice.send_packet`
+           | :meth:`.ZigBeeNetwork.get_route`
+        """
+        if packet.get_frame_type() in (ApiFrameType.TRANSMIT_REQUEST, ApiFrameType.EXPLICIT_ADDRESSING):
+            x64addr = packet.x64bit_dest_addr
+            if x64addr != XBee64BitAddress.BROADCAST_ADDRESS and x64addr != XBee64BitAddress.UNKNOWN_ADDRESS:
+                hops = self._network.get_route(x64addr)
+                if hops:
+                    # Frame ID 0: the create source route packet has no response.
+                    super().send_packet(CreateSourceRoutePacket(0, x64addr, packet.x16bit_dest_addr, 0, hops))
+        return super().send_packet(packet, sync=sync)
+
     def send_data_64_16(self, x64addr, x16addr, data):
         """
         Override.
@@ -3070,7 +3969,7 @@ class ZigBeeDevice(XBeeDevice):
                                                   XBee64BitAddress.UNKNOWN_ADDRESS,
                                                   group_id, src_endpoint, dest_endpoint,
                                                   cluster_id, profile_id, 0,
-                                                  TransmitOptions.ENABLE_MULTICAST.value, data)
+                                                  TransmitOptions.ENABLE_MULTICAST.value, self._encode_payload(data))
         
         return self.send_packet_sync_and_get_response(packet_to_send)
 
@@ -3103,7 +4002,7 @@ class ZigBeeDevice(XBeeDevice):
                                                   XBee64BitAddress.UNKNOWN_ADDRESS,
                                                   group_id, src_endpoint, dest_endpoint,
                                                   cluster_id, profile_id, 0,
-                                                  TransmitOptions.ENABLE_MULTICAST.value, data)
+                                                  TransmitOptions.ENABLE_MULTICAST.value, self._encode_payload(data))
         
         self.send_packet(packet_to_send)
 
@@ -3499,7 +4398,7 @@ class IPDevice(XBeeDevice):
         if packet.get_frame_type() == ApiFrameType.RX_IPV4:
             return IPMessage(packet.source_address, packet.source_port,
                              packet.dest_port, packet.ip_protocol,
-                             packet.data)
+                             packet.data, packet.timestamp)
 
         return None
 
@@ -3636,6 +4535,34 @@ class IPDevice(XBeeDevice):
         """
         raise AttributeError(self.__OPERATION_EXCEPTION)
 
+    def create_transmit_template(self, remote_xbee_device, transmit_options=TransmitOptions.NONE.value,
+                                 src_endpoint=None, dest_endpoint=None, cluster_id=None, profile_id=None):
+        """
+        Deprecated.
+
+        Operation not supported in this protocol.
+        This method will raise an :class:`.AttributeError`.
+        """
+        raise AttributeError(self.__OPERATION_EXCEPTION)
+
+    def create_data_stream(self, remote_xbee_device, transmit_options=TransmitOptions.DISABLE_ACK.value):
+        """
+        Deprecated.
+
+        Operation not supported in this protocol.
+        This method will raise an :class:`.AttributeError`.
+        """
+        raise AttributeError(self.__OPERATION_EXCEPTION)
+
+    def create_message_batcher(self, linger_time=None, max_payload=None):
+        """
+        Deprecated.
+
+        Operation not supported in this protocol.
+        This method will raise an :class:`.AttributeError`.
+        """
+        raise AttributeError(self.__OPERATION_EXCEPTION)
+
 
 class CellularDevice(IPDevice):
     """
@@ -4090,6 +5017,7 @@ class WiFiDevice(IPDevice):
 
     __DEFAULT_ACCESS_POINT_TIMEOUT = 15  # 15 seconds of timeout to connect, disconnect and scan access points.
     __DISCOVER_TIMEOUT = 30  # 30 seconds of access points discovery timeout.
+    __AI_CHECK_INTERVAL = 1  # Seconds between association indication checks if no modem status is received.
 
     def __init__(self, port, baud_rate):
         """
@@ -4217,27 +5145,26 @@ class WiFiDevice(IPDevice):
             if xbee_packet.status == ATCommandStatus.ERROR:
                 self.__scanning_aps = False
                 self.__scanning_aps_error = True
+                scan_finished.set()
             # Check for end of discovery.
             elif xbee_packet.command_value is None or len(xbee_packet.command_value) == 0:
                 self.__scanning_aps = False
+                scan_finished.set()
             # Get the access point from the command value.
             else:
                 access_point = self.__parse_access_point(xbee_packet.command_value)
                 if access_point is not None:
                     access_points_list.append(access_point)
 
+        scan_finished = Event()
         self.add_packet_received_callback(packet_receive_callback)
         self.__scanning_aps = True
 
         try:
             self.send_packet(ATCommPacket(self.get_next_frame_id(), "AS"), False)
 
-            dead_line = time.clock() + self.__DISCOVER_TIMEOUT
-            while self.__scanning_aps and time.clock() < dead_line:
-                time.sleep(0.1)
-
             # Check if we exited because of a timeout.
-            if self.__scanning_aps:
+            if not scan_finished.wait(self.__DISCOVER_TIMEOUT):
                 raise TimeoutException
             # Check if there was an error in the active scan command (device is already connected).
             if self.__scanning_aps_error:
@@ -4296,16 +5223,7 @@ class WiFiDevice(IPDevice):
             self.set_parameter("PK", bytearray(password, "utf8"))
 
         # Wait for the module to connect to the access point.
-        dead_line = time.clock() + self.__ap_timeout
-        while time.clock() < dead_line:
-            time.sleep(0.1)
-            # Get the association indication value of the module.
-            status = self.get_parameter("AI")
-            if status is None or len(status) < 1:
-                continue
-            if status[0] == 0:
-                return True
-        return False
+        return self.__wait_for_association_status(0)
 
     def connect_by_ssid(self, ssid, password=None):
         """
@@ -4379,16 +5297,47 @@ class WiFiDevice(IPDevice):
            | :meth:`.WiFiDevice.set_access_point_timeout`
         """
         self.execute_command("NR")
-        dead_line = time.clock() + self.__ap_timeout
-        while time.clock() < dead_line:
-            time.sleep(0.1)
-            # Get the association indication value of the module.
-            status = self.get_parameter("AI")
-            if status is None or len(status) < 1:
-                continue
-            if status[0] == 0x23:
-                return True
-        return False
+        return self.__wait_for_association_status(0x23)
+
+    def __wait_for_association_status(self, ai_value):
+        """
+        Blocks until the association indication (``AI``) of the module has
+        the provided value or the configured access point timeout expires.
+
+        The value is read again every time the module reports a modem status
+        (it does when it joins or leaves an access point) and, in case that
+        status is lost, every :attr:`__AI_CHECK_INTERVAL` seconds.
+
+        Args:
+            ai_value (Integer): the association indication value to wait for.
+
+        Returns:
+            Boolean: ``True`` if the module reached the association indication value, ``False`` otherwise.
+
+        Raises:
+            TimeoutException: if there is a timeout reading the ``AI`` parameter.
+            XBeeException: if there is any other XBee related exception.
+        """
+        status_received = Event()
+
+        def modem_status_callback(modem_status):
+            status_received.set()
+
+        self.add_modem_status_received_callback(modem_status_callback)
+        try:
+            dead_line = time.monotonic() + self.__ap_timeout
+            while True:
+                status_received.clear()
+                # Get the association indication value of the module.
+                status = self.get_parameter("AI")
+                if status is not None and len(status) > 0 and status[0] == ai_value:
+                    return True
+                remaining = dead_line - time.monotonic()
+                if remaining <= 0:
+                    return False
+                status_received.wait(min(remaining, self.__AI_CHECK_INTERVAL))
+        finally:
+            self.del_modem_status_received_callback(modem_status_callback)
 
     def is_connected(self):
         """
@@ -4701,6 +5650,76 @@ class RemoteXBeeDevice(AbstractXBeeDevice):
         self._16bit_addr = x16bit_addr
         self._node_id = node_id
 
+        self._role = None
+        self._parent_16bit_addr = None
+        self._profile_id = None
+        self._manufacturer_id = None
+
+    def update_device_data_from(self, device):
+        """
+        Override.
+
+        .. seealso::
+           | :meth:`.AbstractXBeeDevice.update_device_data_from`
+        """
+        super().update_device_data_from(device)
+        if not isinstance(device, RemoteXBeeDevice):
+            return
+        if device.get_role() is not None:
+            self._role = device.get_role()
+        if device.get_parent_16bit_addr() is not None:
+            self._parent_16bit_addr = device.get_parent_16bit_addr()
+        if device.get_profile_id() is not None:
+            self._profile_id = device.get_profile_id()
+        if device.get_manufacturer_id() is not None:
+            self._manufacturer_id = device.get_manufacturer_id()
+
+    def get_role(self):
+        """
+        Returns the role of the remote XBee device in the network, as
+        reported by its last node identification.
+
+        Returns:
+            :class:`.Role`: the role of the remote XBee device, ``None`` if it is not known.
+
+        .. seealso::
+           | :class:`.Role`
+        """
+        return self._role
+
+    def get_parent_16bit_addr(self):
+        """
+        Returns the 16-bit address of the parent of the remote XBee device, as
+        reported by its last node identification.
+
+        Returns:
+            :class:`.XBee16BitAddress`: the 16-bit parent address, ``None`` if it is not known.
+
+        .. seealso::
+           | :class:`.XBee16BitAddress`
+        """
+        return self._parent_16bit_addr
+
+    def get_profile_id(self):
+        """
+        Returns the Digi profile ID of the remote XBee device, as reported by
+        its last node identification.
+
+        Returns:
+            Integer: the Digi profile ID, ``None`` if it is not known.
+        """
+        return self._profile_id
+
+    def get_manufacturer_id(self):
+        """
+        Returns the Digi manufacturer ID of the remote XBee device, as
+        reported by its last node identification.
+
+        Returns:
+            Integer: the Digi manufacturer ID, ``None`` if it is not known.
+        """
+        return self._manufacturer_id
+
     def get_parameter(self, parameter):
         """
         Override.
@@ -5015,59 +6034,1471 @@ class RemoteZigBeeDevice(RemoteXBeeDevice):
         super()._force_disassociate()
 
 
-class XBeeNetwork(object):
+class DataStream(object):
     """
-    This class represents an XBee Network.
+    This class represents a stream of data sent to a remote XBee device
+    without transmit status.
 
-    The network allows the discovery of remote devices in the same network
-    as the local one and stores them.
-    """
+    Every frame of the stream is sent with frame ID 0, so the local XBee
+    device never reports whether it was delivered. The counters of the stream
+    are local only: a frame is counted as sent once it has been written to
+    the serial port.
 
-    ND_PACKET_FINISH = 0x01
-    """
-    Flag that indicates a "discovery process finish" packet.
-    """
+    Use :meth:`.XBeeDevice.create_data_stream` to create streams.
 
-    ND_PACKET_REMOTE = 0x02
-    """
-    Flag that indicates a discovery process packet with info about a remote XBee device.
+    .. seealso::
+       | :meth:`.XBeeDevice.create_data_stream`
+       | :class:`.TransmitTemplate`
     """
 
-    # Default timeout for discovering process in case of
-    # the real timeout can't be determined.
-    __DEFAULT_DISCOVERY_TIMEOUT = 20
-
-    # Correction values for the timeout for determined devices.
-    # It has been tested and work 'fine'
-    __DIGI_MESH_TIMEOUT_CORRECTION = 3
-    __DIGI_MESH_SLEEP_TIMEOUT_CORRECTION = 0.1  # DigiMesh with sleep support.
-    __DIGI_POINT_TIMEOUT_CORRECTION = 8
-
-    __NODE_DISCOVERY_COMMAND = "ND"
-
-    def __init__(self, xbee_device):
+    def __init__(self, xbee_device, remote_xbee_device, transmit_options=TransmitOptions.DISABLE_ACK.value):
         """
-        Class constructor. Instantiates a new ``XBeeNetwork``.
+        Class constructor. Instantiates a new :class:`.DataStream` object with the provided parameters.
 
         Args:
-            xbee_device (:class:`.XBeeDevice`): the local XBee device to get the network from.
+            xbee_device (:class:`.XBeeDevice`): the local XBee device to send the data through.
+            remote_xbee_device (:class:`.RemoteXBeeDevice`): the remote XBee device to send data to.
+            transmit_options (Integer, optional, default=:attr:`.TransmitOptions.DISABLE_ACK`): bitfield of
+                transmit options. See :class:`.TransmitOptions`.
 
         Raises:
-            ValueError: if ``xbee_device`` is ``None``.
+            ValueError: if ``remote_xbee_device`` is ``None`` or has no address.
+
+        .. seealso::
+           | :class:`.RemoteXBeeDevice`
+           | :class:`.TransmitOptions`
+           | :class:`.XBeeDevice`
         """
-        if xbee_device is None:
-            raise ValueError("Local XBee device cannot be None")
+        if remote_xbee_device is None:
+            raise ValueError("Remote XBee device cannot be None")
 
         self.__xbee_device = xbee_device
-        self.__devices_list = []
-        self.__last_search_dev_list = []
+        self.__remote_device = remote_xbee_device
+        self.__transmit_options = transmit_options
+        self.__template = None
+        if xbee_device.get_protocol() != XBeeProtocol.RAW_802_15_4:
+            self.__template = xbee_device.create_transmit_template(remote_xbee_device, transmit_options)
+        elif remote_xbee_device.get_64bit_addr() is None and remote_xbee_device.get_16bit_addr() is None:
+            raise ValueError("Remote XBee device must have 64-bit or 16-bit address")
+
         self.__lock = threading.Lock()
-        self.__discovering = False
-        self.__device_discovered = DeviceDiscovered()
-        self.__device_discovery_finished = DiscoveryProcessFinished()
-        self.__discovery_thread = None
+        self.__sent_frames = 0
+        self.__sent_bytes = 0
+        self.__failed_frames = 0
+
+    def send(self, data):
+        """
+        Sends the provided data through the stream.
+
+        This method returns as soon as the frame has been written to the
+        serial port, the XBee device does not report the transmission status.
+
+        Args:
+            data (Bytearray): the raw data to send.
+
+        Raises:
+            ValueError: if ``data`` is ``None``.
+            InvalidOperatingModeException: if the XBee device's operating mode is not API or ESCAPED API. This
+                method only checks the cached value of the operating mode.
+            XBeeException: if the XBee device's serial port is closed.
+        """
+        if data is None:
+            raise ValueError("Data cannot be None")
+
+        try:
+            self.__xbee_device._send_stream_packet(self.__build_packet(data))
+        except Exception:
+            with self.__lock:
+                self.__failed_frames += 1
+            raise
+        with self.__lock:
+            self.__sent_frames += 1
+            self.__sent_bytes += len(data)
+
+    def reset_counters(self):
+        """
+        Resets the counters of the stream.
+        """
+        with self.__lock:
+            self.__sent_frames = 0
+            self.__sent_bytes = 0
+            self.__failed_frames = 0
+
+    def __build_packet(self, data):
+        """
+        Builds the packet to send the provided data, with frame ID 0.
+
+        Args:
+            data (Bytearray): the raw data to send.
+
+        Returns:
+            :class:`.XBeePacket`: the packet to send.
+        """
+        if self.__template is not None:
+            return self.__xbee_device._build_template_packet(self.__template, data, 0)
+
+        data = self.__xbee_device._encode_payload(data)
+        x64addr = self.__remote_device.get_64bit_addr()
+        if x64addr is not None:
+            return TX64Packet(0, x64addr, self.__transmit_options, data)
+        return TX16Packet(0, self.__remote_device.get_16bit_addr(), self.__transmit_options, data)
+
+    def __get_remote_device(self):
+        """
+        Returns the remote XBee device the stream sends data to.
+
+        Returns:
+            :class:`.RemoteXBeeDevice`: the remote XBee device.
+        """
+        return self.__remote_device
+
+    def __get_transmit_options(self):
+        """
+        Returns the transmit options of the stream.
+
+        Returns:
+            Integer: the transmit options bitfield.
+        """
+        return self.__transmit_options
+
+    def __get_sent_frames(self):
+        """
+        Returns the number of frames written to the serial port.
+
+        Returns:
+            Integer: the number of frames written to the serial port.
+        """
+        return self.__sent_frames
+
+    def __get_sent_bytes(self):
+        """
+        Returns the number of payload bytes written to the serial port.
+
+        Returns:
+            Integer: the number of payload bytes written to the serial port.
+        """
+        return self.__sent_bytes
+
+    def __get_failed_frames(self):
+        """
+        Returns the number of frames that could not be written to the serial
+        port.
+
+        Returns:
+            Integer: the number of frames that could not be written.
+        """
+        return self.__failed_frames
+
+    remote_device = property(__get_remote_device)
+    """:class:`.RemoteXBeeDevice`. Remote XBee device the stream sends data to."""
+
+    transmit_options = property(__get_transmit_options)
+    """Integer. Transmit options bitfield of the stream."""
+
+    sent_frames = property(__get_sent_frames)
+    """Integer. Number of frames written to the serial port."""
+
+    sent_bytes = property(__get_sent_bytes)
+    """Integer. Number of payload bytes written to the serial port."""
+
+    failed_frames = property(__get_failed_frames)
+    """Integer. Number of frames that could not be written to the serial port."""
+
+
+class MessageBatcher(object):
+    """
+    This class packs small messages sent to the same remote XBee device into
+    a single RF payload, so they share the RF overhead and the transmit
+    status of one frame.
+
+    Messages are kept per destination until the payload is full or the
+    oldest one has waited the linger time, and then they are sent together
+    (asynchronously, see :meth:`.XBeeDevice.send_data_async`).
+
+    A batched payload is the :attr:`.MessageBatcher.HEADER` bytes, every
+    message preceded by its length (1 byte) and the 2 low bytes of the CRC-32
+    of all of them, so other payloads are not taken for batched ones by
+    mistake. Messages that do not fit in a batch are sent alone, without
+    batch format, after the pending batch of their destination.
+
+    Batches that cannot be sent are logged and discarded, and their messages
+    are counted in :attr:`.MessageBatcher.failed_messages`.
+
+    Use :meth:`.XBeeDevice.create_message_batcher` to create batchers.
+
+    .. seealso::
+       | :meth:`.XBeeDevice.create_message_batcher`
+       | :meth:`.XBeeDevice.set_batch_unpacking`
+    """
+
+    HEADER = b"\xF9\x5B"
+    """
+    First bytes of the batched payloads.
+    """
+
+    __OVERHEAD = len(HEADER) + 2
+    """
+    Size of the header and the check bytes of a batched payload.
+    """
+
+    __DEFAULT_LINGER_TIME = 0.05  # seconds
+    """
+    Default maximum time a message waits for others before being sent.
+    """
+
+    __MAX_MESSAGE_LEN = 0xFF
+    """
+    Maximum length of a batched message.
+    """
+
+    def __init__(self, xbee_device, max_payload, linger_time=None):
+        """
+        Class constructor. Instantiates a new :class:`.MessageBatcher` object with the provided parameters.
+
+        Args:
+            xbee_device (:class:`.XBeeDevice`): the local XBee device to send the messages through.
+            max_payload (Integer): maximum size (in bytes) of the RF payloads.
+            linger_time (Float, optional): maximum time (in seconds) a message waits for others before being
+                sent. ``None`` to use the default value.
+
+        Raises:
+            ValueError: if ``linger_time`` is negative or ``max_payload`` is less than 6.
+
+        .. seealso::
+           | :class:`.XBeeDevice`
+        """
+        if linger_time is None:
+            linger_time = MessageBatcher.__DEFAULT_LINGER_TIME
+        if linger_time < 0:
+            raise ValueError("Linger time cannot be negative")
+        if max_payload < MessageBatcher.__OVERHEAD + 2:
+            raise ValueError("Maximum payload must be at least %d bytes" % (MessageBatcher.__OVERHEAD + 2))
+
+        self.__xbee_device = xbee_device
+        self.__max_payload = max_payload
+        self.__linger_time = linger_time
+
+        # Pending batches by destination: [remote, messages, payload size, deadline].
+        self.__batches = {}
+        self.__condition = threading.Condition()
+        # Held while taking batches and sending them, so messages to the same destination keep their order.
+        self.__send_lock = threading.RLock()
+        self.__thread = None
+        self.__closed = False
+
+        self.__sent_messages = 0
+        self.__sent_frames = 0
+        self.__failed_messages = 0
+
+    @staticmethod
+    def pack_messages(messages):
+        """
+        Packs the provided messages into a batched payload.
+
+        Args:
+            messages (List): list of messages (Bytearray) to pack. Each one must be 255 bytes long at most.
+
+        Returns:
+            Bytearray: the batched payload.
+
+        Raises:
+            ValueError: if any message is longer than 255 bytes.
+        """
+        payload = bytearray(MessageBatcher.HEADER)
+        for message in messages:
+            if len(message) > MessageBatcher.__MAX_MESSAGE_LEN:
+                raise ValueError("Batched messages cannot be longer than 255 bytes")
+            payload.append(len(message))
+            payload += message
+        payload += utils.int_to_bytes(zlib.crc32(payload) & 0xFFFF, num_bytes=2)
+        return payload
+
+    @staticmethod
+    def unpack_messages(payload):
+        """
+        Unpacks the messages of the provided batched payload.
+
+        Args:
+            payload (Bytearray): the batched payload.
+
+        Returns:
+            List: the list of messages (Bytearray), ``None`` if ``payload`` is not a valid batched payload.
+        """
+        header_len = len(MessageBatcher.HEADER)
+        if len(payload) < MessageBatcher.__OVERHEAD + 1 or payload[:header_len] != MessageBatcher.HEADER:
+            return None
+        length = len(payload) - 2
+        if utils.bytes_to_int(payload[length:]) != zlib.crc32(payload[:length]) & 0xFFFF:
+            return None
+
+        messages = []
+        index = header_len
+        while index < length:
+            end = index + 1 + payload[index]
+            if end > length:
+                return None
+            messages.append(payload[index + 1:end])
+            index = end
+        return messages
+
+    def send(self, remote_xbee_device, data):
+        """
+        Queues the provided message to be sent to the provided remote XBee
+        device.
+
+        The message is sent with the next batch of the destination, when it
+        is full or when the oldest message of the batch has waited the linger
+        time. Messages too long to be batched are sent immediately, right
+        after the pending batch of the destination.
+
+        Args:
+            remote_xbee_device (:class:`.RemoteXBeeDevice`): the remote XBee device to send the message to.
+            data (Bytearray): the message to send.
+
+        Raises:
+            ValueError: if ``remote_xbee_device`` or ``data`` is ``None``.
+            XBeeException: if the batcher is closed.
+            All exceptions raised by :meth:`.XBeeDevice.send_data_async` when the message is sent immediately.
+
+        .. seealso::
+           | :class:`.RemoteXBeeDevice`
+        """
+        if remote_xbee_device is None:
+            raise ValueError("Remote XBee device cannot be None")
+        if data is None:
+            raise ValueError("Data cannot be None")
+
+        key = MessageBatcher.__get_key(remote_xbee_device)
+        size = len(data) + 1
+        direct = size > MessageBatcher.__MAX_MESSAGE_LEN + 1 or size + MessageBatcher.__OVERHEAD > self.__max_payload
+        with self.__send_lock:
+            with self.__condition:
+                if self.__closed:
+                    raise XBeeException("Message batcher closed")
+
+                if direct:
+                    # The pending messages of the destination are sent first to keep the order.
+                    full_batch = self.__batches.pop(key, None)
+                else:
+                    full_batch = None
+                    batch = self.__batches.get(key)
+                    if batch is not None and batch[2] + size > self.__max_payload:
+                        full_batch = self.__batches.pop(key)
+                        batch = None
+                    if batch is None:
+                        batch = [remote_xbee_device, [], MessageBatcher.__OVERHEAD,
+                                 time.monotonic() + self.__linger_time]
+                        self.__batches[key] = batch
+                        self.__condition.notify()
+                    batch[1].append(data)
+                    batch[2] += size
+
+                    if self.__thread is None:
+                        self.__thread = threading.Thread(target=self.__run, daemon=True)
+                        self.__thread.start()
+
+            if full_batch is not None:
+                self.__send_batch(full_batch)
+            if direct:
+                self.__xbee_device.send_data_async(remote_xbee_device, data)
+                with self.__condition:
+                    self.__sent_messages += 1
+                    self.__sent_frames += 1
+
+    def flush(self):
+        """
+        Sends all the pending batches immediately.
+        """
+        with self.__send_lock:
+            with self.__condition:
+                batches = list(self.__batches.values())
+                self.__batches.clear()
+            for batch in batches:
+                self.__send_batch(batch)
+
+    def close(self):
+        """
+        Sends all the pending batches and stops the batcher. Messages cannot
+        be sent through a closed batcher.
+        """
+        with self.__condition:
+            self.__closed = True
+            self.__condition.notify()
+            thread = self.__thread
+        if thread is not None:
+            thread.join()
+        self.flush()
+
+    @staticmethod
+    def __get_key(remote_xbee_device):
+        """
+        Returns the key of the batches of the provided remote XBee device.
+
+        Args:
+            remote_xbee_device (:class:`.RemoteXBeeDevice`): the remote XBee device.
+
+        Returns:
+            String: the key of the batches of the remote XBee device.
+        """
+        x64addr = remote_xbee_device.get_64bit_addr()
+        if x64addr is not None and x64addr != XBee64BitAddress.UNKNOWN_ADDRESS:
+            return str(x64addr)
+        return str(remote_xbee_device.get_16bit_addr())
+
+    def __run(self):
+        """
+        Sends the batches whose linger time has expired until the batcher is
+        closed.
+        """
+        while True:
+            with self.__condition:
+                if self.__closed:
+                    return
+                now = time.monotonic()
+                if not any(batch[3] <= now for batch in self.__batches.values()):
+                    deadlines = [batch[3] for batch in self.__batches.values()]
+                    self.__condition.wait(min(deadlines) - now if deadlines else None)
+                    continue
+            with self.__send_lock:
+                with self.__condition:
+                    now = time.monotonic()
+                    expired = [key for key, batch in self.__batches.items() if batch[3] <= now]
+                    expired_batches = [self.__batches.pop(key) for key in expired]
+                for batch in expired_batches:
+                    self.__send_batch(batch)
+
+    def __send_batch(self, batch):
+        """
+        Sends the provided batch. If it cannot be sent, its messages are
+        counted as failed.
+
+        Args:
+            batch (List): the batch to send.
+        """
+        try:
+            self.__xbee_device.send_data_async(batch[0], MessageBatcher.pack_messages(batch[1]))
+        except Exception as e:
+            self.__xbee_device.log.exception(e)
+            with self.__condition:
+                self.__failed_messages += len(batch[1])
+            return
+        with self.__condition:
+            self.__sent_messages += len(batch[1])
+            self.__sent_frames += 1
+
+    def __get_max_payload(self):
+        """
+        Returns the maximum size of the RF payloads.
+
+        Returns:
+            Integer: the maximum size of the RF payloads in bytes.
+        """
+        return self.__max_payload
+
+    def __get_linger_time(self):
+        """
+        Returns the maximum time a message waits for others before being sent.
+
+        Returns:
+            Float: the linger time in seconds.
+        """
+        return self.__linger_time
+
+    def __get_sent_messages(self):
+        """
+        Returns the number of messages sent.
+
+        Returns:
+            Integer: the number of messages sent.
+        """
+        return self.__sent_messages
+
+    def __get_sent_frames(self):
+        """
+        Returns the number of frames sent.
+
+        Returns:
+            Integer: the number of frames sent.
+        """
+        return self.__sent_frames
+
+    def __get_failed_messages(self):
+        """
+        Returns the number of batched messages that could not be sent.
+
+        Returns:
+            Integer: the number of batched messages that could not be sent.
+        """
+        return self.__failed_messages
+
+    max_payload = property(__get_max_payload)
+    """Integer. Maximum size of the RF payloads in bytes."""
+
+    linger_time = property(__get_linger_time)
+    """Float. Maximum time (in seconds) a message waits for others before being sent."""
+
+    sent_messages = property(__get_sent_messages)
+    """Integer. Number of messages sent."""
+
+    sent_frames = property(__get_sent_frames)
+    """Integer. Number of frames sent."""
+
+    failed_messages = property(__get_failed_messages)
+    """Integer. Number of batched messages discarded because their batch could not be sent."""
+
+
+class GatewayGroup(object):
+    """
+    This class represents a group of local XBee devices (gateways) connected
+    to the same network, used together to send data to it.
+
+    For every destination, the group sends data through the best gateway,
+    based on:
+
+    1. Whether the gateway has heard the destination recently.
+    2. The RSSI of the last frame the gateway received from the
+       destination (only reported by some protocols).
+    3. The number of unicast transmit requests of the gateway waiting for
+       their transmit status.
+
+    Gateways with too many outstanding transmissions are skipped, and ties
+    rotate between gateways, so sends are spread across them. If a send fails, it is retried through
+    the next best gateway, and gateways whose serial port is closed are not
+    used.
+
+    .. seealso::
+       | :class:`.XBeeDevice`
+    """
+
+    __DEFAULT_HEARD_WINDOW = 60  # seconds
+    """
+    Default time a destination is considered reachable through the gateway
+    that heard it.
+    """
+
+    __DEFAULT_MAX_OUTSTANDING = 4
+    """
+    Default number of outstanding transmissions from which a gateway is
+    skipped if others are available.
+    """
+
+    def __init__(self, xbee_devices=None, heard_window=__DEFAULT_HEARD_WINDOW,
+                 max_outstanding=__DEFAULT_MAX_OUTSTANDING):
+        """
+        Class constructor. Instantiates a new :class:`.GatewayGroup` object with the provided parameters.
+
+        Args:
+            xbee_devices (List, optional): the local XBee devices (:class:`.XBeeDevice`) of the group.
+            heard_window (Float, optional, default=60): time (in seconds) a destination is considered reachable
+                through the gateway that heard it.
+            max_outstanding (Integer, optional, default=4): number of outstanding transmissions from which a
+                gateway is skipped if others are available.
+
+        Raises:
+            ValueError: if ``heard_window`` or ``max_outstanding`` is not greater than 0.
+        """
+        if heard_window <= 0:
+            raise ValueError("Heard window must be greater than 0")
+        if max_outstanding <= 0:
+            raise ValueError("Maximum outstanding transmissions must be greater than 0")
+
+        self.__heard_window = heard_window
+        self.__max_outstanding = max_outstanding
+        self.__lock = threading.Lock()
+        self.__gateways = []
+        self.__callbacks = {}  # {id(XBeeDevice): Function}
+        self.__heard = {}  # {(id(XBeeDevice), String): Float}
+        self.__rssi = {}  # {(id(XBeeDevice), String): Integer}
+        self.__next_gateway = 0
+        self.__duplicate_filter = None
+
+        for xbee_device in xbee_devices or []:
+            self.add_gateway(xbee_device)
+
+    def add_gateway(self, xbee_device):
+        """
+        Adds the provided local XBee device to the group.
+
+        If the XBee device is not open yet, the group starts tracking the
+        frames it receives when it is opened with :meth:`.GatewayGroup.open`.
+
+        Args:
+            xbee_device (:class:`.XBeeDevice`): the local XBee device to add.
+
+        Raises:
+            ValueError: if ``xbee_device`` is ``None`` or remote.
+        """
+        if xbee_device is None:
+            raise ValueError("XBee device cannot be None")
+        if xbee_device.is_remote():
+            raise ValueError("Remote XBee devices cannot be gateways")
+
+        with self.__lock:
+            if any(x is xbee_device for x in self.__gateways):
+                return
+            self.__gateways.append(xbee_device)
+            if self.__duplicate_filter is not None:
+                xbee_device.set_duplicate_filter(self.__duplicate_filter)
+        if xbee_device.is_open():
+            self.__register_callback(xbee_device)
+
+    def remove_gateway(self, xbee_device):
+        """
+        Removes the provided local XBee device from the group. The XBee device
+        is not closed.
+
+        Args:
+            xbee_device (:class:`.XBeeDevice`): the local XBee device to remove.
+
+        Raises:
+            ValueError: if ``xbee_device`` is not in the group.
+        """
+        with self.__lock:
+            if not any(x is xbee_device for x in self.__gateways):
+                raise ValueError("XBee device is not in the group")
+            self.__gateways = [x for x in self.__gateways if x is not xbee_device]
+            for key in [x for x in self.__heard if x[0] == id(xbee_device)]:
+                del self.__heard[key]
+            for key in [x for x in self.__rssi if x[0] == id(xbee_device)]:
+                del self.__rssi[key]
+            callback = self.__callbacks.pop(id(xbee_device), None)
+        if callback is not None and xbee_device.is_open():
+            xbee_device.del_packet_received_callback(callback)
+
+    def get_gateways(self):
+        """
+        Returns the local XBee devices of the group.
+
+        Returns:
+            List: the list of :class:`.XBeeDevice` of the group.
+        """
+        with self.__lock:
+            return list(self.__gateways)
+
+    def set_duplicate_filter(self, dup_filter):
+        """
+        Sets the same duplicate frame filter to all the local XBee devices of
+        the group, so a frame heard by several gateways is processed once.
+
+        Args:
+            dup_filter (:class:`.DuplicateFilter`): the filter to use, ``None`` to disable it.
+
+        .. seealso::
+           | :meth:`.XBeeDevice.set_duplicate_filter`
+        """
+        with self.__lock:
+            self.__duplicate_filter = dup_filter
+            gateways = list(self.__gateways)
+        for xbee_device in gateways:
+            xbee_device.set_duplicate_filter(dup_filter)
+
+    def open(self):
+        """
+        Opens the local XBee devices of the group that are not open.
+
+        XBee devices that cannot be opened are skipped, they can be opened
+        later calling this method again.
+
+        Raises:
+            XBeeException: if no XBee device of the group is open.
+        """
+        for xbee_device in self.get_gateways():
+            if not xbee_device.is_open():
+                try:
+                    xbee_device.open()
+                except Exception as e:
+                    xbee_device.log.exception(e)
+                    continue
+            if id(xbee_device) not in self.__callbacks:
+                self.__register_callback(xbee_device)
+        if not self.__get_available_gateways():
+            raise XBeeException("No gateway of the group could be opened")
+
+    def close(self):
+        """
+        Closes all the local XBee devices of the group.
+        """
+        with self.__lock:
+            self.__callbacks.clear()
+        for xbee_device in self.get_gateways():
+            xbee_device.close()
+
+    def get_network_devices(self):
+        """
+        Returns the remote XBee devices of the networks of all the gateways,
+        without duplicates.
+
+        For devices known by several gateways, the instance of the gateway
+        that heard it most recently is returned.
+
+        Returns:
+            List: the list of :class:`.RemoteXBeeDevice`.
+        """
+        merged = {}
+        for xbee_device in self.get_gateways():
+            network = xbee_device.get_network()
+            for remote in network.get_devices():
+                key = GatewayGroup.__get_key(remote)
+                last_seen = network.get_device_last_seen(remote) or 0
+                if key not in merged or merged[key][1] < last_seen:
+                    merged[key] = (remote, last_seen)
+        return [x[0] for x in merged.values()]
+
+    def get_best_gateway(self, remote_xbee_device):
+        """
+        Returns the best local XBee device of the group to send data to the
+        provided remote XBee device.
+
+        Args:
+            remote_xbee_device (:class:`.RemoteXBeeDevice`): the remote XBee device to send data to.
+
+        Returns:
+            :class:`.XBeeDevice`: the best gateway, ``None`` if no gateway is available.
+        """
+        gateways = self.__rank_gateways(remote_xbee_device)
+        return gateways[0] if gateways else None
+
+    def send_data(self, remote_xbee_device, data):
+        """
+        Blocking method. Sends data to the provided remote XBee device through
+        the best gateway, trying the rest if it fails.
+
+        Args:
+            remote_xbee_device (:class:`.RemoteXBeeDevice`): the remote XBee device to send data to.
+            data (Bytearray): the raw data to send.
+
+        Returns:
+            :class:`.XBeePacket`: the response.
+
+        Raises:
+            ValueError: if ``remote_xbee_device`` is ``None``.
+            XBeeException: if no gateway is available.
+            All exceptions raised by :meth:`.XBeeDevice.send_data` in the last gateway tried.
+
+        .. seealso::
+           | :meth:`.XBeeDevice.send_data`
+        """
+        return self.__send(remote_xbee_device, data, True)
+
+    def send_data_async(self, remote_xbee_device, data):
+        """
+        Non-blocking method. Sends data to the provided remote XBee device
+        through the best gateway, trying the rest if it cannot be sent.
+
+        Args:
+            remote_xbee_device (:class:`.RemoteXBeeDevice`): the remote XBee device to send data to.
+            data (Bytearray): the raw data to send.
+
+        Raises:
+            ValueError: if ``remote_xbee_device`` is ``None``.
+            XBeeException: if no gateway is available.
+            All exceptions raised by :meth:`.XBeeDevice.send_data_async` in the last gateway tried.
+
+        .. seealso::
+           | :meth:`.XBeeDevice.send_data_async`
+        """
+        self.__send(remote_xbee_device, data, False)
+
+    @staticmethod
+    def get_outstanding(xbee_device):
+        """
+        Returns the number of unicast transmit requests sent through the
+        provided gateway that are waiting for their transmit status.
+
+        Args:
+            xbee_device (:class:`.XBeeDevice`): the gateway.
+
+        Returns:
+            Integer: the number of outstanding transmissions.
+        """
+        return xbee_device.get_network()._get_number_pending_transmits(xbee_device.get_sync_ops_timeout())
+
+    def __send(self, remote_xbee_device, data, sync):
+        """
+        Sends data to the provided remote XBee device through the best gateway,
+        trying the rest if it fails.
+
+        Args:
+            remote_xbee_device (:class:`.RemoteXBeeDevice`): the remote XBee device to send data to.
+            data (Bytearray): the raw data to send.
+            sync (Boolean): ``True`` to wait for the transmit status, ``False`` otherwise.
+
+        Returns:
+            :class:`.XBeePacket`: the response if ``sync`` is ``True``, ``None`` otherwise.
+        """
+        if remote_xbee_device is None:
+            raise ValueError("Remote XBee device cannot be None")
+
+        gateways = self.__rank_gateways(remote_xbee_device)
+        if not gateways:
+            raise XBeeException("No gateway available")
+
+        error = None
+        for xbee_device in gateways:
+            try:
+                if sync:
+                    return xbee_device.send_data(remote_xbee_device, data)
+                xbee_device.send_data_async(remote_xbee_device, data)
+                return None
+            except (XBeeException, serial.SerialException, OSError) as e:
+                xbee_device.log.exception(e)
+                error = e
+        raise error
+
+    def __rank_gateways(self, remote_xbee_device):
+        """
+        Returns the available gateways sorted from the best to the worst to
+        send data to the provided remote XBee device.
+
+        Args:
+            remote_xbee_device (:class:`.RemoteXBeeDevice`): the remote XBee device to send data to.
+
+        Returns:
+            List: the sorted list of :class:`.XBeeDevice`.
+        """
+        gateways = self.__get_available_gateways()
+        if not gateways:
+            return gateways
+
+        key = GatewayGroup.__get_key(remote_xbee_device)
+        outstanding = {id(x): GatewayGroup.get_outstanding(x) for x in gateways}
+        now = time.monotonic()
+        with self.__lock:
+            # Rotate the gateways so ties are spread across them.
+            start = self.__next_gateway % len(gateways)
+            self.__next_gateway += 1
+            gateways = gateways[start:] + gateways[:start]
+
+            def score(xbee_device):
+                heard = self.__heard.get((id(xbee_device), key))
+                rssi = self.__rssi.get((id(xbee_device), key))
+                return (outstanding[id(xbee_device)] < self.__max_outstanding,
+                        heard is not None and now - heard < self.__heard_window,
+                        rssi if rssi is not None else -0xFF,
+                        -outstanding[id(xbee_device)])
+
+            return sorted(gateways, key=score, reverse=True)
+
+    def __get_available_gateways(self):
+        """
+        Returns the gateways whose serial port is open.
+
+        Returns:
+            List: the list of available :class:`.XBeeDevice`.
+        """
+        return [x for x in self.get_gateways() if x.is_open() and x.serial_port.is_open]
+
+    def __register_callback(self, xbee_device):
+        """
+        Starts tracking the frames received by the provided gateway.
+
+        Args:
+            xbee_device (:class:`.XBeeDevice`): the gateway.
+        """
+        def packet_received_callback(xbee_packet):
+            """
+            Callback that records which destinations the gateway hears.
+
+            It runs in the packet listener of the gateway, so errors are only
+            logged: they must not stop the listener.
+            """
+            try:
+                key = None
+                if hasattr(xbee_packet, "x64bit_source_addr"):
+                    key = GatewayGroup.__get_key_from_addr(xbee_packet.x64bit_source_addr, None)
+                elif hasattr(xbee_packet, "x16bit_source_addr"):
+                    key = GatewayGroup.__get_key_from_addr(None, xbee_packet.x16bit_source_addr)
+                if key is None:
+                    return
+                # Some frames have an RSSI field that is not always reported.
+                rssi = getattr(xbee_packet, "rssi", None)
+                with self.__lock:
+                    self.__heard[(id(xbee_device), key)] = time.monotonic()
+                    if rssi is not None:
+                        self.__rssi[(id(xbee_device), key)] = -rssi
+            except Exception as e:
+                xbee_device.log.exception(e)
+
+        with self.__lock:
+            if id(xbee_device) in self.__callbacks:
+                return
+            self.__callbacks[id(xbee_device)] = packet_received_callback
+        xbee_device.add_packet_received_callback(packet_received_callback)
+
+    @staticmethod
+    def __get_key(remote_xbee_device):
+        """
+        Returns the key that identifies the provided remote XBee device.
+
+        Args:
+            remote_xbee_device (:class:`.RemoteXBeeDevice`): the remote XBee device.
+
+        Returns:
+            String: the key of the remote XBee device.
+        """
+        return GatewayGroup.__get_key_from_addr(remote_xbee_device.get_64bit_addr(),
+                                                remote_xbee_device.get_16bit_addr())
+
+    @staticmethod
+    def __get_key_from_addr(x64bit_addr, x16bit_addr):
+        """
+        Returns the key that identifies the remote XBee device with the
+        provided addresses.
+
+        Args:
+            x64bit_addr (:class:`.XBee64BitAddress`): the 64-bit address, ``None`` if it is not known.
+            x16bit_addr (:class:`.XBee16BitAddress`): the 16-bit address, ``None`` if it is not known.
+
+        Returns:
+            String: the key of the remote XBee device, ``None`` if both addresses are unknown.
+        """
+        if x64bit_addr is not None and x64bit_addr != XBee64BitAddress.UNKNOWN_ADDRESS:
+            return str(x64bit_addr)
+        if x16bit_addr is not None and x16bit_addr != XBee16BitAddress.UNKNOWN_ADDRESS:
+            return str(x16bit_addr)
+        return None
+
+
+class IOPoller(object):
+    """
+    This class polls the IO lines of many remote XBee devices, each one at
+    its own period, sending ``IS`` remote AT commands through a local XBee
+    device.
+
+    Up to a maximum number of requests are kept in flight at the same time,
+    so responses from several remote XBee devices are awaited concurrently.
+    The first poll of each remote XBee device is shifted within its period
+    so that polls are spread over time instead of sent in bursts.
+
+    A poll that cannot be sent before the next one of the same remote XBee
+    device is due (because the previous request is still in flight or the
+    in-flight limit was reached) misses its deadline: it is skipped and
+    counted, instead of being sent late along with the next one.
+
+    Received IO samples are notified to the callbacks added with
+    :meth:`.IOPoller.add_callback`.
+
+    Use :meth:`.XBeeNetwork.create_io_poller` to create pollers.
+
+    .. seealso::
+       | :meth:`.XBeeNetwork.create_io_poller`
+       | :meth:`.AbstractXBeeDevice.read_io_sample`
+    """
+
+    __DEFAULT_MAX_IN_FLIGHT = 4
+    """
+    Default maximum number of requests in flight.
+    """
+
+    __PHASE_STEP = 0.6180339887498949
+    """
+    Fraction of the period the first poll of each new remote XBee device is
+    shifted with respect to the previous one. The golden ratio keeps the
+    polls spread however many remote XBee devices are added.
+    """
+
+    def __init__(self, xbee_device, max_in_flight=__DEFAULT_MAX_IN_FLIGHT, timeout=None):
+        """
+        Class constructor. Instantiates a new :class:`.IOPoller` object with the provided parameters.
+
+        Args:
+            xbee_device (:class:`.XBeeDevice`): the local XBee device to send the requests through.
+            max_in_flight (Integer, optional, default=4): maximum number of requests in flight.
+            timeout (Float, optional): time (in seconds) to wait for each response. ``None`` to use the
+                synchronous operations timeout of the local XBee device.
+
+        Raises:
+            ValueError: if ``max_in_flight`` is less than 1 or ``timeout`` is not greater than 0.
+
+        .. seealso::
+           | :class:`.XBeeDevice`
+        """
+        if max_in_flight < 1:
+            raise ValueError("Maximum number of requests in flight must be at least 1")
+        if timeout is not None and timeout <= 0:
+            raise ValueError("Timeout must be greater than 0")
+
+        self.__xbee_device = xbee_device
+        self.__max_in_flight = max_in_flight
+        self.__timeout = timeout
+
+        # Polled remote devices by key: [remote, period, next due time, request in flight].
+        self.__polls = {}
+        # Heap of (due time, key), entries whose due time does not match the poll are obsolete.
+        self.__schedule = []
+        # Requests in flight by frame ID: (key, deadline).
+        self.__in_flight = {}
+        self.__phase = 0.0
+        self.__callbacks = []
+        self.__packet_callback = None
+        self.__condition = threading.Condition()
+        self.__thread = None
+        self.__stop = True
+
+        self.__sent = 0
+        self.__received = 0
+        self.__timeouts = 0
+        self.__errors = 0
+        self.__missed = 0
+
+    def add_remote(self, remote_xbee_device, period):
+        """
+        Starts polling the provided remote XBee device, or changes its
+        period if it is already polled.
+
+        Args:
+            remote_xbee_device (:class:`.RemoteXBeeDevice`): the remote XBee device to poll.
+            period (Float): time (in seconds) between polls.
+
+        Raises:
+            ValueError: if ``period`` is not greater than 0.
+        """
+        if period <= 0:
+            raise ValueError("Period must be greater than 0")
+
+        key = IOPoller.__get_key(remote_xbee_device)
+        with self.__condition:
+            self.__phase = (self.__phase + IOPoller.__PHASE_STEP) % 1
+            due = time.monotonic() + period * self.__phase
+            poll = self.__polls.get(key)
+            self.__polls[key] = [remote_xbee_device, period, due, poll is not None and poll[3]]
+            heapq.heappush(self.__schedule, (due, key))
+            self.__condition.notify()
+
+    def remove_remote(self, remote_xbee_device):
+        """
+        Stops polling the provided remote XBee device. The response to a
+        request in flight is discarded.
+
+        Args:
+            remote_xbee_device (:class:`.RemoteXBeeDevice`): the remote XBee device.
+        """
+        with self.__condition:
+            self.__polls.pop(IOPoller.__get_key(remote_xbee_device), None)
+
+    def get_remotes(self):
+        """
+        Returns the polled remote XBee devices.
+
+        Returns:
+            List: the list of polled :class:`.RemoteXBeeDevice`.
+        """
+        with self.__condition:
+            return [poll[0] for poll in self.__polls.values()]
+
+    def add_callback(self, callback):
+        """
+        Adds a callback to notify the received IO samples to.
+
+        Args:
+            callback (Function): the callback. Receives two arguments.
+
+                * The remote XBee device as a :class:`.RemoteXBeeDevice`
+                * The received IO sample as an :class:`.IOSample`
+        """
+        with self.__condition:
+            self.__callbacks.append(callback)
+
+    def del_callback(self, callback):
+        """
+        Deletes a callback to notify the received IO samples to.
+
+        Args:
+            callback (Function): the callback to delete.
+
+        Raises:
+            ValueError: if ``callback`` was not added.
+        """
+        with self.__condition:
+            self.__callbacks.remove(callback)
+
+    def start(self):
+        """
+        Starts polling the remote XBee devices.
+
+        Raises:
+            XBeeException: if the local XBee device is not open.
+        """
+        if not self.__xbee_device.is_open():
+            raise XBeeException("Local XBee device is not open")
+        with self.__condition:
+            if not self.__stop:
+                return
+            self.__stop = False
+            self.__packet_callback = self.__packet_received_callback
+        self.__xbee_device.add_packet_received_callback(self.__packet_callback)
+        self.__thread = threading.Thread(target=self.__run, name="IOPoller", daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        """
+        Stops polling the remote XBee devices. The responses to the requests
+        in flight are discarded.
+        """
+        with self.__condition:
+            if self.__stop:
+                return
+            self.__stop = True
+            self.__condition.notify()
+            thread, self.__thread = self.__thread, None
+            packet_callback, self.__packet_callback = self.__packet_callback, None
+        thread.join()
+        try:
+            self.__xbee_device.del_packet_received_callback(packet_callback)
+        except ValueError:
+            pass
+        with self.__condition:
+            for key, _ in self.__in_flight.values():
+                poll = self.__polls.get(key)
+                if poll is not None:
+                    poll[3] = False
+            self.__in_flight.clear()
+
+    def is_running(self):
+        """
+        Returns whether the poller is running or not.
+
+        Returns:
+            Boolean: ``True`` if the poller is running, ``False`` otherwise.
+        """
+        return not self.__stop
+
+    def get_in_flight(self):
+        """
+        Returns the number of requests in flight.
+
+        Returns:
+            Integer: the number of requests waiting for a response.
+        """
+        with self.__condition:
+            return len(self.__in_flight)
+
+    def reset_counters(self):
+        """
+        Resets the counters of the poller.
+        """
+        with self.__condition:
+            self.__sent = 0
+            self.__received = 0
+            self.__timeouts = 0
+            self.__errors = 0
+            self.__missed = 0
+
+    @staticmethod
+    def __get_key(remote_xbee_device):
+        """
+        Returns the key of the polls of the provided remote XBee device.
+
+        Args:
+            remote_xbee_device (:class:`.RemoteXBeeDevice`): the remote XBee device.
+
+        Returns:
+            String: the key of the polls of the remote XBee device.
+        """
+        x64addr = remote_xbee_device.get_64bit_addr()
+        if x64addr is not None and x64addr != XBee64BitAddress.UNKNOWN_ADDRESS:
+            return str(x64addr)
+        return str(remote_xbee_device.get_16bit_addr())
+
+    def __run(self):
+        """
+        Sends the polls as they are due until the poller is stopped.
+        """
+        timeout = self.__timeout if self.__timeout is not None else self.__xbee_device.get_sync_ops_timeout()
+        while True:
+            with self.__condition:
+                if self.__stop:
+                    return
+                now = time.monotonic()
+                self.__expire_requests(now)
+                request, wait = self.__next_request(now)
+                if request is None:
+                    deadlines = [deadline for _, deadline in self.__in_flight.values()]
+                    if deadlines:
+                        wait = min(deadlines) - now if wait is None else min(wait, min(deadlines) - now)
+                    self.__condition.wait(wait)
+                    continue
+                frame_id = self.__xbee_device.get_next_frame_id()
+                self.__in_flight[frame_id] = (request[0], now + timeout)
+
+            remote = request[1]
+            x16addr = remote.get_16bit_addr()
+            if x16addr is None:
+                x16addr = XBee16BitAddress.UNKNOWN_ADDRESS
+            try:
+                self.__xbee_device.send_packet(RemoteATCommandPacket(frame_id, remote.get_64bit_addr(), x16addr,
+                                                                     RemoteATCmdOptions.NONE.value, "IS"))
+            except Exception as e:
+                self.__xbee_device.log.exception(e)
+                with self.__condition:
+                    self.__errors += 1
+                    self.__finish_request(frame_id)
+                continue
+            with self.__condition:
+                self.__sent += 1
+
+    def __expire_requests(self, now):
+        """
+        Discards the requests in flight whose response has not been received
+        in time.
+
+        Args:
+            now (Float): the current time.
+        """
+        for frame_id in [f for f, (_, deadline) in self.__in_flight.items() if deadline <= now]:
+            self.__timeouts += 1
+            self.__finish_request(frame_id)
+
+    def __next_request(self, now):
+        """
+        Takes the next poll to send from the schedule, if any is due and
+        there is room for another request in flight.
+
+        Args:
+            now (Float): the current time.
+
+        Returns:
+            Tuple: the key and the remote XBee device to poll (``None`` if there is nothing to send), and the
+                time to wait for the next due poll (``None`` if it is not known).
+        """
+        if len(self.__in_flight) >= self.__max_in_flight:
+            return None, None
+        while self.__schedule:
+            due, key = self.__schedule[0]
+            poll = self.__polls.get(key)
+            if poll is None or poll[2] != due:
+                heapq.heappop(self.__schedule)
+                continue
+            if due > now:
+                return None, due - now
+            heapq.heappop(self.__schedule)
+            # Skip the polls whose turn has passed, and this one too if the
+            # previous request of the device is still in flight.
+            passed = int((now - due) // poll[1])
+            poll[2] = due + (passed + 1) * poll[1]
+            heapq.heappush(self.__schedule, (poll[2], key))
+            if poll[3]:
+                self.__missed += passed + 1
+                continue
+            self.__missed += passed
+            poll[3] = True
+            return (key, poll[0]), None
+        return None, None
+
+    def __finish_request(self, frame_id):
+        """
+        Removes the provided request from the requests in flight.
+
+        Args:
+            frame_id (Integer): the frame ID of the request.
+
+        Returns:
+            List: the poll of the request, ``None`` if the request or the poll do not exist.
+        """
+        request = self.__in_flight.pop(frame_id, None)
+        if request is None:
+            return None
+        self.__condition.notify()
+        poll = self.__polls.get(request[0])
+        if poll is not None:
+            poll[3] = False
+        return poll
+
+    def __packet_received_callback(self, xbee_packet):
+        """
+        Callback that notifies the IO samples of the responses to the polls.
+
+        Args:
+            xbee_packet (:class:`.XBeePacket`): the received packet.
+        """
+        if (xbee_packet.get_frame_type() != ApiFrameType.REMOTE_AT_COMMAND_RESPONSE or
+                xbee_packet.command.upper() != "IS"):
+            return
+        with self.__condition:
+            poll = self.__finish_request(xbee_packet.frame_id)
+            if poll is None:
+                return
+            value = xbee_packet.command_value
+            if (xbee_packet.status != ATCommandStatus.OK or value is None or
+                    len(value) < IOSample.min_io_sample_payload()):
+                self.__errors += 1
+                return
+            self.__received += 1
+            callbacks = list(self.__callbacks)
+
+        io_sample = IOSample(value)
+        for callback in callbacks:
+            try:
+                callback(poll[0], io_sample)
+            except Exception as e:
+                self.__xbee_device.log.exception(e)
+
+    def __get_max_in_flight(self):
+        """
+        Returns the maximum number of requests in flight.
+
+        Returns:
+            Integer: the maximum number of requests in flight.
+        """
+        return self.__max_in_flight
+
+    def __get_sent(self):
+        """
+        Returns the number of requests sent.
+
+        Returns:
+            Integer: the number of requests sent.
+        """
+        return self.__sent
+
+    def __get_received(self):
+        """
+        Returns the number of IO samples received.
+
+        Returns:
+            Integer: the number of IO samples received.
+        """
+        return self.__received
+
+    def __get_timeouts(self):
+        """
+        Returns the number of requests whose response was not received in time.
+
+        Returns:
+            Integer: the number of requests timed out.
+        """
+        return self.__timeouts
+
+    def __get_errors(self):
+        """
+        Returns the number of requests that could not be sent or whose
+        response was an error.
+
+        Returns:
+            Integer: the number of failed requests.
+        """
+        return self.__errors
+
+    def __get_missed(self):
+        """
+        Returns the number of polls skipped because they missed their deadline.
+
+        Returns:
+            Integer: the number of missed polls.
+        """
+        return self.__missed
+
+    max_in_flight = property(__get_max_in_flight)
+    """Integer. Maximum number of requests in flight."""
+
+    sent = property(__get_sent)
+    """Integer. Number of requests sent."""
+
+    received = property(__get_received)
+    """Integer. Number of IO samples received."""
+
+    timeouts = property(__get_timeouts)
+    """Integer. Number of requests whose response was not received in time."""
+
+    errors = property(__get_errors)
+    """Integer. Number of requests that could not be sent or whose response was an error."""
+
+    missed = property(__get_missed)
+    """Integer. Number of polls skipped because they missed their deadline."""
+
+
+class XBeeNetwork(object):
+    """
+    This class represents an XBee Network.
+
+    The network allows the discovery of remote devices in the same network
+    as the local one and stores them.
+    """
+
+    ND_PACKET_FINISH = 0x01
+    """
+    Flag that indicates a "discovery process finish" packet.
+    """
+
+    ND_PACKET_REMOTE = 0x02
+    """
+    Flag that indicates a discovery process packet with info about a remote XBee device.
+    """
+
+    # Default timeout for discovering process in case of
+    # the real timeout can't be determined.
+    __DEFAULT_DISCOVERY_TIMEOUT = 20
+
+    # Correction values for the timeout for determined devices.
+    # It has been tested and work 'fine'
+    __DIGI_MESH_TIMEOUT_CORRECTION = 3
+    __DIGI_MESH_SLEEP_TIMEOUT_CORRECTION = 0.1  # DigiMesh with sleep support.
+    __DIGI_POINT_TIMEOUT_CORRECTION = 8
+
+    __NODE_DISCOVERY_COMMAND = "ND"
+
+    # Default period (in seconds) between node discovery rounds of the
+    # network maintenance process.
+    __DEFAULT_MAINTENANCE_INTERVAL = 60
+
+    # Default time (in seconds) a node identifier resolution is cached.
+    __DEFAULT_RESOLUTION_TTL = 300
+
+    __DESTINATION_NODE_COMMAND = "DN"
+
+    # Transmit status values that mean the 16-bit address used to reach the
+    # destination is no longer valid.
+    __INVALID_16BIT_ADDR_STATUS = (TransmitStatus.NETWORK_ACK_FAILURE, TransmitStatus.ADDRESS_NOT_FOUND,
+                                   TransmitStatus.ROUTE_NOT_FOUND)
+
+    # Default maximum number of messages of a mailbox.
+    __DEFAULT_MAILBOX_SIZE = 16
+
+    # Default time (in seconds) a message waits in a mailbox.
+    __DEFAULT_MAILBOX_TTL = 600
+
+    def __init__(self, xbee_device):
+        """
+        Class constructor. Instantiates a new ``XBeeNetwork``.
+
+        Args:
+            xbee_device (:class:`.XBeeDevice`): the local XBee device to get the network from.
+
+        Raises:
+            ValueError: if ``xbee_device`` is ``None``.
+        """
+        if xbee_device is None:
+            raise ValueError("Local XBee device cannot be None")
+
+        self.__xbee_device = xbee_device
+        self.__devices_list = []
+        self.__last_search_dev_list = []
+        self.__lock = threading.Lock()
+        self.__discovering = False
+        self.__device_discovered = DeviceDiscovered()
+        self.__device_discovery_finished = DiscoveryProcessFinished()
+        self.__discovery_task = None
         self.__sought_device_id = None
         self.__discovered_device = None
+        self.__node_id_waiters = []  # [Set of String]: node IDs still sought by each caller
+        self.__targeted_discovery = False
+        self.__discovery_deadline = None
+        self.__discovery_condition = threading.Condition()
+        self.__last_seen = {}  # {id(RemoteXBeeDevice): Float}
+        self.__node_id_index = {}  # {String: RemoteXBeeDevice}
+        self.__resolution_cache = {}  # {String: (RemoteXBeeDevice, Float)}
+        self.__resolution_ttl = XBeeNetwork.__DEFAULT_RESOLUTION_TTL
+        self.__device_ttl = None
+        self.__max_devices = None
+        self.__maintenance_thread = None
+        self.__maintenance_stop = threading.Event()
+        self.__x64bit_index = {}  # {String: RemoteXBeeDevice}
+        self.__pending_transmits = {}  # {Integer: (XBee64BitAddress, Float)}
+        self.__mailboxes = {}  # {String: (RemoteXBeeDevice, deque of (Bytearray, Float))}
+        self.__mailbox_size = XBeeNetwork.__DEFAULT_MAILBOX_SIZE
+        self.__mailbox_ttl = XBeeNetwork.__DEFAULT_MAILBOX_TTL
+        self.__awake_time = None
+        self.__mailbox_drops = 0
 
     def start_discovery_process(self):
         """
@@ -5081,19 +7512,20 @@ class XBeeNetwork(object):
         that continue sending discovery packets to this XBee device. In this
         case, these devices will not be added to the network.
 
+        The process runs in the executor of the local XBee device, instead of
+        in a new thread. Cancelling the returned task stops it.
+
+        Returns:
+            :class:`.Task`: the task of the discovery process, the one already running if any.
+
         .. seealso::
+           | :meth:`.XBeeDevice.get_executor`
            | :meth:`.XBeeNetwork.add_device_discovered_callback`
            | :meth:`.XBeeNetwork.add_discovery_process_finished_callback`
            | :meth:`.XBeeNetwork.del_device_discovered_callback`
            | :meth:`.XBeeNetwork.del_discovery_process_finished_callback`
         """
-        with self.__lock:
-            if self.__discovering:
-                return
-
-        self.__discovery_thread = threading.Thread(target=self.__discover_devices_and_notify_callbacks)
-        self.__discovering = True
-        self.__discovery_thread.start()
+        return self.__start_discovery()[0]
 
     def stop_discovery_process(self):
         """
@@ -5107,6 +7539,13 @@ class XBeeNetwork(object):
         if self.__discovering:
             with self.__lock:
                 self.__discovering = False
+                task = self.__discovery_task
+                self.__discovery_task = None
+            # A discovery that has not started yet is never run, so notify
+            # its end here as a running one does when it stops.
+            if task is not None and task.cancel() and not task.has_started():
+                self.__device_discovery_finished(NetworkDiscoveryStatus.SUCCESS)
+            self.__notify_discovery_waiters()
 
     def discover_device(self, node_id):
         """
@@ -5133,6 +7572,85 @@ class XBeeNetwork(object):
                 self.add_remote(remote)
             return remote
 
+    def resolve_node_id(self, node_id):
+        """
+        Blocking method. Returns the remote XBee device with the given node
+        identifier using the cheapest available source:
+
+            1. The node identifier resolution cache.
+            2. The devices already contained in the network.
+            3. A destination node (``DN``) command, that resolves a single node.
+            4. A node discovery (``ND``) process, as last resort.
+
+        Successful resolutions are cached for the configured time to live.
+
+        Args:
+            node_id (String): the node identifier of the device to resolve.
+
+        Returns:
+            :class:`.RemoteXBeeDevice`: the remote XBee device with the given node identifier, ``None`` if it
+                could not be resolved.
+
+        Raises:
+            ValueError: if ``node_id`` is ``None``.
+            XBeeException: if the XBee device's serial port is closed.
+            InvalidOperatingModeException: if the XBee device's operating mode is not API or ESCAPED API. This
+                method only checks the cached value of the operating mode.
+
+        .. seealso::
+           | :meth:`.XBeeNetwork.set_resolution_ttl`
+           | :meth:`.XBeeNetwork.discover_device`
+        """
+        if node_id is None:
+            raise ValueError("Node ID cannot be None")
+
+        with self.__lock:
+            entry = self.__resolution_cache.get(node_id)
+            if entry is not None:
+                if entry[1] > time.monotonic() and entry[0].get_node_id() == node_id:
+                    return entry[0]
+                del self.__resolution_cache[node_id]
+
+        remote = self.get_device_by_node_id(node_id)
+        if remote is None:
+            remote = self.__resolve_with_destination_node(node_id)
+        if remote is None:
+            remote = self.discover_device(node_id)
+        if remote is None:
+            return None
+
+        with self.__lock:
+            self.__resolution_cache[node_id] = (remote, time.monotonic() + self.__resolution_ttl)
+        return remote
+
+    def get_resolution_ttl(self):
+        """
+        Returns the time (in seconds) a node identifier resolution is cached.
+
+        Returns:
+            Float: the time to live of the node identifier resolutions.
+        """
+        return self.__resolution_ttl
+
+    def set_resolution_ttl(self, ttl):
+        """
+        Sets the time (in seconds) a node identifier resolution is cached.
+
+        Args:
+            ttl (Float): the time to live of the node identifier resolutions, 0 to disable the cache.
+
+        Raises:
+            ValueError: if ``ttl`` is less than 0.
+
+        .. seealso::
+           | :meth:`.XBeeNetwork.resolve_node_id`
+        """
+        if ttl is None or ttl < 0:
+            raise ValueError("Time to live cannot be negative")
+        with self.__lock:
+            self.__resolution_ttl = ttl
+            self.__resolution_cache = {}
+
     def discover_devices(self, device_id_list):
         """
         Blocking method. Attempts to discover a list of devices and add them to the
@@ -5141,6 +7659,11 @@ class XBeeNetwork(object):
         This method does not guarantee that all devices of ``device_id_list``
         will be found, even if they exist physically. This will depend on the node
         discovery operation (``ND``) and timeout.
+
+        All the devices are sought in a single discovery process, that finishes
+        as soon as every device of ``device_id_list`` has been found. If a
+        discovery process is already running, this method joins it instead and
+        returns as soon as its devices are found, without stopping it.
         
         Args:
             device_id_list (List): list of device IDs to discover.
@@ -5148,11 +7671,89 @@ class XBeeNetwork(object):
         Returns:
             List: a list with the discovered devices. It may not contain all devices specified in ``device_id_list``
         """
-        self.start_discovery_process()
-        while self.is_discovery_running():
-            time.sleep(0.1)
+        if not device_id_list:
+            return []
+
+        pending = set(device_id_list)
+        with self.__lock:
+            self.__node_id_waiters.append(pending)
+        try:
+            self.__start_discovery(targeted=True)
+            deadline = time.monotonic() + XBeeNetwork.__DEFAULT_DISCOVERY_TIMEOUT
+            with self.__discovery_condition:
+                while pending and self.__discovering:
+                    # Wait longer if the timeout of the running round is known and later.
+                    remaining = max(deadline, self.__discovery_deadline or 0) - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.__discovery_condition.wait(remaining)
+        finally:
+            self.__del_node_id_waiter(pending)
         return list(filter(lambda x: x.get_node_id() in device_id_list, self.__last_search_dev_list))
 
+    def discover_devices_iter(self, device_id_list=None):
+        """
+        Starts a discovery process and yields the remote XBee devices as they
+        are discovered.
+
+        The generator finishes when the discovery process finishes, whatever
+        its status, or, if ``device_id_list`` is provided, as soon as every
+        device of the list has been found. Closing the generator before it
+        finishes stops the discovery process, unless it was already running
+        when the generator started.
+
+        Args:
+            device_id_list (List, optional): list of device IDs to discover. If ``None``, all the discovered
+                devices are yielded. Optional.
+
+        Returns:
+            Generator: generator of the discovered :class:`.RemoteXBeeDevice`.
+
+        .. seealso::
+           | :meth:`.XBeeNetwork.discover_devices`
+           | :meth:`.XBeeNetwork.start_discovery_process`
+        """
+        discovered = Queue()
+        pending = set(device_id_list) if device_id_list else None
+
+        def device_discovered_callback(remote):
+            if pending is None:
+                discovered.put(remote)
+            elif remote.get_node_id() in device_id_list:
+                discovered.put(remote)
+                # The round may go on for other callers, so do not wait for it.
+                pending.discard(remote.get_node_id())
+                if not pending:
+                    discovered.put(None)
+
+        def discovery_finished_callback(status):
+            discovered.put(None)
+
+        self.add_device_discovered_callback(device_discovered_callback)
+        self.add_discovery_process_finished_callback(discovery_finished_callback)
+        if pending is not None:
+            with self.__lock:
+                self.__node_id_waiters.append(pending)
+        task, started = None, False
+        try:
+            task, started = self.__start_discovery(targeted=pending is not None)
+            while True:
+                remote = discovered.get()
+                if remote is None:
+                    return
+                yield remote
+        finally:
+            self.del_device_discovered_callback(device_discovered_callback)
+            self.del_discovery_process_finished_callback(discovery_finished_callback)
+            if pending is not None:
+                self.__del_node_id_waiter(pending)
+            # Stop the discovery if the generator is closed early or ends on an
+            # error status, but only if it was started by the generator.
+            with self.__lock:
+                own = started and self.__discovery_task is task
+            if own:
+                self.stop_discovery_process()
+
     def is_discovery_running(self):
         """
         Returns whether the discovery process is running or not.
@@ -5162,6 +7763,151 @@ class XBeeNetwork(object):
         """
         return self.__discovering
 
+    def start_maintenance(self, interval=None, discover=True):
+        """
+        Starts the network maintenance process. This method is not blocking.
+
+        The maintenance process runs in background and, every ``interval``
+        seconds, performs a node discovery round (if ``discover`` is ``True``)
+        and evicts the remote XBee devices that have not been heard within the
+        configured time to live.
+
+        Args:
+            interval (Float, optional): seconds between maintenance rounds. If ``None``, 60 seconds are used.
+            discover (Boolean, optional, default=``True``): ``True`` to perform a node discovery in every
+                round, ``False`` to only evict expired devices.
+
+        Raises:
+            ValueError: if ``interval`` is not greater than 0.
+
+        .. seealso::
+           | :meth:`.XBeeNetwork.stop_maintenance`
+           | :meth:`.XBeeNetwork.set_device_ttl`
+           | :meth:`.XBeeNetwork.set_max_devices`
+        """
+        if interval is None:
+            interval = XBeeNetwork.__DEFAULT_MAINTENANCE_INTERVAL
+        if interval <= 0:
+            raise ValueError("Maintenance interval must be greater than 0")
+
+        with self.__lock:
+            if self.__maintenance_thread is not None and self.__maintenance_thread.is_alive():
+                return
+            self.__maintenance_stop.clear()
+            self.__maintenance_thread = threading.Thread(target=self.__maintain_network,
+                                                         args=(interval, discover), daemon=True)
+        self.__maintenance_thread.start()
+
+    def stop_maintenance(self):
+        """
+        Stops the network maintenance process if it is running.
+
+        A node discovery round already in progress is not interrupted, use
+        :meth:`.XBeeNetwork.stop_discovery_process` for that.
+        """
+        self.__maintenance_stop.set()
+
+    def is_maintenance_running(self):
+        """
+        Returns whether the network maintenance process is running or not.
+
+        Returns:
+            Boolean: ``True`` if the maintenance process is running, ``False`` otherwise.
+        """
+        return (self.__maintenance_thread is not None and self.__maintenance_thread.is_alive()
+                and not self.__maintenance_stop.is_set())
+
+    def get_device_ttl(self):
+        """
+        Returns the time (in seconds) a remote XBee device stays in the network without being heard.
+
+        Returns:
+            Float: the time to live of the network devices, ``None`` if devices never expire.
+        """
+        return self.__device_ttl
+
+    def set_device_ttl(self, ttl):
+        """
+        Sets the time (in seconds) a remote XBee device stays in the network without being heard.
+
+        Devices are heard when they are discovered or when any frame from them
+        is received. Expired devices are evicted by the maintenance process or
+        by :meth:`.XBeeNetwork.purge_expired_devices`.
+
+        Args:
+            ttl (Float): the time to live of the network devices, ``None`` so devices never expire.
+
+        Raises:
+            ValueError: if ``ttl`` is not greater than 0.
+        """
+        if ttl is not None and ttl <= 0:
+            raise ValueError("Time to live must be greater than 0")
+        self.__device_ttl = ttl
+
+    def get_max_devices(self):
+        """
+        Returns the maximum number of remote XBee devices the network holds.
+
+        Returns:
+            Integer: the maximum number of devices, ``None`` if the network size is not limited.
+        """
+        return self.__max_devices
+
+    def set_max_devices(self, max_devices):
+        """
+        Sets the maximum number of remote XBee devices the network holds.
+
+        When a new device is added to a full network, the least recently heard
+        device is evicted.
+
+        Args:
+            max_devices (Integer): the maximum number of devices, ``None`` to not limit the network size.
+
+        Raises:
+            ValueError: if ``max_devices`` is not greater than 0.
+        """
+        if max_devices is not None and max_devices <= 0:
+            raise ValueError("Maximum number of devices must be greater than 0")
+        with self.__lock:
+            self.__max_devices = max_devices
+            self.__evict_least_recently_seen()
+
+    def get_device_last_seen(self, remote_xbee_device):
+        """
+        Returns the last time the provided remote XBee device was heard.
+
+        Args:
+            remote_xbee_device (:class:`.RemoteXBeeDevice`): the remote XBee device of the network.
+
+        Returns:
+            Float: the value of ``time.monotonic()`` when the device was last heard, ``None`` if the device
+                is not in the network.
+        """
+        with self.__lock:
+            device = self.__find_device(remote_xbee_device)
+            return self.__last_seen.get(id(device)) if device is not None else None
+
+    def purge_expired_devices(self):
+        """
+        Removes from the network the remote XBee devices that have not been
+        heard within the configured time to live.
+
+        Returns:
+            List: the list of removed :class:`.RemoteXBeeDevice`.
+
+        .. seealso::
+           | :meth:`.XBeeNetwork.set_device_ttl`
+        """
+        if self.__device_ttl is None:
+            return []
+
+        deadline = time.monotonic() - self.__device_ttl
+        with self.__lock:
+            expired = [x for x in self.__devices_list if self.__last_seen.get(id(x), 0) < deadline]
+            for device in expired:
+                self.__forget_device(device)
+        return expired
+
     def get_devices(self):
         """
         Returns a copy of the XBee devices list of the network.
@@ -5217,57 +7963,279 @@ class XBeeNetwork(object):
         Adds a callback for the event :class:`.DiscoveryProcessFinished`.
 
         Args:
-            callback (Function): the callback. Receives one argument.
+            callback (Function): the callback. Receives one argument.
+
+                * The event code as an :class:`.Integer`
+
+        .. seealso::
+           | :meth:`.XBeeNetwork.del_discovery_process_finished_callback`
+           | :meth:`.XBeeNetwork.add_device_discovered_callback`
+           | :meth:`.XBeeNetwork.del_device_discovered_callback`
+        """
+        self.__device_discovery_finished += callback
+
+    def del_device_discovered_callback(self, callback):
+        """
+        Deletes a callback for the callback list of :class:`.DeviceDiscovered` event.
+
+        Args:
+            callback (Function): the callback to delete.
+
+        Raises:
+            ValueError: if ``callback`` is not in the callback list of :class:`.DeviceDiscovered` event.
+
+        .. seealso::
+           | :meth:`.XBeeNetwork.add_device_discovered_callback`
+           | :meth:`.XBeeNetwork.add_discovery_process_finished_callback`
+           | :meth:`.XBeeNetwork.del_discovery_process_finished_callback`
+        """
+        self.__device_discovered -= callback
+
+    def del_discovery_process_finished_callback(self, callback):
+        """
+        Deletes a callback for the callback list of :class:`.DiscoveryProcessFinished` event.
+
+        Args:
+            callback (Function): the callback to delete.
+
+        Raises:
+            ValueError: if ``callback`` is not in the callback list of :class:`.DiscoveryProcessFinished` event.
+
+        .. seealso::
+           | :meth:`.XBeeNetwork.add_discovery_process_finished_callback`
+           | :meth:`.XBeeNetwork.add_device_discovered_callback`
+           | :meth:`.XBeeNetwork.del_device_discovered_callback`
+        """
+        self.__device_discovery_finished -= callback
+
+    def create_io_poller(self, max_in_flight=None, timeout=None):
+        """
+        Creates a poller that reads the IO samples of many remote XBee
+        devices of the network periodically, keeping several requests in
+        flight at the same time.
+
+        Args:
+            max_in_flight (Integer, optional): maximum number of requests in flight. ``None`` to use the
+                default value.
+            timeout (Float, optional): time (in seconds) to wait for each response. ``None`` to use the
+                synchronous operations timeout of the local XBee device.
+
+        Returns:
+            :class:`.IOPoller`: the created poller.
+
+        Raises:
+            ValueError: if ``max_in_flight`` is less than 1 or ``timeout`` is not greater than 0.
+
+        .. seealso::
+           | :class:`.IOPoller`
+        """
+        if max_in_flight is None:
+            return IOPoller(self.__xbee_device, timeout=timeout)
+        return IOPoller(self.__xbee_device, max_in_flight=max_in_flight, timeout=timeout)
+
+    def clear(self):
+        """
+        Removes all the remote XBee devices from the network.
+        """
+        with self.__lock:
+            self.__devices_list = []
+            self.__last_seen = {}
+            self.__node_id_index = {}
+            self.__resolution_cache = {}
+            self.__x64bit_index = {}
+            self.__pending_transmits = {}
+            self.__mailboxes = {}
+
+    def store_data(self, remote_xbee_device, data):
+        """
+        Stores the provided data in the mailbox of the provided remote XBee
+        device, to be sent as soon as it is awake.
+
+        Use it to send data to sleeping devices (cyclic sleep DigiMesh nodes,
+        ZigBee end devices) without waiting for failed transmissions. The
+        mailbox of a remote XBee device is sent in a burst when any frame from
+        it is received, or immediately if it was heard within the awake time
+        (see :meth:`.XBeeNetwork.set_awake_time`).
+
+        If the mailbox is full, its oldest message is discarded. Messages
+        that wait more than the mailbox time to live are discarded.
+
+        Args:
+            remote_xbee_device (:class:`.RemoteXBeeDevice`): the remote XBee device to send data to.
+            data (Bytearray): the raw data to send.
+
+        Raises:
+            ValueError: if ``remote_xbee_device`` or ``data`` is ``None``, or ``remote_xbee_device`` does not
+                have a 64-bit address.
+
+        .. seealso::
+           | :meth:`.XBeeNetwork.flush_mailbox`
+           | :meth:`.XBeeNetwork.set_mailbox_size`
+           | :meth:`.XBeeNetwork.set_mailbox_ttl`
+        """
+        if remote_xbee_device is None:
+            raise ValueError("Remote XBee device cannot be None")
+        if data is None:
+            raise ValueError("Data cannot be None")
+        key = XBeeNetwork.__get_mailbox_key(remote_xbee_device.get_64bit_addr())
+        if key is None:
+            raise ValueError("Remote XBee device must have a 64-bit address")
+
+        now = time.monotonic()
+        with self.__lock:
+            mailbox = self.__mailboxes.get(key)
+            if mailbox is None:
+                mailbox = (remote_xbee_device, deque())
+                self.__mailboxes[key] = mailbox
+            messages = mailbox[1]
+            if len(messages) >= self.__mailbox_size:
+                messages.popleft()
+                self.__mailbox_drops += 1
+            messages.append((data, now + self.__mailbox_ttl))
+
+            device = self.__x64bit_index.get(key)
+            last_seen = self.__last_seen.get(id(device)) if device is not None else None
+            awake = self.__awake_time is not None and last_seen is not None and now - last_seen < self.__awake_time
+
+        if awake:
+            self.flush_mailbox(remote_xbee_device)
+
+    def flush_mailbox(self, remote_xbee_device):
+        """
+        Sends immediately the data stored in the mailbox of the provided
+        remote XBee device.
+
+        Data is sent asynchronously (see :meth:`.XBeeDevice.send_data_async`).
+        If a message cannot be sent, it stays in the mailbox with the rest of
+        pending messages.
+
+        Args:
+            remote_xbee_device (:class:`.RemoteXBeeDevice`): the remote XBee device whose mailbox is sent.
+
+        Returns:
+            Integer: the number of messages sent.
+
+        .. seealso::
+           | :meth:`.XBeeNetwork.store_data`
+        """
+        return self.__flush_mailbox(XBeeNetwork.__get_mailbox_key(remote_xbee_device.get_64bit_addr()))
+
+    def discard_mailbox(self, remote_xbee_device):
+        """
+        Removes the mailbox of the provided remote XBee device without sending
+        its data.
+
+        Args:
+            remote_xbee_device (:class:`.RemoteXBeeDevice`): the remote XBee device whose mailbox is discarded.
+
+        Returns:
+            List: the discarded messages (Bytearray).
+        """
+        with self.__lock:
+            mailbox = self.__mailboxes.pop(XBeeNetwork.__get_mailbox_key(remote_xbee_device.get_64bit_addr()), None)
+        return [x[0] for x in mailbox[1]] if mailbox is not None else []
+
+    def get_mailbox_length(self, remote_xbee_device):
+        """
+        Returns the number of messages waiting in the mailbox of the provided
+        remote XBee device.
+
+        Args:
+            remote_xbee_device (:class:`.RemoteXBeeDevice`): the remote XBee device.
+
+        Returns:
+            Integer: the number of messages in the mailbox.
+        """
+        with self.__lock:
+            mailbox = self.__mailboxes.get(XBeeNetwork.__get_mailbox_key(remote_xbee_device.get_64bit_addr()))
+            return len(mailbox[1]) if mailbox is not None else 0
+
+    def get_mailbox_drops(self):
+        """
+        Returns the number of messages discarded because their mailbox was
+        full or they expired.
+
+        Returns:
+            Integer: the number of discarded messages.
+        """
+        return self.__mailbox_drops
+
+    def get_mailbox_size(self):
+        """
+        Returns the maximum number of messages of each mailbox.
+
+        Returns:
+            Integer: the maximum number of messages of each mailbox.
+        """
+        return self.__mailbox_size
+
+    def set_mailbox_size(self, size):
+        """
+        Sets the maximum number of messages of each mailbox.
+
+        Args:
+            size (Integer): the maximum number of messages of each mailbox.
 
-                * The event code as an :class:`.Integer`
+        Raises:
+            ValueError: if ``size`` is not greater than 0.
+        """
+        if size <= 0:
+            raise ValueError("Mailbox size must be greater than 0")
+        self.__mailbox_size = size
 
-        .. seealso::
-           | :meth:`.XBeeNetwork.del_discovery_process_finished_callback`
-           | :meth:`.XBeeNetwork.add_device_discovered_callback`
-           | :meth:`.XBeeNetwork.del_device_discovered_callback`
+    def get_mailbox_ttl(self):
         """
-        self.__device_discovery_finished += callback
+        Returns the time (in seconds) a message waits in a mailbox before
+        being discarded.
 
-    def del_device_discovered_callback(self, callback):
+        Returns:
+            Float: the time to live of the mailbox messages.
         """
-        Deletes a callback for the callback list of :class:`.DeviceDiscovered` event.
+        return self.__mailbox_ttl
+
+    def set_mailbox_ttl(self, ttl):
+        """
+        Sets the time (in seconds) a message waits in a mailbox before being
+        discarded. It applies to the messages stored from now on.
 
         Args:
-            callback (Function): the callback to delete.
+            ttl (Float): the time to live of the mailbox messages.
 
         Raises:
-            ValueError: if ``callback`` is not in the callback list of :class:`.DeviceDiscovered` event.
+            ValueError: if ``ttl`` is not greater than 0.
+        """
+        if ttl <= 0:
+            raise ValueError("Mailbox time to live must be greater than 0")
+        self.__mailbox_ttl = ttl
 
-        .. seealso::
-           | :meth:`.XBeeNetwork.add_device_discovered_callback`
-           | :meth:`.XBeeNetwork.add_discovery_process_finished_callback`
-           | :meth:`.XBeeNetwork.del_discovery_process_finished_callback`
+    def get_awake_time(self):
         """
-        self.__device_discovered -= callback
+        Returns the time (in seconds) a remote XBee device is considered awake
+        after being heard.
 
-    def del_discovery_process_finished_callback(self, callback):
+        Returns:
+            Float: the awake time, ``None`` if devices are never considered awake.
         """
-        Deletes a callback for the callback list of :class:`.DiscoveryProcessFinished` event.
+        return self.__awake_time
+
+    def set_awake_time(self, awake_time):
+        """
+        Sets the time (in seconds) a remote XBee device is considered awake
+        after being heard. Data stored for a device considered awake is sent
+        immediately.
 
         Args:
-            callback (Function): the callback to delete.
+            awake_time (Float): the awake time, ``None`` so devices are never considered awake.
 
         Raises:
-            ValueError: if ``callback`` is not in the callback list of :class:`.DiscoveryProcessFinished` event.
+            ValueError: if ``awake_time`` is negative.
 
         .. seealso::
-           | :meth:`.XBeeNetwork.add_discovery_process_finished_callback`
-           | :meth:`.XBeeNetwork.add_device_discovered_callback`
-           | :meth:`.XBeeNetwork.del_device_discovered_callback`
+           | :meth:`.XBeeNetwork.store_data`
         """
-        self.__device_discovery_finished -= callback
-
-    def clear(self):
-        """
-        Removes all the remote XBee devices from the network.
-        """
-        with self.__lock:
-            self.__devices_list = []
+        if awake_time is not None and awake_time < 0:
+            raise ValueError("Awake time cannot be negative")
+        self.__awake_time = awake_time
 
     def get_discovery_options(self):
         """
@@ -5368,8 +8336,12 @@ class XBeeNetwork(object):
             raise ValueError("64-bit address cannot be unknown")
 
         with self.__lock:
+            device = self.__x64bit_index.get(str(x64bit_addr))
+            if device is not None and device.get_64bit_addr() == x64bit_addr:
+                return device
             for device in self.__devices_list:
                 if device.get_64bit_addr() is not None and device.get_64bit_addr() == x64bit_addr:
+                    self.__x64bit_index[str(x64bit_addr)] = device
                     return device
 
         return None
@@ -5422,8 +8394,14 @@ class XBeeNetwork(object):
             raise ValueError("Node ID cannot be None")
 
         with self.__lock:
+            device = self.__node_id_index.get(node_id)
+            if device is not None and device.get_node_id() == node_id:
+                return device
+            # The index may be outdated if the node identifier of a device
+            # has been changed directly, so look for it and re-index it.
             for device in self.__devices_list:
                 if device.get_node_id() is not None and device.get_node_id() == node_id:
+                    self.__node_id_index[node_id] = device
                     return device
 
         return None
@@ -5464,8 +8442,15 @@ class XBeeNetwork(object):
             for local_xbee in self.__devices_list:
                 if local_xbee == remote_xbee_device:
                     local_xbee.update_device_data_from(remote_xbee_device)
+                    self.__last_seen[id(local_xbee)] = time.monotonic()
+                    self.__index_node_id(local_xbee)
+                    self.__index_64bit_addr(local_xbee)
                     return local_xbee
             self.__devices_list.append(remote_xbee_device)
+            self.__last_seen[id(remote_xbee_device)] = time.monotonic()
+            self.__index_node_id(remote_xbee_device)
+            self.__index_64bit_addr(remote_xbee_device)
+            self.__evict_least_recently_seen()
             return remote_xbee_device
 
     def add_remotes(self, remote_xbee_devices):
@@ -5491,7 +8476,11 @@ class XBeeNetwork(object):
         Raises:
             ValueError: if the provided :class:`.RemoteXBeeDevice` is not in the network.
         """
-        self.__devices_list.remove(remote_xbee_device)
+        with self.__lock:
+            device = self.__find_device(remote_xbee_device)
+            if device is None:
+                raise ValueError("Remote XBee device is not in the network")
+            self.__forget_device(device)
 
     def get_discovery_callbacks(self):
         """
@@ -5500,8 +8489,9 @@ class XBeeNetwork(object):
         This callbacks notify the user callbacks for each XBee device discovered.
 
         Returns:
-            Tuple (Function, Function): callback for generic devices discovery process,
-                callback for discovery specific XBee device ops.
+            Tuple (Function, Function, Function, Function, Function): callback for generic devices discovery
+                process, callback for discovery specific XBee device ops, callback for node identification frames,
+                callback for transmit status frames, callback that sends the mailboxes of awake devices.
         """
         def discovery_gen_callback(xbee_packet):
             """
@@ -5516,19 +8506,26 @@ class XBeeNetwork(object):
                 # if it's a ND finish signal, stop wait for packets
                 with self.__lock:
                     self.__discovering = xbee_packet.status != ATCommandStatus.OK
+                self.__notify_discovery_waiters()
             elif nd_id == XBeeNetwork.ND_PACKET_REMOTE:
                 remote = self.__create_remote(xbee_packet.command_value)
                 # if remote was created successfully and it is not int the
                 # XBee device list, add it and notify callbacks.
                 if remote is not None:
-                    # if remote was created successfully and it is not int the
-                    # XBee device list, add it and notify callbacks.
-                    if remote not in self.__devices_list:
-                        with self.__lock:
-                            self.__devices_list.append(remote)
+                    # if remote was created successfully, add it to the XBee
+                    # device list (or refresh it) and notify callbacks.
+                    self.add_remote(remote)
                     # always add the XBee device to the last discovered devices list:
                     self.__last_search_dev_list.append(remote)
                     self.__device_discovered(remote)
+                    # if all the sought devices have been found, stop the discovery,
+                    # unless it was started or joined to discover every device.
+                    with self.__lock:
+                        for pending in self.__node_id_waiters:
+                            pending.discard(remote.get_node_id())
+                        if self.__targeted_discovery and not any(self.__node_id_waiters):
+                            self.__discovering = False
+                    self.__notify_discovery_waiters()
 
         def discovery_spec_callback(xbee_packet):
             """
@@ -5544,6 +8541,7 @@ class XBeeNetwork(object):
                 if xbee_packet.status == ATCommandStatus.OK:
                     with self.__lock:
                         self.__sought_device_id = None
+                    self.__notify_discovery_waiters()
             elif nd_id == XBeeNetwork.ND_PACKET_REMOTE:
                 # if it is not a finish signal, it contains info about a remote XBee device.
                 remote = self.__create_remote(xbee_packet.command_value)
@@ -5552,19 +8550,125 @@ class XBeeNetwork(object):
                     with self.__lock:
                         self.__discovered_device = remote
                         self.__sought_device_id = None
+                    self.__notify_discovery_waiters()
+
+        def node_id_indicator_callback(xbee_packet):
+            """
+            Callback that adds or updates the remote XBee devices that
+            identify themselves (pushbutton, join or power cycle events).
+            """
+            if xbee_packet.get_frame_type() != ApiFrameType.NODE_ID_INDICATOR:
+                return
+            remote = self.__create_remote_device(xbee_packet.x64bit_remote_addr,
+                                                 xbee_packet.x16bit_remote_addr,
+                                                 xbee_packet.node_id)
+            remote._role = xbee_packet.device_type
+            if xbee_packet.x16bit_parent_addr != XBee16BitAddress.UNKNOWN_ADDRESS:
+                remote._parent_16bit_addr = xbee_packet.x16bit_parent_addr
+            remote._profile_id = xbee_packet.profile_id
+            remote._manufacturer_id = xbee_packet.manufacturer_id
+            self.add_remote(remote)
+
+        def transmit_status_callback(xbee_packet):
+            """
+            Callback that learns the 16-bit address of the destination of the
+            transmissions, or invalidates it if the delivery failed.
+            """
+            if xbee_packet.get_frame_type() != ApiFrameType.TRANSMIT_STATUS:
+                return
+            with self.__lock:
+                pending = self.__pending_transmits.pop(xbee_packet.frame_id, None)
+            if pending is None:
+                return
+            x64bit_addr = pending[0]
+            if xbee_packet.transmit_status == TransmitStatus.SUCCESS:
+                if xbee_packet.x16bit_dest_addr != XBee16BitAddress.UNKNOWN_ADDRESS:
+                    self.add_if_not_exist(x64bit_addr, xbee_packet.x16bit_dest_addr)
+            elif xbee_packet.transmit_status in XBeeNetwork.__INVALID_16BIT_ADDR_STATUS:
+                self._invalidate_16bit_addr(x64bit_addr)
+
+        def mailbox_callback(xbee_packet):
+            """
+            Callback that sends the mailbox of the remote XBee devices that
+            are heard, they are awake.
+            """
+            if not self.__mailboxes or not hasattr(xbee_packet, "x64bit_source_addr"):
+                return
+            key = XBeeNetwork.__get_mailbox_key(xbee_packet.x64bit_source_addr)
+            if key in self.__mailboxes:
+                self.__flush_mailbox(key)
 
-        return discovery_gen_callback, discovery_spec_callback
+        return (discovery_gen_callback, discovery_spec_callback, node_id_indicator_callback,
+                transmit_status_callback, mailbox_callback)
 
-    def _get_discovery_thread(self):
+    def _register_transmit(self, packet):
         """
-        Returns the network discovery thread.
-        
-        Used to determine whether the discovery thread is alive or not.
-        
+        Remembers the 64-bit destination address of the provided packet, so
+        the 16-bit address reported by its transmit status can be learned.
+
+        This is only for internal use.
+
+        Args:
+            packet (:class:`.XBeePacket`): the packet that is going to be sent.
+        """
+        if not packet.needs_id() or packet.frame_id == 0:
+            return
+        x64bit_addr = None
+        if packet.get_frame_type() in (ApiFrameType.TRANSMIT_REQUEST, ApiFrameType.EXPLICIT_ADDRESSING):
+            x64bit_addr = packet.x64bit_dest_addr
+            if x64bit_addr == XBee64BitAddress.UNKNOWN_ADDRESS or x64bit_addr == XBee64BitAddress.BROADCAST_ADDRESS:
+                x64bit_addr = None
+        with self.__lock:
+            # Frame IDs are reused, so always drop the previous destination.
+            if x64bit_addr is None:
+                self.__pending_transmits.pop(packet.frame_id, None)
+            else:
+                self.__pending_transmits[packet.frame_id] = (x64bit_addr, time.monotonic())
+
+    def _get_number_pending_transmits(self, max_age):
+        """
+        Returns the number of unicast transmissions waiting for their
+        transmit status.
+
+        This is only for internal use.
+
+        Args:
+            max_age (Float): transmissions sent more than this number of seconds ago are not counted, their
+                transmit status is considered lost.
+
+        Returns:
+            Integer: the number of transmissions waiting for their transmit status.
+        """
+        deadline = time.monotonic() - max_age
+        with self.__lock:
+            return sum(1 for x in self.__pending_transmits.values() if x[1] > deadline)
+
+    def _invalidate_16bit_addr(self, x64bit_addr):
+        """
+        Marks the 16-bit address of the remote XBee device with the provided
+        64-bit address as unknown, so the next transmissions to it discover
+        it again.
+
+        This is only for internal use.
+
+        Args:
+            x64bit_addr (:class:`.XBee64BitAddress`): the 64-bit address of the remote XBee device.
+        """
+        device = self.get_device_by_64(x64bit_addr)
+        if device is not None:
+            device._16bit_addr = XBee16BitAddress.UNKNOWN_ADDRESS
+
+    def _get_discovery_task(self):
+        """
+        Returns the task of the last discovery process started in the executor.
+
+        Used to determine whether the discovery process is running or not.
+
         Returns:
-            :class:`.Thread`: the network discovery thread.
+            :class:`.Task`: the task of the last discovery process, ``None`` if it has never been started, it
+                has been stopped or a maintenance round has started after it.
         """
-        return self.__discovery_thread
+        return self.__discovery_task
 
     @staticmethod
     def __check_nd_packet(xbee_packet):
@@ -5588,12 +8692,243 @@ class XBeeNetwork(object):
         else:
             return None
 
+    def __find_device(self, remote_xbee_device):
+        """
+        Returns the instance stored in the network that corresponds to the
+        provided remote XBee device. The lock must be held by the caller.
+
+        Args:
+            remote_xbee_device (:class:`.RemoteXBeeDevice`): the remote XBee device to look for.
+
+        Returns:
+            :class:`.RemoteXBeeDevice`: the stored remote XBee device, ``None`` if it is not in the network.
+        """
+        for device in self.__devices_list:
+            if device is remote_xbee_device:
+                return device
+        for device in self.__devices_list:
+            if device == remote_xbee_device:
+                return device
+        return None
+
+    @staticmethod
+    def __get_mailbox_key(x64bit_addr):
+        """
+        Returns the key of the mailbox of the remote XBee device with the
+        provided 64-bit address.
+
+        Args:
+            x64bit_addr (:class:`.XBee64BitAddress`): the 64-bit address of the remote XBee device.
+
+        Returns:
+            String: the key of the mailbox, ``None`` if the address is not valid.
+        """
+        if (x64bit_addr is None or x64bit_addr == XBee64BitAddress.UNKNOWN_ADDRESS or
+                x64bit_addr == XBee64BitAddress.BROADCAST_ADDRESS):
+            return None
+        return str(x64bit_addr)
+
+    def __flush_mailbox(self, key):
+        """
+        Sends the data stored in the mailbox with the provided key.
+
+        Args:
+            key (String): the key of the mailbox.
+
+        Returns:
+            Integer: the number of messages sent.
+        """
+        now = time.monotonic()
+        with self.__lock:
+            mailbox = self.__mailboxes.pop(key, None)
+            if mailbox is None:
+                return 0
+            remote, messages = mailbox
+            pending = [x for x in messages if x[1] > now]
+            self.__mailbox_drops += len(messages) - len(pending)
+
+        for index, message in enumerate(pending):
+            try:
+                self.__xbee_device.send_data_async(remote, message[0])
+            except Exception as e:
+                self.__xbee_device.log.exception(e)
+                # Keep the unsent messages (and any stored meanwhile) in the mailbox.
+                with self.__lock:
+                    current = self.__mailboxes.pop(key, None)
+                    unsent = deque(pending[index:])
+                    if current is not None:
+                        unsent.extend(current[1])
+                    while len(unsent) > self.__mailbox_size:
+                        unsent.popleft()
+                        self.__mailbox_drops += 1
+                    self.__mailboxes[key] = (remote, unsent)
+                return index
+        return len(pending)
+
+    def __forget_device(self, device):
+        """
+        Removes the provided stored instance from the network. The lock must
+        be held by the caller.
+
+        Args:
+            device (:class:`.RemoteXBeeDevice`): the stored remote XBee device to remove.
+        """
+        self.__devices_list = [x for x in self.__devices_list if x is not device]
+        self.__last_seen.pop(id(device), None)
+        if self.__node_id_index.get(device.get_node_id()) is device:
+            del self.__node_id_index[device.get_node_id()]
+        entry = self.__resolution_cache.get(device.get_node_id())
+        if entry is not None and entry[0] is device:
+            del self.__resolution_cache[device.get_node_id()]
+        if self.__x64bit_index.get(str(device.get_64bit_addr())) is device:
+            del self.__x64bit_index[str(device.get_64bit_addr())]
+
+    def __index_64bit_addr(self, device):
+        """
+        Adds the provided stored instance to the 64-bit address index. The
+        lock must be held by the caller.
+
+        Args:
+            device (:class:`.RemoteXBeeDevice`): the stored remote XBee device to index.
+        """
+        x64bit_addr = device.get_64bit_addr()
+        if x64bit_addr is not None and x64bit_addr != XBee64BitAddress.UNKNOWN_ADDRESS:
+            self.__x64bit_index[str(x64bit_addr)] = device
+
+    def __index_node_id(self, device):
+        """
+        Adds the provided stored instance to the node identifier index. The
+        lock must be held by the caller.
+
+        Args:
+            device (:class:`.RemoteXBeeDevice`): the stored remote XBee device to index.
+        """
+        if device.get_node_id() is not None:
+            self.__node_id_index[device.get_node_id()] = device
+
+    def __resolve_with_destination_node(self, node_id):
+        """
+        Blocking method. Resolves the given node identifier with a destination
+        node (``DN``) command and adds the resolved device to the network.
+
+        Args:
+            node_id (String): the node identifier to resolve.
+
+        Returns:
+            :class:`.RemoteXBeeDevice`: the resolved remote XBee device, ``None`` if the command failed or its
+                response does not contain the device address.
+        """
+        packet = ATCommPacket(self.__xbee_device.get_next_frame_id(), XBeeNetwork.__DESTINATION_NODE_COMMAND,
+                              bytearray(node_id, "utf8"))
+        try:
+            response = self.__xbee_device.send_packet_sync_and_get_response(packet)
+        except TimeoutException:
+            return None
+
+        # In API mode, the response contains the 16-bit and 64-bit addresses of the node.
+        value = response.command_value
+        if response.status != ATCommandStatus.OK or value is None or len(value) < 10:
+            return None
+
+        remote = self.__create_remote_device(XBee64BitAddress(value[2:10]), XBee16BitAddress(value[0:2]), node_id)
+        return self.add_remote(remote)
+
+    def __evict_least_recently_seen(self):
+        """
+        Evicts the least recently heard devices until the network size does
+        not exceed the configured maximum. The lock must be held by the caller.
+        """
+        if self.__max_devices is None:
+            return
+        while len(self.__devices_list) > self.__max_devices:
+            oldest = min(self.__devices_list, key=lambda x: self.__last_seen.get(id(x), 0))
+            self.__forget_device(oldest)
+
+    def __maintain_network(self, interval, discover):
+        """
+        Blocking method. Performs network maintenance rounds (node discovery
+        and eviction of expired devices) until the maintenance is stopped.
+
+        Args:
+            interval (Float): seconds between maintenance rounds.
+            discover (Boolean): ``True`` to perform a node discovery in every round, ``False`` otherwise.
+        """
+        while not self.__maintenance_stop.is_set():
+            if discover:
+                with self.__lock:
+                    start_discovery = not self.__discovering
+                    if start_discovery:
+                        self.__discovering = True
+                        self.__discovery_task = None
+                        self.__targeted_discovery = False
+                        self.__discovery_deadline = None
+                if start_discovery:
+                    self.__discover_devices_and_notify_callbacks()
+            try:
+                self.purge_expired_devices()
+            except Exception as e:
+                self.__xbee_device.log.exception(e)
+            self.__maintenance_stop.wait(interval)
+
+    def __start_discovery(self, targeted=False):
+        """
+        Starts the discovery process in the executor of the local XBee device,
+        or joins the one already running.
+
+        Args:
+            targeted (Boolean, optional, default=``False``): ``True`` if the discovery is only needed to find
+                the node identifiers of :attr:`__node_id_waiters`, so it can finish once they are all found.
+                ``False`` to discover every device.
+
+        Returns:
+            Tuple (:class:`.Task`, Boolean): the task of the discovery process and whether it was started by
+                this call (``True``) or was already running (``False``).
+
+        Raises:
+            XBeeException: if the executor of the local XBee device has been shut down.
+        """
+        with self.__lock:
+            if self.__discovering:
+                # A full discovery joining the running one must not be cut short.
+                if not targeted:
+                    self.__targeted_discovery = False
+                return self.__discovery_task, False
+            self.__discovering = True
+            self.__targeted_discovery = targeted
+            self.__discovery_deadline = None
+            try:
+                self.__discovery_task = self.__xbee_device.get_executor().submit(
+                    self.__discover_devices_and_notify_callbacks, on_cancel=self.stop_discovery_process)
+            except XBeeException:
+                self.__discovering = False
+                raise
+            return self.__discovery_task, True
+
+    def __del_node_id_waiter(self, pending):
+        """
+        Removes the node identifiers sought by a caller from the discovery.
+
+        Args:
+            pending (Set): the set of node identifiers registered by the caller.
+        """
+        with self.__lock:
+            # Compare by identity, the sets of several callers may be equal.
+            self.__node_id_waiters = [waiter for waiter in self.__node_id_waiters if waiter is not pending]
+
+    def __notify_discovery_waiters(self):
+        """
+        Wakes up the threads waiting for a change in the discovery process state.
+        """
+        with self.__discovery_condition:
+            self.__discovery_condition.notify_all()
+
     def __discover_devices_and_notify_callbacks(self):
         """
         Blocking method. Performs a discovery operation, waits
         until it finish (timeout or 'end' packet for 802.15.4),
         and notifies callbacks.
         """
+        self.__last_search_dev_list = []
         self.__discover_devices()
         self.__device_discovery_finished(NetworkDiscoveryStatus.SUCCESS)
 
@@ -5606,42 +8941,39 @@ class XBeeNetwork(object):
             node_id (String, optional): node identifier of the remote XBee device to discover. Optional.
         """
         try:
-            init_time = time.clock()
+            init_time = time.monotonic()
 
             # In 802.15.4 devices, the discovery finishes when the 'end' command 
             # is received, so it's not necessary to calculate the timeout.
             # This also applies to S1B devices working in compatibility mode.
             is_802_compatible = self.__is_802_compatible()
-            timeout = 0
             if not is_802_compatible:
                 timeout = self.__calculate_timeout()
+            else:
+                timeout = XBeeNetwork.__DEFAULT_DISCOVERY_TIMEOUT
             # send "ND" async
             self.__xbee_device.send_packet(ATCommPacket(self.__xbee_device.get_next_frame_id(),
                                                         "ND",
                                                         None if node_id is None else bytearray(node_id, 'utf8')),
                                            False)
 
-            if not is_802_compatible:
-                # If XBee device is not 802.15.4, wait until timeout expires.
+            # Wait until the discovery callbacks signal the end of the process
+            # ('end' packet for 802.15.4, all sought devices found) or the
+            # timeout expires.
+            deadline = init_time + timeout
+            self.__discovery_deadline = deadline
+            with self.__discovery_condition:
                 while self.__discovering or self.__sought_device_id is not None:
-                    if (time.clock() - init_time) > timeout:
-                        with self.__lock:
-                            self.__discovering = False
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
                         break
-                    time.sleep(0.1)
-
-            else:
-                # If XBee device is 802.15.4, wait until the 'end' xbee_message arrive.
-                # "__discovering" will be assigned as False by the callback
-                # when this receive that 'end' xbee_message. If this xbee_message never arrives,
-                # stop when timeout expires.
-                while self.__discovering or self.__sought_device_id is not None:
-                    time.sleep(0.1)
+                    self.__discovery_condition.wait(remaining)
         except Exception as e:
             self.__xbee_device.log.exception(e)
         finally:
             with self.__lock:
                 self.__discovering = False
+            self.__notify_discovery_waiters()
 
     def __is_802_compatible(self):
         """
@@ -5727,9 +9059,23 @@ class XBeeNetwork(object):
         """
         if discovery_data is None:
             return None
-        p = self.__xbee_device.get_protocol()
         x16bit_addr, x64bit_addr, node_id = self.__get_data_for_remote(discovery_data)
+        return self.__create_remote_device(x64bit_addr, x16bit_addr, node_id)
+
+    def __create_remote_device(self, x64bit_addr, x16bit_addr, node_id):
+        """
+        Creates and returns a :class:`.RemoteXBeeDevice` of the class that
+        corresponds to the protocol of the local XBee device.
 
+        Args:
+            x64bit_addr (:class:`.XBee64BitAddress`): the 64-bit address of the remote XBee device.
+            x16bit_addr (:class:`.XBee16BitAddress`): the 16-bit address of the remote XBee device.
+            node_id (String): the node identifier of the remote XBee device.
+
+        Returns:
+            :class:`.RemoteXBeeDevice`: the remote XBee device.
+        """
+        p = self.__xbee_device.get_protocol()
         if p == XBeeProtocol.ZIGBEE:
             return RemoteZigBeeDevice(self.__xbee_device, x64bit_addr, x16bit_addr, node_id)
         elif p == XBeeProtocol.DIGI_MESH:
@@ -5777,6 +9123,11 @@ class ZigBeeNetwork(XBeeNetwork):
 
     The network allows the discovery of remote devices in the same network
     as the local one and stores them.
+
+    It also keeps a cache with the route (the 16-bit addresses of the
+    intermediate hops) to each remote device learned from the received
+    route record indicators, so the local device can use source routing to
+    reach them.
     """
 
     def __init__(self, device):
@@ -5790,6 +9141,117 @@ class ZigBeeNetwork(XBeeNetwork):
             ValueError: if ``device`` is ``None``.
         """
         super().__init__(device)
+        self.__routes = {}
+        self.__routes_lock = threading.Lock()
+
+    def get_discovery_callbacks(self):
+        """
+        Override.
+
+        Returns:
+            Tuple: the callbacks of :meth:`.XBeeNetwork.get_discovery_callbacks` plus a callback for route record
+                indicator frames.
+
+        .. seealso::
+           | :meth:`.XBeeNetwork.get_discovery_callbacks`
+        """
+        def route_record_callback(xbee_packet):
+            """
+            Callback that stores the route to the remote XBee devices that
+            send route records.
+            """
+            if xbee_packet.get_frame_type() != ApiFrameType.ROUTE_RECORD_INDICATOR:
+                return
+            self.set_route(xbee_packet.x64bit_source_addr, xbee_packet.hops)
+
+        return super().get_discovery_callbacks() + (route_record_callback,)
+
+    def get_route(self, x64bit_addr):
+        """
+        Returns the known route to the remote XBee device with the provided
+        64-bit address.
+
+        Args:
+            x64bit_addr (:class:`.XBee64BitAddress`): the 64-bit address of the remote XBee device.
+
+        Returns:
+            List: list of :class:`.XBee16BitAddress` of the intermediate hops, starting with the neighbor of the
+                remote XBee device, or ``None`` if the route is not known.
+
+        .. seealso::
+           | :class:`.XBee64BitAddress`
+        """
+        with self.__routes_lock:
+            hops = self.__routes.get(str(x64bit_addr))
+        return list(hops) if hops is not None else None
+
+    def set_route(self, x64bit_addr, hops):
+        """
+        Stores the route to the remote XBee device with the provided 64-bit
+        address, replacing the previous one.
+
+        Args:
+            x64bit_addr (:class:`.XBee64BitAddress`): the 64-bit address of the remote XBee device.
+            hops (List): list of :class:`.XBee16BitAddress` of the intermediate hops, starting with the neighbor of
+                the remote XBee device. An empty list means the remote XBee device is a neighbor.
+
+        Raises:
+            ValueError: if ``x64bit_addr`` or ``hops`` are ``None``.
+            ValueError: if the number of hops is greater than 255.
+
+        .. seealso::
+           | :class:`.XBee16BitAddress`
+           | :class:`.XBee64BitAddress`
+        """
+        if x64bit_addr is None:
+            raise ValueError("64-bit address cannot be None")
+        if hops is None:
+            raise ValueError("Hops cannot be None")
+        if len(hops) > 255:
+            raise ValueError("Number of hops must be between 0 and 255.")
+
+        with self.__routes_lock:
+            self.__routes[str(x64bit_addr)] = list(hops)
+
+    def del_route(self, x64bit_addr):
+        """
+        Removes the known route to the remote XBee device with the provided
+        64-bit address, if any.
+
+        Args:
+            x64bit_addr (:class:`.XBee64BitAddress`): the 64-bit address of the remote XBee device.
+
+        .. seealso::
+           | :class:`.XBee64BitAddress`
+        """
+        with self.__routes_lock:
+            self.__routes.pop(str(x64bit_addr), None)
+
+    def _invalidate_16bit_addr(self, x64bit_addr):
+        """
+        Override.
+
+        Also removes the known route to the remote XBee device, as it is
+        probably no longer valid.
+
+        .. seealso::
+           | :meth:`.XBeeNetwork._invalidate_16bit_addr`
+        """
+        super()._invalidate_16bit_addr(x64bit_addr)
+        self.del_route(x64bit_addr)
+
+    def clear(self):
+        """
+        Override.
+
+        Also removes all the known routes.
+
+        .. seealso::
+           | :meth:`.XBeeNetwork.clear`
+        """
+        super().clear()
+        with self.__routes_lock:
+            self.__routes = {}
 
 
 class Raw802Network(XBeeNetwork):
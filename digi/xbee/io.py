@@ -4,9 +4,22 @@
 #
 # Copyright (c) 2017 Digi International Inc. All Rights Reserved.
 
+import bisect
+import math
+import struct
+import threading
+import time
+from array import array
+
 from digi.xbee.util import utils
 from enum import Enum, unique
 from digi.xbee.exception import OperationNotSupportedException
+from digi.xbee.models.address import XBee16BitAddress, XBee64BitAddress
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 @unique
@@ -169,6 +182,75 @@ class IOValue(Enum):
 IOValue.lookupTable = {x.code: x for x in IOValue}
 
 
+class _IOSampleLayout(object):
+    """
+    This class holds the decoding tables of the IO samples with the same
+    digital and analog masks.
+
+    The IO lines included in a sample only depend on its masks, and these do
+    not change while the IO configuration of the node is the same, so the
+    tables are computed once and shared by all the samples with those masks.
+    """
+
+    __slots__ = ("digital_lines", "digital_bits", "analog_lines", "analog_positions", "power_supply",
+                 "analog_struct")
+
+    __MAX_LAYOUTS = 1024
+    """
+    Maximum number of cached layouts. The cache is emptied when it is reached.
+    """
+
+    __layouts = {}
+    """
+    Cached layouts, indexed by format, digital mask and analog mask.
+    """
+
+    def __init__(self, raw, digital_mask, analog_mask):
+        """
+        Class constructor. Instantiates a new :class:`._IOSampleLayout` object with the provided parameters.
+
+        Args:
+            raw (Boolean): ``True`` for 802.15.4 IO samples, ``False`` otherwise.
+            digital_mask (Integer): the digital mask of the samples.
+            analog_mask (Integer): the analog mask of the samples.
+        """
+        # Tuple of (IOLine, bit of the line in the digital values).
+        self.digital_lines = tuple((IOLine.get(i), 1 << i) for i in range(16) if digital_mask & (1 << i))
+        self.digital_bits = dict(self.digital_lines)
+        if raw:
+            # Analog lines are bits 9 to 15 of the 802.15.4 masks, there is no power supply value.
+            self.analog_lines = tuple(IOLine.get(i - 9) for i in range(9, 16) if analog_mask & (1 << i))
+            self.power_supply = False
+        else:
+            # Bit 7 of the analog mask is the power supply, sent after the analog lines.
+            self.analog_lines = tuple(IOLine.get(i) for i in range(7) if analog_mask & (1 << i))
+            self.power_supply = bool(analog_mask & 0x80)
+        self.analog_positions = {line: i for i, line in enumerate(self.analog_lines)}
+        self.analog_struct = struct.Struct(">%dH" % (len(self.analog_lines) + self.power_supply))
+
+    @classmethod
+    def get(cls, raw, digital_mask, analog_mask):
+        """
+        Returns the layout of the IO samples with the provided format and masks.
+
+        Args:
+            raw (Boolean): ``True`` for 802.15.4 IO samples, ``False`` otherwise.
+            digital_mask (Integer): the digital mask of the samples.
+            analog_mask (Integer): the analog mask of the samples.
+
+        Returns:
+            :class:`._IOSampleLayout`: the layout of the samples.
+        """
+        key = (raw, digital_mask, analog_mask)
+        layout = cls.__layouts.get(key)
+        if layout is None:
+            if len(cls.__layouts) >= cls.__MAX_LAYOUTS:
+                cls.__layouts.clear()
+            layout = cls(raw, digital_mask, analog_mask)
+            cls.__layouts[key] = layout
+        return layout
+
+
 class IOSample(object):
     """
     This class represents an IO Data Sample. The sample is built using the
@@ -266,9 +348,15 @@ class IOSample(object):
         Raises:
             ValueError: if io_sample_payload length is less than 5.
         """
-        # dictionaries
-        self.__digital_values_map = {}  # {IOLine : IOValue}
-        self.__analog_values_map = {}  # {IOLine : Integer}
+        # Dictionaries, built the first time they are needed.
+        self.__digital_values_map = None  # {IOLine : IOValue}
+        self.__analog_values_map = None  # {IOLine : Integer}
+
+        # Decoding tables shared by the samples with the same masks.
+        self.__layout = None
+        # Tuple with the analog values followed by the power supply voltage.
+        self.__analog_raw_values = ()
+        self.__analog_count = 0
 
         # Integers:
         self.__digital_hsb_mask = None
@@ -293,11 +381,13 @@ class IOSample(object):
     def __str__(self):
         s = "{"
         if self.has_digital_values():
-            s += (''.join([self.__pattern.format(key=x, value=self.__digital_values_map[x]) for x in
-                           self.__digital_values_map.keys()]))
+            digital_values_map = self.__get_digital_values_map()
+            s += (''.join([self.__pattern.format(key=x, value=digital_values_map[x]) for x in
+                           digital_values_map.keys()]))
         if self.has_analog_values():
-            s += (''.join([self.__pattern.format(key=x, value=self.__analog_values_map[x]) for x in
-                           self.__analog_values_map.keys()]))
+            analog_values_map = self.__get_analog_values_map()
+            s += (''.join([self.__pattern.format(key=x, value=analog_values_map[x]) for x in
+                           analog_values_map.keys()]))
         if self.has_power_supply_value():
             try:
                 s += self.__pattern2.format(value=self.__power_supply_voltage)
@@ -322,8 +412,6 @@ class IOSample(object):
         Parses the information contained in the IO sample bytes reading the 
         value of each configured DIO and ADC.
         """
-        data_index = 3
-
         # Obtain the digital mask.                                    # Available digital IOs in 802.15.4
         self.__digital_hsb_mask = self.__io_sample_payload[1] & 0x01  # 0 0 0 0 0 0 0 1
         self.__digital_lsb_mask = self.__io_sample_payload[2] & 0xFF  # 1 1 1 1 1 1 1 1
@@ -333,50 +421,15 @@ class IOSample(object):
         self.__analog_mask = ((self.__io_sample_payload[1] << 8)       # Available analog IOs in 802.15.4
                               + self.__io_sample_payload[2]) & 0x7E00  # 0 1 1 1 1 1 1 0 0 0 0 0 0 0 0 0
 
-        # Read the digital values (if any). There are 9 possible digital lines in
-        # 802.15.4 protocol. The digital mask indicates if there is any digital
-        # line enabled to read its value. If 0, no digital values are received.
-        if self.__digital_mask > 0:
-            # Obtain the digital values.
-            self.__digital_hsb_values = self.__io_sample_payload[3] & 0x7F
-            self.__digital_lsb_values = self.__io_sample_payload[4] & 0xFF
-            # Combine the values.
-            self.__digital_values = (self.__digital_hsb_values << 8) + self.__digital_lsb_values
-
-            for i in range(16):
-                if not utils.is_bit_enabled(self.__digital_mask, i):
-                    continue
-                if utils.is_bit_enabled(self.__digital_values, i):
-                    self.__digital_values_map[IOLine.get(i)] = IOValue.HIGH
-                else:
-                    self.__digital_values_map[IOLine.get(i)] = IOValue.LOW
-
-            # Increase the data index to read the analog values.
-            data_index += 2
-
-        # Read the analog values (if any). There are 6 possible analog lines.
-        # The analog mask indicates if there is any analog line enabled to read
-        # its value. If 0, no analog values are received.
-        adc_index = 9
-        while (len(self.__io_sample_payload) - data_index) > 1 and adc_index < 16:
-            if not (utils.is_bit_enabled(self.__analog_mask, adc_index)):
-                adc_index += 1
-                continue
-
-            # 802.15.4 protocol does not provide power supply value, so get just the ADC data.
-            self.__analog_values_map[IOLine.get(adc_index - 9)] = \
-                ((self.__io_sample_payload[data_index] & 0xFF) << 8) + (self.__io_sample_payload[data_index + 1] & 0xFF)
-            # Increase the data index to read the next analog values.
-            data_index += 2
-            adc_index += 1
+        # There are 9 possible digital lines and 6 possible analog lines in 802.15.4
+        # protocol, which does not provide power supply value.
+        self.__parse_values(True, 3)
 
     def parse_io_sample(self):
         """
         Parses the information contained in the IO sample bytes reading the 
         value of each configured DIO and ADC.
         """
-        data_index = 4
-
         # Obtain the digital masks.                                   # Available digital IOs
         self.__digital_hsb_mask = self.__io_sample_payload[1] & 0x7F  # 0 1 1 1 1 1 1 1
         self.__digital_lsb_mask = self.__io_sample_payload[2] & 0xFF  # 1 1 1 1 1 1 1 1
@@ -385,46 +438,75 @@ class IOSample(object):
         # Obtain the analog mask.                                # Available analog IOs
         self.__analog_mask = self.__io_sample_payload[3] & 0xBF  # 1 0 1 1 1 1 1 1
 
-        # Read the digital values (if any). There are 16 possible digital lines.
+        # There are 16 possible digital lines and 6 possible analog lines, followed
+        # by the power supply voltage.
+        self.__parse_values(False, 4)
+
+    def __parse_values(self, raw, data_index):
+        """
+        Reads the digital and analog values of the sample once its masks are known.
+
+        The lines to read are taken from the layout of the masks, so the sample
+        maps are not built until they are requested.
+
+        Args:
+            raw (Boolean): ``True`` if the sample comes from an 802.15.4 device, ``False`` otherwise.
+            data_index (Integer): index of the first value in the sample payload.
+        """
+        payload = self.__io_sample_payload
+        layout = _IOSampleLayout.get(raw, self.__digital_mask, self.__analog_mask)
+        self.__layout = layout
+        self.__digital_values_map = None
+        self.__analog_values_map = None
+
         # The digital mask indicates if there is any digital line enabled to read
         # its value. If 0, no digital values are received.
         if self.__digital_mask > 0:
             # Obtain the digital values.
-            self.__digital_hsb_values = self.__io_sample_payload[4] & 0x7F
-            self.__digital_lsb_values = self.__io_sample_payload[5] & 0xFF
+            self.__digital_hsb_values = payload[data_index] & 0x7F
+            self.__digital_lsb_values = payload[data_index + 1] & 0xFF
             # Combine the values.
             self.__digital_values = (self.__digital_hsb_values << 8) + self.__digital_lsb_values
-
-            for i in range(16):
-                if not utils.is_bit_enabled(self.__digital_mask, i):
-                    continue
-                if utils.is_bit_enabled(self.__digital_values, i):
-                    self.__digital_values_map[IOLine.get(i)] = IOValue.HIGH
-                else:
-                    self.__digital_values_map[IOLine.get(i)] = IOValue.LOW
             # Increase the data index to read the analog values.
             data_index += 2
 
-        # Read the analog values (if any). There are 6 possible analog lines.
-        # The analog mask indicates if there is any analog line enabled to read
-        # its value. If 0, no analog values are received.
-        adc_index = 0
-        while (len(self.__io_sample_payload) - data_index) > 1 and adc_index < 8:
-            if not utils.is_bit_enabled(self.__analog_mask, adc_index):
-                adc_index += 1
-                continue
-            # When analog index is 7, it means that the analog value corresponds to the power
-            # supply voltage, therefore this value should be stored in a different value.
-            if adc_index == 7:
-                self.__power_supply_voltage = ((self.__io_sample_payload[data_index] & 0xFF) << 8) + \
-                                              (self.__io_sample_payload[data_index + 1] & 0xFF)
-            else:
-                self.__analog_values_map[IOLine.get(adc_index)] = \
-                    ((self.__io_sample_payload[data_index] & 0xFF) << 8) + \
-                    (self.__io_sample_payload[data_index + 1] & 0xFF)
-            # Increase the data index to read the next analog values.
-            data_index += 2
-            adc_index += 1
+        # Read the analog values (if any) at once. If the sample is truncated,
+        # keep the values it contains.
+        analog_struct = layout.analog_struct
+        if len(payload) - data_index >= analog_struct.size:
+            values = analog_struct.unpack_from(payload, data_index)
+        else:
+            values = struct.unpack_from(">%dH" % ((len(payload) - data_index) // 2), payload, data_index)
+        self.__analog_raw_values = values
+        self.__analog_count = min(len(values), len(layout.analog_lines))
+        if layout.power_supply and len(values) > len(layout.analog_lines):
+            self.__power_supply_voltage = values[-1]
+        else:
+            self.__power_supply_voltage = None
+
+    def __get_digital_values_map(self):
+        """
+        Returns the digital values map, building it if it does not exist yet.
+
+        Returns:
+            Dictionary: the digital values map.
+        """
+        if self.__digital_values_map is None:
+            values = self.__digital_values
+            self.__digital_values_map = {line: IOValue.HIGH if values & bit else IOValue.LOW
+                                         for line, bit in self.__layout.digital_lines}
+        return self.__digital_values_map
+
+    def __get_analog_values_map(self):
+        """
+        Returns the analog values map, building it if it does not exist yet.
+
+        Returns:
+            Dictionary: the analog values map.
+        """
+        if self.__analog_values_map is None:
+            self.__analog_values_map = dict(zip(self.__layout.analog_lines, self.__analog_raw_values))
+        return self.__analog_values_map
 
     def __get_digital_hsb_mask(self):
         """
@@ -463,7 +545,7 @@ class IOSample(object):
         Returns:
             Dictionary: the digital values map.
         """
-        return self.__digital_values_map.copy()
+        return self.__get_digital_values_map().copy()
 
     def __get_analog_mask(self):
         """
@@ -484,7 +566,7 @@ class IOSample(object):
         Returns:
             Dictionary: the analog values map.
         """
-        return self.__analog_values_map.copy()
+        return self.__get_analog_values_map().copy()
 
     def __get_power_supply_value(self):
         """
@@ -505,7 +587,7 @@ class IOSample(object):
         Returns:
             Boolean: ``True`` if the sample has digital values, ``False`` otherwise.
         """
-        return len(self.__digital_values_map) > 0
+        return len(self.__layout.digital_lines) > 0
 
     def has_digital_value(self, io_line):
         """
@@ -517,7 +599,7 @@ class IOSample(object):
         Returns:
             Boolean: ``True`` if the given IO line has a digital value, ``False`` otherwise.
         """
-        return io_line in self.__digital_values_map.keys()
+        return io_line in self.__layout.digital_bits
 
     def has_analog_value(self, io_line):
         """
@@ -526,7 +608,8 @@ class IOSample(object):
         Returns:
             Boolean: ``True`` if the given IOLine has an analog value, ``False`` otherwise.
         """
-        return io_line in self.__analog_values_map.keys()
+        position = self.__layout.analog_positions.get(io_line)
+        return position is not None and position < self.__analog_count
 
     def has_analog_values(self):
         """
@@ -535,7 +618,7 @@ class IOSample(object):
         Returns:
             Boolean. ``True`` if there are analog values, ``False`` otherwise.
         """
-        return len(self.__analog_values_map) > 0
+        return self.__analog_count > 0
 
     def has_power_supply_value(self):
         """
@@ -564,9 +647,10 @@ class IOSample(object):
            | :class:`.IOLine`
            | :class:`.IOValue`
         """
-        if io_line in self.__digital_values_map:
-            return self.__digital_values_map[io_line]
-        return None
+        bit = self.__layout.digital_bits.get(io_line)
+        if bit is None:
+            return None
+        return IOValue.HIGH if self.__digital_values & bit else IOValue.LOW
 
     def get_analog_value(self, io_line):
         """
@@ -585,8 +669,9 @@ class IOSample(object):
         .. seealso::
            | :class:`.IOLine`
         """
-        if io_line in self.__analog_values_map:
-            return self.__analog_values_map[io_line]
+        position = self.__layout.analog_positions.get(io_line)
+        if position is not None and position < self.__analog_count:
+            return self.__analog_raw_values[position]
         return None
 
     digital_hsb_mask = property(__get_digital_hsb_mask)
@@ -637,3 +722,848 @@ class IOMode(Enum):
 
     DIGITAL_OUT_HIGH = 5
     """Digital output, High"""
+
+
+def _get_remote_key(remote):
+    """
+    Returns the key that identifies the provided remote XBee device: the
+    bytes of its 64-bit address or, if unknown, of its 16-bit address.
+
+    Args:
+        remote (:class:`.RemoteXBeeDevice` or :class:`.XBee64BitAddress` or :class:`.XBee16BitAddress`):
+            the remote XBee device or its address.
+
+    Returns:
+        Bytes: the key, ``None`` if the remote XBee device has no known address.
+    """
+    if remote is None:
+        return None
+    if isinstance(remote, (XBee64BitAddress, XBee16BitAddress)):
+        return bytes(remote.address)
+    x64bit_addr = remote.get_64bit_addr()
+    if x64bit_addr is not None and x64bit_addr != XBee64BitAddress.UNKNOWN_ADDRESS:
+        return bytes(x64bit_addr.address)
+    x16bit_addr = remote.get_16bit_addr()
+    if x16bit_addr is not None and x16bit_addr != XBee16BitAddress.UNKNOWN_ADDRESS:
+        return bytes(x16bit_addr.address)
+    return None
+
+
+class IOSampleStore(object):
+    """
+    This class stores the IO samples received from remote XBee devices in
+    time series, one per remote XBee device and IO line.
+
+    Each time series is a ring buffer preallocated with the capacity of the
+    store, so the memory used is bounded and the oldest values are replaced
+    by the new ones. Digital values are stored as 1 (high) or 0 (low) and
+    analog values as the ADC reading. Timestamps are :func:`time.monotonic`
+    seconds.
+
+    Queries return the timestamps and values as columns: NumPy arrays if
+    NumPy is installed, :class:`array.array` objects otherwise.
+
+    .. seealso::
+       | :meth:`.XBeeDevice.set_io_sample_store`
+    """
+
+    __DEFAULT_CAPACITY = 1024
+    """
+    Default number of values kept per remote XBee device and IO line.
+    """
+
+    def __init__(self, capacity=__DEFAULT_CAPACITY):
+        """
+        Class constructor. Instantiates a new :class:`.IOSampleStore` object with the provided parameters.
+
+        Args:
+            capacity (Integer, optional, default=1024): number of values kept per remote XBee device and
+                IO line.
+
+        Raises:
+            ValueError: if ``capacity`` is less than 1.
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be greater than 0.")
+
+        self.__capacity = capacity
+        self.__series = {}  # {key: {IOLine: _IOSeries}}
+        self.__lock = threading.Lock()
+
+    def add_sample(self, remote, io_sample, timestamp=None):
+        """
+        Appends the values of the provided IO sample to the time series of
+        the remote XBee device that sent it.
+
+        Args:
+            remote (:class:`.RemoteXBeeDevice`): the remote XBee device that sent the sample.
+            io_sample (:class:`.IOSample`): the received IO sample.
+            timestamp (Float, optional): the reception time, in :func:`time.monotonic` seconds. If not
+                provided, the current time is used.
+        """
+        key = _get_remote_key(remote)
+        if key is None:
+            return
+        if timestamp is None:
+            timestamp = time.monotonic()
+
+        with self.__lock:
+            remote_series = self.__series.get(key)
+            if remote_series is None:
+                remote_series = {}
+                self.__series[key] = remote_series
+            if io_sample.has_digital_values():
+                for io_line, io_value in io_sample.digital_values.items():
+                    self.__get_series(remote_series, io_line).append(timestamp, 1 if io_value == IOValue.HIGH else 0)
+            if io_sample.has_analog_values():
+                for io_line, value in io_sample.analog_values.items():
+                    self.__get_series(remote_series, io_line).append(timestamp, value)
+
+    def get_last(self, remote, io_line, count=None):
+        """
+        Returns the last values stored for the provided remote XBee device
+        and IO line.
+
+        Args:
+            remote (:class:`.RemoteXBeeDevice` or :class:`.XBee64BitAddress` or :class:`.XBee16BitAddress`):
+                the remote XBee device or its address.
+            io_line (:class:`.IOLine`): the IO line.
+            count (Integer, optional): the maximum number of values to return. If not provided, all the
+                stored values are returned.
+
+        Returns:
+            Tuple: the timestamps and the values, from the oldest to the newest.
+        """
+        times, values = self.__get_columns(remote, io_line)
+        if count is not None:
+            first = max(0, len(times) - count)
+            times, values = times[first:], values[first:]
+        return times, values
+
+    def get_window(self, remote, io_line, start, end=None):
+        """
+        Returns the values stored for the provided remote XBee device and IO
+        line with a timestamp between ``start`` and ``end`` (both included).
+
+        Args:
+            remote (:class:`.RemoteXBeeDevice` or :class:`.XBee64BitAddress` or :class:`.XBee16BitAddress`):
+                the remote XBee device or its address.
+            io_line (:class:`.IOLine`): the IO line.
+            start (Float): the start of the window, in :func:`time.monotonic` seconds.
+            end (Float, optional): the end of the window. If not provided, the window has no end.
+
+        Returns:
+            Tuple: the timestamps and the values, from the oldest to the newest.
+        """
+        times, values = self.__get_columns(remote, io_line)
+        first = bisect.bisect_left(times, start)
+        last = len(times) if end is None else bisect.bisect_right(times, end)
+        return times[first:last], values[first:last]
+
+    def get_stats(self, remote, io_line, start, end=None):
+        """
+        Returns the minimum, maximum and mean of the values stored for the
+        provided remote XBee device and IO line within a time window.
+
+        Args:
+            remote (:class:`.RemoteXBeeDevice` or :class:`.XBee64BitAddress` or :class:`.XBee16BitAddress`):
+                the remote XBee device or its address.
+            io_line (:class:`.IOLine`): the IO line.
+            start (Float): the start of the window, in :func:`time.monotonic` seconds.
+            end (Float, optional): the end of the window. If not provided, the window has no end.
+
+        Returns:
+            Tuple: the minimum, maximum and mean values, ``None`` if there are no values in the window.
+
+        .. seealso::
+           | :meth:`.IOSampleStore.get_window`
+        """
+        values = self.get_window(remote, io_line, start, end=end)[1]
+        if len(values) == 0:
+            return None
+        if numpy is not None:
+            return int(values.min()), int(values.max()), float(values.mean())
+        return min(values), max(values), sum(values) / len(values)
+
+    def resample(self, remote, io_line, period, start, end=None):
+        """
+        Resamples the values stored for the provided remote XBee device and
+        IO line to a fixed period.
+
+        The value at each point of the new time base is the last one stored
+        at or before it. Points before the first stored value are omitted.
+
+        Args:
+            remote (:class:`.RemoteXBeeDevice` or :class:`.XBee64BitAddress` or :class:`.XBee16BitAddress`):
+                the remote XBee device or its address.
+            io_line (:class:`.IOLine`): the IO line.
+            period (Float): the period of the new time base, in seconds.
+            start (Float): the first point of the new time base, in :func:`time.monotonic` seconds.
+            end (Float, optional): the limit of the new time base. If not provided, the timestamp of the
+                newest value is used.
+
+        Returns:
+            Tuple: the timestamps and the values of the new time base.
+
+        Raises:
+            ValueError: if ``period`` is not greater than 0.
+        """
+        if period <= 0:
+            raise ValueError("period must be greater than 0.")
+
+        times, values = self.__get_columns(remote, io_line)
+        if len(times) == 0:
+            return times, values
+        if end is None:
+            end = times[-1]
+        # Do not generate points before the first value.
+        first = max(0, int(math.ceil((times[0] - start) / period)))
+        last = int(math.floor((end - start) / period))
+        if last < first:
+            return times[:0], values[:0]
+
+        if numpy is not None:
+            new_times = start + numpy.arange(first, last + 1) * period
+            return new_times, values[numpy.searchsorted(times, new_times, side="right") - 1]
+        new_times = array("d", (start + i * period for i in range(first, last + 1)))
+        return new_times, array(values.typecode, (values[bisect.bisect_right(times, t) - 1] for t in new_times))
+
+    def get_io_lines(self, remote):
+        """
+        Returns the IO lines with values stored for the provided remote XBee
+        device.
+
+        Args:
+            remote (:class:`.RemoteXBeeDevice` or :class:`.XBee64BitAddress` or :class:`.XBee16BitAddress`):
+                the remote XBee device or its address.
+
+        Returns:
+            List: the list of :class:`.IOLine` with values stored.
+        """
+        key = _get_remote_key(remote)
+        with self.__lock:
+            return list(self.__series.get(key, {}).keys())
+
+    def clear(self, remote=None):
+        """
+        Removes the values stored for the provided remote XBee device, or
+        all of them.
+
+        Args:
+            remote (:class:`.RemoteXBeeDevice` or :class:`.XBee64BitAddress` or :class:`.XBee16BitAddress`,
+                optional): the remote XBee device or its address. If not provided, all the values are removed.
+        """
+        with self.__lock:
+            if remote is None:
+                self.__series.clear()
+                return
+            self.__series.pop(_get_remote_key(remote), None)
+
+    def __get_series(self, remote_series, io_line):
+        """
+        Returns the time series of the provided IO line, creating it if it
+        does not exist.
+
+        Args:
+            remote_series (Dictionary): the time series of a remote XBee device, indexed by IO line.
+            io_line (:class:`.IOLine`): the IO line.
+
+        Returns:
+            :class:`._IOSeries`: the time series.
+        """
+        series = remote_series.get(io_line)
+        if series is None:
+            series = _IOSeries(self.__capacity)
+            remote_series[io_line] = series
+        return series
+
+    def __get_columns(self, remote, io_line):
+        """
+        Returns a copy of the timestamps and values stored for the provided
+        remote XBee device and IO line.
+
+        Args:
+            remote (:class:`.RemoteXBeeDevice` or :class:`.XBee64BitAddress` or :class:`.XBee16BitAddress`):
+                the remote XBee device or its address.
+            io_line (:class:`.IOLine`): the IO line.
+
+        Returns:
+            Tuple: the timestamps and the values, from the oldest to the newest.
+        """
+        key = _get_remote_key(remote)
+        with self.__lock:
+            series = self.__series.get(key, {}).get(io_line)
+            if series is None:
+                return _IOSeries.empty_columns()
+            return series.get_columns()
+
+    def __get_capacity(self):
+        """
+        Returns the number of values kept per remote XBee device and IO line.
+
+        Returns:
+            Integer: the capacity of each time series.
+        """
+        return self.__capacity
+
+    capacity = property(__get_capacity)
+    """Integer. Number of values kept per remote XBee device and IO line."""
+
+
+class _IOSeries(object):
+    """
+    This class is a ring buffer of timestamps and values of an IO line.
+    """
+
+    __slots__ = ("__times", "__values", "__index", "__count")
+
+    def __init__(self, capacity):
+        """
+        Class constructor. Instantiates a new :class:`._IOSeries` object with the provided parameters.
+
+        Args:
+            capacity (Integer): the number of values kept.
+        """
+        if numpy is not None:
+            self.__times = numpy.zeros(capacity, dtype=numpy.float64)
+            self.__values = numpy.zeros(capacity, dtype=numpy.int32)
+        else:
+            self.__times = array("d", [0.0]) * capacity
+            self.__values = array("l", [0]) * capacity
+        self.__index = 0
+        self.__count = 0
+
+    def append(self, timestamp, value):
+        """
+        Appends a value, replacing the oldest one if the buffer is full.
+
+        Args:
+            timestamp (Float): the timestamp of the value.
+            value (Integer): the value.
+        """
+        index = self.__index
+        self.__times[index] = timestamp
+        self.__values[index] = value
+        index += 1
+        self.__index = 0 if index == len(self.__times) else index
+        if self.__count < len(self.__times):
+            self.__count += 1
+
+    def get_columns(self):
+        """
+        Returns a copy of the timestamps and values in chronological order.
+
+        Returns:
+            Tuple: the timestamps and the values.
+        """
+        times, values, index = self.__times, self.__values, self.__index
+        if self.__count < len(times):
+            times, values = times[:index], values[:index]
+            # NumPy slices are views of the buffers, array slices are already copies.
+            return (times.copy(), values.copy()) if numpy is not None else (times, values)
+        if numpy is not None:
+            return numpy.concatenate((times[index:], times[:index])), \
+                   numpy.concatenate((values[index:], values[:index]))
+        return times[index:] + times[:index], values[index:] + values[:index]
+
+    @staticmethod
+    def empty_columns():
+        """
+        Returns empty timestamps and values columns.
+
+        Returns:
+            Tuple: the empty timestamps and values.
+        """
+        if numpy is not None:
+            return numpy.zeros(0, dtype=numpy.float64), numpy.zeros(0, dtype=numpy.int32)
+        return array("d"), array("l")
+
+
+class IOSampleBatch(object):
+    """
+    This class decodes many IO samples with the same digital and analog
+    masks at once, into NumPy arrays with one row per sample.
+
+    It is meant for offline processing of captured frames, where building
+    an :class:`.IOSample` for each frame is too slow. Like
+    :class:`.IOSample`, only the first sample of each payload is decoded.
+
+    Instances are built with :meth:`.IOSampleBatch.from_payloads` or
+    :meth:`.IOSampleBatch.from_buffer`. NumPy must be installed to use this
+    class.
+    """
+
+    __DEFAULT_REFERENCE_VOLTAGE = 1200
+    """
+    Default ADC reference voltage, in millivolts.
+    """
+
+    __DEFAULT_ADC_FULL_SCALE = 1023
+    """
+    Default ADC reading of the reference voltage.
+    """
+
+    def __init__(self, rows, raw):
+        """
+        Class constructor. Instantiates a new :class:`.IOSampleBatch` object with the provided parameters.
+
+        Use :meth:`.IOSampleBatch.from_payloads` or :meth:`.IOSampleBatch.from_buffer` instead.
+
+        Args:
+            rows (:class:`numpy.ndarray`): 2D array of bytes with one IO sample payload per row.
+            raw (Boolean): ``True`` if the payloads come from 802.15.4 devices, ``False`` otherwise.
+
+        Raises:
+            ValueError: if the payloads are too short or do not have the same masks.
+        """
+        if len(rows) == 0:
+            raise ValueError("There must be at least one IO sample.")
+
+        digital_mask, analog_mask, data_index = IOSampleBatch.__get_masks(rows[0], raw)
+        if not (rows[:, 1:data_index] == rows[0, 1:data_index]).all():
+            raise ValueError("All the IO samples must have the same digital and analog masks.")
+
+        layout = _IOSampleLayout.get(raw, digital_mask, analog_mask)
+        num_analog = layout.analog_struct.size // 2
+        if rows.shape[1] < data_index + (2 if digital_mask > 0 else 0) + layout.analog_struct.size:
+            raise ValueError("IO sample payloads are too short for their masks.")
+
+        self.__digital_mask = digital_mask
+        self.__analog_mask = analog_mask
+        self.__digital_lines = tuple(line for line, _ in layout.digital_lines)
+        self.__analog_lines = layout.analog_lines
+
+        if digital_mask > 0:
+            values = ((rows[:, data_index] & 0x7F).astype(numpy.uint16) << 8) | rows[:, data_index + 1]
+            positions = numpy.array([bit.bit_length() - 1 for _, bit in layout.digital_lines], dtype=numpy.uint16)
+            self.__digital_values = ((values[:, None] >> positions) & 1).astype(numpy.uint8)
+            data_index += 2
+        else:
+            self.__digital_values = numpy.zeros((len(rows), 0), dtype=numpy.uint8)
+
+        # Analog values are big endian 16-bit integers.
+        analog = numpy.ascontiguousarray(rows[:, data_index:data_index + 2 * num_analog])
+        analog = analog.view(">u2").astype(numpy.uint16)
+        if layout.power_supply:
+            self.__analog_values = analog[:, :-1]
+            self.__power_supply_values = analog[:, -1]
+        else:
+            self.__analog_values = analog
+            self.__power_supply_values = None
+
+    def __len__(self):
+        return len(self.__digital_values)
+
+    @classmethod
+    def from_payloads(cls, io_sample_payloads, raw=None):
+        """
+        Decodes the provided IO sample payloads, all with the same length
+        and masks.
+
+        Args:
+            io_sample_payloads (List): the IO sample payloads, as bytearrays (the ``rf_data`` of the IO sample
+                packets).
+            raw (Boolean, optional): ``True`` if the payloads come from 802.15.4 devices, ``False`` otherwise.
+                If not provided, it is deduced from the payload length, as :class:`.IOSample` does.
+
+        Returns:
+            :class:`.IOSampleBatch`: the decoded IO samples.
+
+        Raises:
+            ImportError: if NumPy is not installed.
+            ValueError: if there are no payloads, or they do not have the same length and masks.
+        """
+        IOSampleBatch.__check_numpy()
+        if len(io_sample_payloads) == 0:
+            raise ValueError("There must be at least one IO sample.")
+        length = len(io_sample_payloads[0])
+        if any(len(payload) != length for payload in io_sample_payloads):
+            raise ValueError("All the IO sample payloads must have the same length.")
+        if raw is None:
+            raw = length % 2 != 0
+
+        rows = numpy.frombuffer(b"".join(io_sample_payloads), dtype=numpy.uint8)
+        return cls(rows.reshape(len(io_sample_payloads), length), raw)
+
+    @classmethod
+    def from_buffer(cls, buffer, offsets, raw=False):
+        """
+        Decodes the IO sample payloads found at the provided offsets of a
+        buffer, all of them with the same masks.
+
+        The buffer may contain anything else between payloads, for example
+        the rest of the captured API frames.
+
+        Args:
+            buffer (Bytearray): the buffer with the IO sample payloads.
+            offsets (List): the offset of each IO sample payload within ``buffer``.
+            raw (Boolean, optional, default=``False``): ``True`` if the payloads come from 802.15.4 devices.
+
+        Returns:
+            :class:`.IOSampleBatch`: the decoded IO samples.
+
+        Raises:
+            ImportError: if NumPy is not installed.
+            ValueError: if there are no offsets, the payloads exceed the buffer, or they do not have the
+                same masks.
+        """
+        IOSampleBatch.__check_numpy()
+        data = numpy.frombuffer(buffer, dtype=numpy.uint8)
+        offsets = numpy.asarray(offsets, dtype=numpy.intp)
+        if len(offsets) == 0:
+            raise ValueError("There must be at least one IO sample.")
+
+        # The masks of the first payload give the length of all of them.
+        first = int(offsets[0])
+        header = data[first:first + 4]
+        if len(header) < 4:
+            raise ValueError("IO sample payloads exceed the buffer.")
+        digital_mask, analog_mask, length = IOSampleBatch.__get_masks(header, raw)
+        layout = _IOSampleLayout.get(raw, digital_mask, analog_mask)
+        length += (2 if digital_mask > 0 else 0) + layout.analog_struct.size
+        if offsets.min() < 0 or offsets.max() + length > len(data):
+            raise ValueError("IO sample payloads exceed the buffer.")
+
+        return cls(data[offsets[:, None] + numpy.arange(length)], raw)
+
+    def get_digital_values(self, io_line):
+        """
+        Returns the digital values of the provided IO line.
+
+        Args:
+            io_line (:class:`.IOLine`): the IO line.
+
+        Returns:
+            :class:`numpy.ndarray`: the value of the line in each sample, 1 for high and 0 for low, ``None``
+                if the samples do not contain digital values for the line.
+        """
+        if io_line not in self.__digital_lines:
+            return None
+        return self.__digital_values[:, self.__digital_lines.index(io_line)]
+
+    def get_analog_values(self, io_line):
+        """
+        Returns the analog values of the provided IO line.
+
+        Args:
+            io_line (:class:`.IOLine`): the IO line.
+
+        Returns:
+            :class:`numpy.ndarray`: the ADC reading of the line in each sample, ``None`` if the samples do
+                not contain analog values for the line.
+        """
+        if io_line not in self.__analog_lines:
+            return None
+        return self.__analog_values[:, self.__analog_lines.index(io_line)]
+
+    def to_millivolts(self, reference_voltage=__DEFAULT_REFERENCE_VOLTAGE, full_scale=__DEFAULT_ADC_FULL_SCALE):
+        """
+        Converts the analog values to millivolts.
+
+        Args:
+            reference_voltage (Float, optional, default=1200): ADC reference voltage, in millivolts.
+            full_scale (Integer, optional, default=1023): ADC reading of the reference voltage.
+
+        Returns:
+            :class:`numpy.ndarray`: the analog values in millivolts, with the same shape as
+                :attr:`.IOSampleBatch.analog_values`.
+        """
+        return self.__analog_values * (float(reference_voltage) / full_scale)
+
+    @staticmethod
+    def __get_masks(header, raw):
+        """
+        Returns the masks of an IO sample payload.
+
+        Args:
+            header (:class:`numpy.ndarray`): the first bytes of the IO sample payload.
+            raw (Boolean): ``True`` if the payload comes from an 802.15.4 device, ``False`` otherwise.
+
+        Returns:
+            Tuple: the digital mask, the analog mask and the index of the first value in the payload.
+        """
+        if raw:
+            return (((int(header[1]) & 0x01) << 8) + int(header[2]),
+                    ((int(header[1]) << 8) + int(header[2])) & 0x7E00, 3)
+        return ((int(header[1]) & 0x7F) << 8) + int(header[2]), int(header[3]) & 0xBF, 4
+
+    @staticmethod
+    def __check_numpy():
+        """
+        Checks that NumPy is installed.
+
+        Raises:
+            ImportError: if NumPy is not installed.
+        """
+        if numpy is None:
+            raise ImportError("NumPy is required to decode IO samples in batch.")
+
+    def __get_digital_mask(self):
+        """
+        Returns the digital mask of the IO samples.
+
+        Returns:
+            Integer: the digital mask.
+        """
+        return self.__digital_mask
+
+    def __get_analog_mask(self):
+        """
+        Returns the analog mask of the IO samples.
+
+        Returns:
+            Integer: the analog mask.
+        """
+        return self.__analog_mask
+
+    def __get_digital_lines(self):
+        """
+        Returns the IO lines with digital values, in column order.
+
+        Returns:
+            Tuple: the :class:`.IOLine` with digital values.
+        """
+        return self.__digital_lines
+
+    def __get_analog_lines(self):
+        """
+        Returns the IO lines with analog values, in column order.
+
+        Returns:
+            Tuple: the :class:`.IOLine` with analog values.
+        """
+        return self.__analog_lines
+
+    def __get_digital_values(self):
+        """
+        Returns the digital values of the IO samples.
+
+        Returns:
+            :class:`numpy.ndarray`: array with one row per sample and one column per digital line.
+        """
+        return self.__digital_values
+
+    def __get_analog_values(self):
+        """
+        Returns the analog values of the IO samples.
+
+        Returns:
+            :class:`numpy.ndarray`: array with one row per sample and one column per analog line.
+        """
+        return self.__analog_values
+
+    def __get_power_supply_values(self):
+        """
+        Returns the power supply values of the IO samples.
+
+        Returns:
+            :class:`numpy.ndarray`: the power supply value of each sample, ``None`` if the samples do not
+                contain it.
+        """
+        return self.__power_supply_values
+
+    digital_mask = property(__get_digital_mask)
+    """Integer. Digital mask of the IO samples."""
+
+    analog_mask = property(__get_analog_mask)
+    """Integer. Analog mask of the IO samples."""
+
+    digital_lines = property(__get_digital_lines)
+    """Tuple. IO lines with digital values, in column order."""
+
+    analog_lines = property(__get_analog_lines)
+    """Tuple. IO lines with analog values, in column order."""
+
+    digital_values = property(__get_digital_values)
+    """:class:`numpy.ndarray`. Digital values (1 high, 0 low), one row per sample and one column per line."""
+
+    analog_values = property(__get_analog_values)
+    """:class:`numpy.ndarray`. ADC readings, one row per sample and one column per line."""
+
+    power_supply_values = property(__get_power_supply_values)
+    """:class:`numpy.ndarray`. Power supply value of each sample, ``None`` if the samples do not contain it."""
+
+
+class IOSampleFilter(object):
+    """
+    This class decides which received IO samples are worth notifying,
+    dropping those whose values did not change enough since the last
+    sample notified for the same remote XBee device.
+
+    A sample is notified when any digital line changes, when any analog
+    line moves more than both its deadband (absolute, in ADC units) and
+    its percent threshold (relative to the last notified value), or when
+    the set of lines changes. The emit intervals bound the rate of
+    notifications per remote XBee device: samples arriving sooner than
+    ``min_interval`` after the last notified one are always dropped, and
+    samples arriving ``max_interval`` or later are always notified.
+
+    .. seealso::
+       | :meth:`.XBeeDevice.set_io_sample_filter`
+    """
+
+    def __init__(self, deadband=0, percent=0, min_interval=0, max_interval=None):
+        """
+        Class constructor. Instantiates a new :class:`.IOSampleFilter` object with the provided parameters.
+
+        Args:
+            deadband (Integer, optional, default=0): default analog deadband, in ADC units. Analog changes
+                must be greater than it to notify the sample.
+            percent (Float, optional, default=0): default analog threshold, as a percentage of the last
+                notified value. Analog changes must be greater than it to notify the sample.
+            min_interval (Float, optional, default=0): minimum time between notified samples of a remote
+                XBee device, in seconds.
+            max_interval (Float, optional): maximum time between notified samples of a remote XBee device,
+                in seconds. If not provided, unchanged samples are never notified.
+
+        Raises:
+            ValueError: if any of the thresholds or intervals is negative, or ``max_interval`` is less than
+                ``min_interval``.
+        """
+        IOSampleFilter.__check_thresholds(deadband, percent)
+        if min_interval < 0 or (max_interval is not None and max_interval < min_interval):
+            raise ValueError("Intervals cannot be negative and max_interval cannot be less than min_interval.")
+
+        self.__default_thresholds = (deadband, percent)
+        self.__line_thresholds = {}  # {IOLine: (deadband, percent)}
+        self.__min_interval = min_interval
+        self.__max_interval = max_interval
+        self.__last = {}  # {key: (timestamp, digital values, analog values)}
+        self.__checked = 0
+        self.__passed = 0
+        self.__lock = threading.Lock()
+
+    def set_line_thresholds(self, io_line, deadband=0, percent=0):
+        """
+        Sets the analog thresholds of the provided IO line, overriding the
+        default ones.
+
+        Args:
+            io_line (:class:`.IOLine`): the IO line.
+            deadband (Integer, optional, default=0): deadband of the line, in ADC units.
+            percent (Float, optional, default=0): threshold of the line, as a percentage of the last notified
+                value.
+
+        Raises:
+            ValueError: if any of the thresholds is negative.
+        """
+        IOSampleFilter.__check_thresholds(deadband, percent)
+        with self.__lock:
+            self.__line_thresholds[io_line] = (deadband, percent)
+
+    def is_interesting(self, remote, io_sample, timestamp=None):
+        """
+        Returns whether the provided IO sample must be notified or not, and
+        remembers it as the last notified sample of the remote XBee device
+        if so.
+
+        Args:
+            remote (:class:`.RemoteXBeeDevice`): the remote XBee device that sent the sample.
+            io_sample (:class:`.IOSample`): the received IO sample.
+            timestamp (Float, optional): the reception time, in :func:`time.monotonic` seconds. If not
+                provided, the current time is used.
+
+        Returns:
+            Boolean: ``True`` if the sample must be notified, ``False`` if it must be dropped.
+        """
+        key = _get_remote_key(remote)
+        if key is None:
+            return True
+        if timestamp is None:
+            timestamp = time.monotonic()
+
+        with self.__lock:
+            self.__checked += 1
+            last = self.__last.get(key)
+            digital = io_sample.digital_values if io_sample.has_digital_values() else {}
+            analog = io_sample.analog_values if io_sample.has_analog_values() else {}
+            if last is not None:
+                elapsed = timestamp - last[0]
+                if elapsed < self.__min_interval:
+                    return False
+                if ((self.__max_interval is None or elapsed < self.__max_interval) and
+                        digital == last[1] and not self.__analog_changed(analog, last[2])):
+                    return False
+            self.__last[key] = (timestamp, digital, analog)
+            self.__passed += 1
+            return True
+
+    def reset(self, remote=None):
+        """
+        Forgets the last notified sample of the provided remote XBee device,
+        or of all of them, so their next samples are notified.
+
+        Args:
+            remote (:class:`.RemoteXBeeDevice` or :class:`.XBee64BitAddress` or :class:`.XBee16BitAddress`,
+                optional): the remote XBee device or its address. If not provided, all the remote XBee
+                devices are reset.
+        """
+        with self.__lock:
+            if remote is None:
+                self.__last.clear()
+            else:
+                self.__last.pop(_get_remote_key(remote), None)
+
+    def __analog_changed(self, analog, last_analog):
+        """
+        Returns whether the provided analog values changed more than their
+        thresholds with respect to the last notified ones.
+
+        Args:
+            analog (Dictionary): the analog values of the received sample.
+            last_analog (Dictionary): the analog values of the last notified sample.
+
+        Returns:
+            Boolean: ``True`` if any analog value changed enough or the lines are different, ``False``
+                otherwise.
+        """
+        if len(analog) != len(last_analog):
+            return True
+        for io_line, value in analog.items():
+            last_value = last_analog.get(io_line)
+            if last_value is None:
+                return True
+            deadband, percent = self.__line_thresholds.get(io_line, self.__default_thresholds)
+            change = abs(value - last_value)
+            if change > deadband and change * 100 > percent * abs(last_value):
+                return True
+        return False
+
+    @staticmethod
+    def __check_thresholds(deadband, percent):
+        """
+        Checks that the provided analog thresholds are valid.
+
+        Args:
+            deadband (Integer): the deadband, in ADC units.
+            percent (Float): the threshold, as a percentage.
+
+        Raises:
+            ValueError: if any of the thresholds is negative.
+        """
+        if deadband < 0 or percent < 0:
+            raise ValueError("Thresholds cannot be negative.")
+
+    def __get_checked(self):
+        """
+        Returns the number of IO samples checked by the filter.
+
+        Returns:
+            Integer: the number of IO samples checked.
+        """
+        return self.__checked
+
+    def __get_passed(self):
+        """
+        Returns the number of IO samples the filter let through.
+
+        Returns:
+            Integer: the number of IO samples notified.
+        """
+        return self.__passed
+
+    checked = property(__get_checked)
+    """Integer. Number of IO samples checked by the filter."""
+
+    passed = property(__get_passed)
+    """Integer. Number of IO samples the filter let through."""
@@ -67,9 +67,7 @@ class XBee16BitAddress(object):
         if len(address) > 2:
             raise ValueError("Address can't contain more than 2 bytes")
 
-        if len(address) == 1:
-            address.insert(0, 0)
-        self.__address = address
+        self.__address = bytearray(2 - len(address)) + bytearray(address)
 
     @classmethod
     def from_hex_string(cls, address):
@@ -236,12 +234,7 @@ class XBee64BitAddress(object):
         if len(address) > 8:
             raise ValueError("Address cannot contain more than 8 bytes")
 
-        self.__address = bytearray(8)
-        diff = 8 - len(address)
-        for i in range(diff):
-            self.__address[i] = 0
-        for i in range(diff, 8):
-            self.__address[i] = address[i - diff]
+        self.__address = bytearray(8 - len(address)) + bytearray(address)
 
     @classmethod
     def from_hex_string(cls, address):
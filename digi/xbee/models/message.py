@@ -7,22 +7,49 @@
 import re
 
 
+def _read_only_view(data):
+    """
+    Returns a read-only view of the given data.
+
+    :meth:`memoryview.toreadonly` only exists since Python 3.8. In older
+    versions the view is built over a copy of the data, so it cannot be used
+    to modify the message either.
+
+    Args:
+        data (Bytearray): the data to view.
+
+    Returns:
+        :class:`memoryview`: a read-only view of the data.
+    """
+    view = memoryview(data)
+    if hasattr(view, "toreadonly"):
+        return view.toreadonly()
+    return memoryview(bytes(data))
+
+
 class XBeeMessage(object):
     """
     This class represents a XBee message, which is formed by a :class:`.RemoteXBeeDevice`
     (the sender) and some data (the data sent) as a bytearray.
+
+    The timestamp of received messages is the :func:`time.monotonic_ns` value
+    when their frame was read from the serial port, so it can be compared with
+    other monotonic times to measure latencies.
     """
 
+    __slots__ = ("__data", "__remote_device", "__is_broadcast", "__timestamp")
+
     def __init__(self, data, remote_device, timestamp, broadcast=False):
         """
         Class  constructor.
 
         Args:
-            data (Bytearray): the data sent.
+            data (Bytearray): the data sent. It is not copied.
             remote_device (:class:`.RemoteXBeeDevice`): the sender.
             broadcast (Boolean, optional, default=``False``): flag indicating whether the  message is
                 broadcast (``True``) or not (``False``). Optional.
-            timestamp: instant of time when the message was received.
+            timestamp (Integer): instant of time when the message was received, in :func:`time.monotonic_ns`
+                nanoseconds.
         """
         self.__data = data
         self.__remote_device = remote_device
@@ -47,7 +74,7 @@ class XBeeMessage(object):
         """
         return self.__remote_device
 
-    def __is_broadcast(self):
+    def __get_broadcast(self):
         """
         Returns whether the message is broadcast or not.
 
@@ -56,13 +83,23 @@ class XBeeMessage(object):
         """
         return self.__is_broadcast
 
+    def __get_data_view(self):
+        """
+        Returns a read-only view of the data of the message, to slice or
+        parse it without copying it (from Python 3.8).
+
+        Returns:
+            :class:`memoryview`: a read-only view of the data of the message.
+        """
+        return _read_only_view(self.__data)
+
     def __get_timestamp(self):
         """
-        Returns the moment when the message was received as a ``time.clock()``
-        function returned value.
+        Returns the moment when the message was received.
 
         Returns:
-            Float: the returned value of using :meth:`time.clock()` function when the message was received.
+            Integer: the :func:`time.monotonic_ns` value when the frame of the message was read from the
+                serial port.
         """
         return self.__timestamp
 
@@ -78,14 +115,17 @@ class XBeeMessage(object):
     data = property(__get_data)
     """Bytearray. Bytearray containing the data of the message."""
 
+    data_view = property(__get_data_view)
+    """:class:`memoryview`. Read-only view of the data of the message."""
+
     remote_device = property(__get_remote_device)
     """:class:`.RemoteXBeeDevice`. The device that has sent the message."""
 
-    is_broadcast = property(__is_broadcast)
+    is_broadcast = property(__get_broadcast)
     """Boolean. ``True`` to indicate that the message is broadcast, ``False`` otherwise."""
     
     timestamp = property(__get_timestamp)
-    """Integer. Instant of time when the message was received."""
+    """Integer. Instant of time when the message was received, in :func:`time.monotonic_ns` nanoseconds."""
 
 
 class ExplicitXBeeMessage(XBeeMessage):
@@ -94,6 +134,8 @@ class ExplicitXBeeMessage(XBeeMessage):
     Source endpoint, destination endpoint, cluster ID, profile ID.
     """
 
+    __slots__ = ("__source_endpoint", "__dest_endpoint", "__cluster_id", "__profile_id")
+
     def __init__(self, data, remote_device, timestamp, source_endpoint,
                  dest_endpoint, cluster_id, profile_id, broadcast=False):
         """
@@ -102,7 +144,8 @@ class ExplicitXBeeMessage(XBeeMessage):
         Args:
             data (Bytearray): the data sent.
             remote_device (:class:`.RemoteXBeeDevice`): the sender device.
-            timestamp: instant of time when the message was received.
+            timestamp (Integer): instant of time when the message was received, in :func:`time.monotonic_ns`
+                nanoseconds.
             source_endpoint (Integer): source endpoint of the message. 1 byte.
             dest_endpoint (Integer): destination endpoint of the message. 1 byte.
             cluster_id (Integer): cluster id of the message. 2 bytes.
@@ -215,7 +258,9 @@ class IPMessage(object):
     ports, the IP protocol, and the content (data) of the message.
     """
 
-    def __init__(self, ip_addr, source_port, dest_port, protocol, data):
+    __slots__ = ("__ip_addr", "__source_port", "__dest_port", "__protocol", "__data", "__timestamp")
+
+    def __init__(self, ip_addr, source_port, dest_port, protocol, data, timestamp=None):
         """
         Class  constructor.
 
@@ -224,7 +269,9 @@ class IPMessage(object):
             source_port (Integer): TCP or UDP source port of the transmission.
             dest_port (Integer): TCP or UDP destination port of the transmission.
             protocol (:class:`.IPProtocol`): IP protocol used in the transmission.
-            data (Bytearray): the data sent.
+            data (Bytearray): the data sent. It is not copied.
+            timestamp (Integer, optional): instant of time when the message was received, in
+                :func:`time.monotonic_ns` nanoseconds. ``None`` if it is not a received message.
 
         Raises:
             ValueError: if ``ip_addr`` is ``None``.
@@ -250,6 +297,7 @@ class IPMessage(object):
         self.__dest_port = dest_port
         self.__protocol = protocol
         self.__data = data
+        self.__timestamp = timestamp
 
     def __get_ip_addr(self):
         """
@@ -296,6 +344,26 @@ class IPMessage(object):
         """
         return self.__data
 
+    def __get_data_view(self):
+        """
+        Returns a read-only view of the data of the message, to slice or
+        parse it without copying it (from Python 3.8).
+
+        Returns:
+            :class:`memoryview`: a read-only view of the data of the message.
+        """
+        return _read_only_view(self.__data)
+
+    def __get_timestamp(self):
+        """
+        Returns the moment when the message was received.
+
+        Returns:
+            Integer: the :func:`time.monotonic_ns` value when the frame of the message was read from the
+                serial port, ``None`` if it is not a received message.
+        """
+        return self.__timestamp
+
     def to_dict(self):
         """
         Returns the message information as a dictionary.
@@ -321,6 +389,12 @@ class IPMessage(object):
     data = property(__get_data)
     """Bytearray. Bytearray containing the data of the message."""
 
+    data_view = property(__get_data_view)
+    """:class:`memoryview`. Read-only view of the data of the message."""
+
+    timestamp = property(__get_timestamp)
+    """Integer. Instant of time when the message was received, in :func:`time.monotonic_ns` nanoseconds."""
+
 
 class SMSMessage(object):
     """
@@ -330,15 +404,19 @@ class SMSMessage(object):
     This class is used within the library to read SMS sent to Cellular devices.
     """
 
-    __PHONE_NUMBER_PATTERN = "^\+?\d+$"
+    __slots__ = ("__phone_number", "__data", "__timestamp")
 
-    def __init__(self, phone_number, data):
+    __PHONE_NUMBER_PATTERN = re.compile("^\+?\d+$")
+
+    def __init__(self, phone_number, data, timestamp=None):
         """
         Class  constructor. Instantiates a new :class:`.SMSMessage` object with the provided parameters.
 
         Args:
             phone_number (String): The phone number that sent the message.
             data (String): The message text.
+            timestamp (Integer, optional): instant of time when the message was received, in
+                :func:`time.monotonic_ns` nanoseconds. ``None`` if it is not a received message.
 
         Raises:
             ValueError: if ``phone_number`` is ``None``.
@@ -349,11 +427,12 @@ class SMSMessage(object):
             raise ValueError("Phone number cannot be None")
         if data is None:
             raise ValueError("Data cannot be None")
-        if not re.compile(SMSMessage.__PHONE_NUMBER_PATTERN).match(phone_number):
+        if not SMSMessage.__PHONE_NUMBER_PATTERN.match(phone_number):
             raise ValueError("Invalid phone number")
 
         self.__phone_number = phone_number
         self.__data = data
+        self.__timestamp = timestamp
 
     def __get_phone_number(self):
         """
@@ -373,6 +452,16 @@ class SMSMessage(object):
         """
         return self.__data
 
+    def __get_timestamp(self):
+        """
+        Returns the moment when the message was received.
+
+        Returns:
+            Integer: the :func:`time.monotonic_ns` value when the frame of the message was read from the
+                serial port, ``None`` if it is not a received message.
+        """
+        return self.__timestamp
+
     def to_dict(self):
         """
         Returns the message information as a dictionary.
@@ -385,3 +474,6 @@ class SMSMessage(object):
 
     data = property(__get_data)
     """String. The data of the message."""
+
+    timestamp = property(__get_timestamp)
+    """Integer. Instant of time when the message was received, in :func:`time.monotonic_ns` nanoseconds."""
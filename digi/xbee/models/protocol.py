@@ -248,6 +248,71 @@ XBeeProtocol.lookupTable = {x.code: x for x in XBeeProtocol}
 XBeeProtocol.__doc__ += utils.doc_enum(XBeeProtocol)
 
 
+@unique
+class Role(Enum):
+    """
+    Enumerates the available roles of an XBee device in its network.
+
+    | Inherited properties:
+    |     **name** (String): the name (id) of this Role.
+    |     **value** (String): the value of this Role.
+    """
+
+    COORDINATOR = (0, "Coordinator")
+    ROUTER = (1, "Router")
+    END_DEVICE = (2, "End device")
+    UNKNOWN = (3, "Unknown")
+
+    def __init__(self, code, description):
+        self.__code = code
+        self.__description = description
+
+    def __get_code(self):
+        """
+        Returns the code of the Role element.
+
+        Returns:
+            Integer: the code of the Role element.
+        """
+        return self.__code
+
+    def __get_description(self):
+        """
+        Returns the description of the Role element.
+
+        Returns:
+            String: the description of the Role element.
+        """
+        return self.__description
+
+    @classmethod
+    def get(cls, code):
+        """
+        Returns the Role for the given code.
+
+        Args:
+            code (Integer): code of the Role to get.
+
+        Returns:
+            :class:`.Role`: the Role for the given code, :attr:`.Role.UNKNOWN` if there is not any role with
+                the given code.
+        """
+        try:
+            return cls.lookupTable[code]
+        except KeyError:
+            return Role.UNKNOWN
+
+    code = property(__get_code)
+    """Integer. Role code."""
+
+    description = property(__get_description)
+    """String. Role description."""
+
+
+Role.lookupTable = {x.code: x for x in Role}
+Role.__doc__ += utils.doc_enum(Role)
+
+
 @unique
 class IPProtocol(Enum):
     """
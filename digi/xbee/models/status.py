@@ -769,3 +769,68 @@ class NetworkDiscoveryStatus(Enum):
 
 NetworkDiscoveryStatus.lookupTable = {x.code: x for x in NetworkDiscoveryStatus}
 NetworkDiscoveryStatus.__doc__ += utils.doc_enum(NetworkDiscoveryStatus)
+
+
+@unique
+class NodeIdentificationEvent(Enum):
+    """
+    Enumerates the different events that make a remote XBee device send a
+    Node Identification Indicator frame.
+
+    | Inherited properties:
+    |     **name** (String): the name (id) of this NodeIdentificationEvent.
+    |     **value** (String): the value of this NodeIdentificationEvent.
+    """
+    PUSHBUTTON = (0x01, "Node identification pushbutton event")
+    JOIN = (0x02, "Network join event (JN=1)")
+    POWER_CYCLE = (0x03, "Power cycle event (JN=1)")
+    UNKNOWN = (0xFF, "Unknown event")
+
+    def __init__(self, code, description):
+        self.__code = code
+        self.__description = description
+
+    def __get_code(self):
+        """
+        Returns the code of the ``NodeIdentificationEvent`` element.
+
+        Returns:
+            Integer: the code of the ``NodeIdentificationEvent`` element.
+        """
+        return self.__code
+
+    def __get_description(self):
+        """
+        Returns the description of the ``NodeIdentificationEvent`` element.
+
+        Returns:
+            String: the description of the ``NodeIdentificationEvent`` element.
+        """
+        return self.__description
+
+    @classmethod
+    def get(cls, code):
+        """
+        Returns the node identification event for the given code.
+
+        Args:
+            code (Integer): the code of the node identification event to get.
+
+        Returns:
+            :class:`.NodeIdentificationEvent`: the ``NodeIdentificationEvent`` with the given code,
+                :attr:`.NodeIdentificationEvent.UNKNOWN` if there is not any event with the provided code.
+        """
+        try:
+            return cls.lookupTable[code]
+        except KeyError:
+            return NodeIdentificationEvent.UNKNOWN
+
+    code = property(__get_code)
+    """Integer. The node identification event code."""
+
+    description = property(__get_description)
+    """String. The node identification event description."""
+
+
+NodeIdentificationEvent.lookupTable = {x.code: x for x in NodeIdentificationEvent}
+NodeIdentificationEvent.__doc__ += utils.doc_enum(NodeIdentificationEvent)
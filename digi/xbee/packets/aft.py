@@ -27,6 +27,7 @@ class ApiFrameType(Enum):
     REMOTE_AT_COMMAND_REQUEST = (0x17, "Remote AT Command Request")
     TX_SMS = (0x1F, "TX SMS")
     TX_IPV4 = (0x20, "TX IPv4")
+    CREATE_SOURCE_ROUTE = (0x21, "Create Source Route")
     SEND_DATA_REQUEST = (0x28, "Send Data Request")
     DEVICE_RESPONSE = (0x2A, "Device Response")
     RX_64 = (0x80, "RX (Receive) Packet 64-bit Address")
@@ -42,8 +43,11 @@ class ApiFrameType(Enum):
     RECEIVE_PACKET = (0x90, "Receive Packet")
     EXPLICIT_RX_INDICATOR = (0x91, "Explicit RX Indicator")
     IO_DATA_SAMPLE_RX_INDICATOR = (0x92, "IO Data Sample RX Indicator")
+    NODE_ID_INDICATOR = (0x95, "Node Identification Indicator")
     REMOTE_AT_COMMAND_RESPONSE = (0x97, "Remote Command Response")
     RX_SMS = (0x9F, "RX SMS")
+    ROUTE_RECORD_INDICATOR = (0xA1, "Route Record Indicator")
+    MANY_TO_ONE_ROUTE_REQUEST = (0xA3, "Many-to-One Route Request Indicator")
     RX_IPV4 = (0xB0, "RX IPv4")
     SEND_DATA_RESPONSE = (0xB8, "Send Data Response")
     DEVICE_REQUEST = (0xB9, "Device Request")
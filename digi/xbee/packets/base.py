@@ -5,11 +5,12 @@
 # Copyright (c) 2017 Digi International Inc. All Rights Reserved.
 
 from abc import ABCMeta, abstractmethod
+import re
+import struct
 from digi.xbee.packets.aft import ApiFrameType
 from digi.xbee.models.atcomm import SpecialByte
 from digi.xbee.models.mode import OperatingMode
 from digi.xbee.exception import InvalidPacketException, InvalidOperatingModeException
-from digi.xbee.util import utils
 from enum import Enum, unique
 
 
@@ -66,6 +67,17 @@ class DictKeys(Enum):
     PATH = "path"
     CONTENT_TYPE_LENGTH = "content_type_length"
     CONTENT_TYPE = "content_type"
+    REMOTE_X64BIT_ADDR = "remote_x64_addr"
+    REMOTE_X16BIT_ADDR = "remote_x16_addr"
+    PARENT_X16BIT_ADDR = "parent_x16_addr"
+    NODE_ID = "node_id"
+    DEVICE_TYPE = "device_type"
+    SOURCE_EVENT = "source_event"
+    MANUFACTURER_ID = "manufacturer_id"
+    DEVICE_TYPE_ID = "device_type_id"
+    NUM_OF_HOPS = "num_of_hops"
+    HOPS = "hops"
+    ROUTE_CMD_OPTIONS = "route_command_options"
 
 
 class XBeePacket:
@@ -81,6 +93,16 @@ class XBeePacket:
     __ESCAPE_BYTES = [i.value for i in SpecialByte]
     __ESCAPE_FACTOR = 0x20
     __ESCAPE_BYTE = SpecialByte.ESCAPE_BYTE.code
+    __HEADER_BYTE = SpecialByte.HEADER_BYTE.code
+
+    # Matches any of the bytes that must be escaped.
+    __ESCAPE_PATTERN = re.compile(b"[" + re.escape(bytes(__ESCAPE_BYTES)) + b"]")
+
+    # Matches the escape byte. Used to find it in buffers without find().
+    __UNESCAPE_PATTERN = re.compile(re.escape(bytes((__ESCAPE_BYTE,))))
+
+    # Start delimiter + length field.
+    __FRAME_HEADER = struct.Struct(">BH")
 
     def __init__(self):
         """
@@ -135,10 +157,19 @@ class XBeePacket:
         Returns:
             Bytearray: raw bytearray of the XBeePacket.
         """
-        frame = self.__build_complete_frame_without_header(self.get_frame_spec_data())
+        frame_spec_data = self.get_frame_spec_data()
+        length = len(frame_spec_data)
+        if length > 0xFFFF:
+            raise ValueError("The frame specific data length must be between 0 and 0xFFFF.")
+
+        # Start delimiter + length + frame specific data + checksum, built in
+        # a single buffer computing the frame specific data only once.
+        frame = bytearray(length + 4)
+        XBeePacket.__FRAME_HEADER.pack_into(frame, 0, XBeePacket.__HEADER_BYTE, length)
+        frame[3:-1] = frame_spec_data
+        frame[-1] = 0xFF - (sum(frame_spec_data) & 0xFF)
         if escaped:
-            frame = self._escape_data(frame)
-        frame.insert(0, SpecialByte.HEADER_BYTE.code)
+            return self._escape_data(memoryview(frame)[1:], bytearray((XBeePacket.__HEADER_BYTE,)))
         return frame
 
     def to_dict(self):
@@ -201,60 +232,100 @@ class XBeePacket:
         pass
 
     @staticmethod
-    def _escape_data(data):
+    def _escape_data(data, buffer=None):
         """
-        Escapes the bytearray 'data'.
+        Escapes the provided data.
+
+        The special bytes are located with a single scan of the data and the
+        runs of bytes between them are copied as slices.
 
         Args:
-            data (Bytearray): the bytearray to escape.
+            data (Bytearray, Bytes or memoryview): the data to escape.
+            buffer (Bytearray, optional): bytearray to append the escaped data to. If not provided, a new one is
+                created.
 
         Returns:
-            Bytearray: 'data' escaped.
-        """
-        esc_data = bytearray()
-        for i in data:
-            if i in XBeePacket.__ESCAPE_BYTES:
-                esc_data.append(SpecialByte.ESCAPE_BYTE.code)
-                esc_data.append(i ^ XBeePacket.__ESCAPE_FACTOR)
-            else:
-                esc_data.append(i)
-        return esc_data
+            Bytearray: ``buffer`` with the escaped data appended, or a new bytearray with ``data`` escaped.
+        """
+        if buffer is None:
+            buffer = bytearray()
+        match = XBeePacket.__ESCAPE_PATTERN.search(data)
+        if match is None:
+            buffer += data
+            return buffer
+        view = memoryview(data)
+        start = 0
+        while match is not None:
+            pos = match.start()
+            buffer += view[start:pos]
+            buffer.append(XBeePacket.__ESCAPE_BYTE)
+            buffer.append(view[pos] ^ XBeePacket.__ESCAPE_FACTOR)
+            start = pos + 1
+            match = XBeePacket.__ESCAPE_PATTERN.search(data, start)
+        buffer += view[start:]
+        return buffer
 
     @staticmethod
-    def _unescape_data(data):
+    def _unescape_data(data, buffer=None):
         """
-        Un-escapes the provided bytearray data.
+        Un-escapes the provided data.
+
+        The escape bytes are located with ``find`` (or with a single regular
+        expression scan for memoryviews, which have no ``find``, so they are
+        not copied) and the runs of bytes between them are copied as slices.
+        An escape byte at the end of the data is discarded.
 
         Args:
-            data (Bytearray): the bytearray to unescape.
+            data (Bytearray, Bytes or memoryview): the data to unescape.
+            buffer (Bytearray, optional): bytearray to append the unescaped data to. If not provided, a new one is
+                created.
 
         Returns:
-            Bytearray: ``data`` unescaped.
-        """
-        new_data = bytearray(0)
-        des_escape = False
-        for byte in data:
-            if byte == XBeePacket.__ESCAPE_BYTE:
-                des_escape = True
-            else:
-                new_data += chr(byte ^ 0x20 if des_escape else byte)
-                des_escape = False
-        return new_data
-
-    def __build_complete_frame_without_header(self, frame_spec_data):
-        """
-        Builds a complete non-escaped frame from the given frame specific data.
-        Complete frame is: Start delimiter + length + frame specific data + checksum.
-        
+            Bytearray: ``buffer`` with the unescaped data appended, or a new bytearray with ``data`` unescaped.
+        """
+        if buffer is None:
+            buffer = bytearray()
+        if isinstance(data, (bytes, bytearray)):
+            first = data.find(XBeePacket.__ESCAPE_BYTE)
+        else:
+            match = XBeePacket.__UNESCAPE_PATTERN.search(data)
+            first = -1 if match is None else match.start()
+        if first == -1:
+            buffer += data
+            return buffer
+        view = memoryview(data)
+        start = 0
+        for pos in XBeePacket.__find_escape_bytes(data, first):
+            # The byte after an escape byte is never an escape byte itself.
+            if pos < start:
+                continue
+            buffer += view[start:pos]
+            if pos + 1 < len(view):
+                buffer.append(view[pos + 1] ^ XBeePacket.__ESCAPE_FACTOR)
+            start = pos + 2
+        buffer += view[start:]
+        return buffer
+
+    @staticmethod
+    def __find_escape_bytes(data, first):
+        """
+        Yields the positions of the escape bytes of the provided data.
+
         Args:
-            frame_spec_data (Bytearray): the frame specific data.
-            
+            data (Bytearray, Bytes or memoryview): the data to search in.
+            first (Integer): the position of the first escape byte.
+
         Returns:
-            Bytearray: the complete frame as bytearray.
+            Generator: generator of the positions (Integer) of the escape bytes.
         """
-        frame = utils.int_to_length(len(frame_spec_data)) + frame_spec_data
-        frame.append(self.get_checksum())
-        return frame
+        if isinstance(data, (bytes, bytearray)):
+            pos = first
+            while pos != -1:
+                yield pos
+                pos = data.find(XBeePacket.__ESCAPE_BYTE, pos + 2)
+        else:
+            for match in XBeePacket.__UNESCAPE_PATTERN.finditer(data, first):
+                yield match.start()
 
 
 class XBeeAPIPacket(XBeePacket):
@@ -285,6 +356,7 @@ class XBeeAPIPacket(XBeePacket):
         super().__init__()
         self._frame_type = api_frame_type
         self._frame_id = 0
+        self._timestamp = None
 
     def get_frame_spec_data(self):
         """
@@ -293,10 +365,11 @@ class XBeeAPIPacket(XBeePacket):
         .. seealso::
            | :meth:`.XBeePacket.get_frame_spec_data`
         """
-        data = self._get_api_packet_spec_data()
         if self.needs_id():
-            data.insert(0, self._frame_id)
-        data.insert(0, self._frame_type.code)
+            data = bytearray((self._frame_type.code, self._frame_id))
+        else:
+            data = bytearray((self._frame_type.code,))
+        data += self._get_api_packet_spec_data()
         return data
 
     def get_frame_type(self):
@@ -354,6 +427,25 @@ class XBeeAPIPacket(XBeePacket):
             raise ValueError("Frame ID must be between 0 and 255.")
         self._frame_id = frame_id
 
+    def __get_timestamp(self):
+        """
+        Returns the moment when the packet was read from the serial port.
+
+        Returns:
+            Integer: the :func:`time.monotonic_ns` value when the packet was read, ``None`` if it has not been
+                received.
+        """
+        return self._timestamp
+
+    def __set_timestamp(self, timestamp):
+        """
+        Sets the moment when the packet was read from the serial port.
+
+        Args:
+            timestamp (Integer): the :func:`time.monotonic_ns` value when the packet was read.
+        """
+        self._timestamp = timestamp
+
     @staticmethod
     def _check_api_packet(raw, min_length=5):
         """
@@ -382,14 +474,14 @@ class XBeeAPIPacket(XBeePacket):
             raise InvalidPacketException("Bytearray must start with the header byte (SpecialByte.HEADER_BYTE.code)")
 
         # real frame specific data length
-        real_length = len(raw[3:-1])
+        real_length = len(raw) - 4
         # length is specified in the length field.
-        length_field = utils.length_to_int(raw[1:3])
+        length_field = (raw[1] << 8) + raw[2]
         if real_length != length_field:
             raise InvalidPacketException("The real length of this frame is distinct than the specified by length "
                                          "field (bytes 2 and 3)")
 
-        if 0xFF - (sum(raw[3:-1]) & 0xFF) != raw[-1]:
+        if 0xFF - (sum(memoryview(raw)[3:-1]) & 0xFF) != raw[-1]:
             raise InvalidPacketException("Wrong checksum")
 
     @abstractmethod
@@ -423,6 +515,10 @@ class XBeeAPIPacket(XBeePacket):
         pass
 
     frame_id = property(__get_frame_id, __set_frame_id)
+    """Integer. Frame ID of the packet."""
+
+    timestamp = property(__get_timestamp, __set_timestamp)
+    """Integer. :func:`time.monotonic_ns` value when the packet was read, ``None`` if it has not been received."""
 
 
 class GenericXBeePacket(XBeeAPIPacket):
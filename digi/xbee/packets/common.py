@@ -4,11 +4,16 @@
 #
 # Copyright (c) 2017 Digi International Inc. All Rights Reserved.
 
+import struct
+
+from digi.xbee.models.atcomm import SpecialByte
 from digi.xbee.models.mode import OperatingMode
 from digi.xbee.models.address import XBee16BitAddress, XBee64BitAddress
-from digi.xbee.models.status import ATCommandStatus, DiscoveryStatus, TransmitStatus, ModemStatus
+from digi.xbee.models.protocol import Role
+from digi.xbee.models.status import ATCommandStatus, DiscoveryStatus, TransmitStatus, ModemStatus, \
+    NodeIdentificationEvent
 from digi.xbee.packets.aft import ApiFrameType
-from digi.xbee.packets.base import XBeeAPIPacket, DictKeys
+from digi.xbee.packets.base import XBeePacket, XBeeAPIPacket, DictKeys
 from digi.xbee.util import utils
 from digi.xbee.exception import InvalidOperatingModeException, InvalidPacketException
 from digi.xbee.io import IOSample, IOLine
@@ -89,7 +94,7 @@ class ATCommPacket(XBeeAPIPacket):
         if raw[3] != ApiFrameType.AT_COMMAND.code:
             raise InvalidPacketException("This packet is not an AT command packet.")
 
-        return ATCommPacket(raw[4], str(raw[5:7]), raw[7:-1])
+        return ATCommPacket(raw[4], raw[5:7].decode(), raw[7:-1])
 
     def needs_id(self):
         """
@@ -272,7 +277,7 @@ class ATCommResponsePacket(XBeeAPIPacket):
         .. seealso::
            | :meth:`.XBeeAPIPacket._get_api_packet_spec_data`
         """
-        ret = bytearray(self.__command)
+        ret = bytearray(self.__command, "utf8")
         ret.append(self.__response_status.code)
         if self.__comm_value is not None:
             ret += self.__comm_value
@@ -386,6 +391,9 @@ class ReceivePacket(XBeeAPIPacket):
 
     __MIN_PACKET_LENGTH = 16
 
+    # 64-bit addr. + 16-bit addr. + receive options.
+    __API_HEADER = struct.Struct(">8s2sB")
+
     def __init__(self, x64bit_addr, x16bit_addr, receive_options, rf_data=None):
         """
         Class constructor. Instantiates a new :class:`.ReceivePacket` object with the provided parameters.
@@ -439,9 +447,10 @@ class ReceivePacket(XBeeAPIPacket):
 
         if raw[3] != ApiFrameType.RECEIVE_PACKET.code:
             raise InvalidPacketException("This packet is not a receive packet.")
-        return ReceivePacket(XBee64BitAddress(raw[4:12]),
-                             XBee16BitAddress(raw[12:14]),
-                             raw[14],
+        x64bit_addr, x16bit_addr, receive_options = ReceivePacket.__API_HEADER.unpack_from(raw, 4)
+        return ReceivePacket(XBee64BitAddress(x64bit_addr),
+                             XBee16BitAddress(x16bit_addr),
+                             receive_options,
                              raw[15:-1])
 
     def needs_id(self):
@@ -460,11 +469,11 @@ class ReceivePacket(XBeeAPIPacket):
         .. seealso::
            | :meth:`.XBeeAPIPacket._get_api_packet_spec_data`
         """
-        ret = self.__x64bit_addr.address
-        ret += self.__x16bit_addr.address
-        ret.append(self.__receive_options)
-        if self.__rf_data is not None:
-            return ret + self.__rf_data
+        rf_data = self.__rf_data if self.__rf_data is not None else b""
+        ret = bytearray(ReceivePacket.__API_HEADER.size + len(rf_data))
+        ReceivePacket.__API_HEADER.pack_into(ret, 0, self.__x64bit_addr.address, self.__x16bit_addr.address,
+                                             self.__receive_options)
+        ret[ReceivePacket.__API_HEADER.size:] = rf_data
         return ret
 
     def _get_api_packet_spec_data_dict(self):
@@ -608,6 +617,9 @@ class RemoteATCommandPacket(XBeeAPIPacket):
 
     __MIN_PACKET_LENGTH = 19
 
+    # 64-bit addr. + 16-bit addr. + transmit options + AT command.
+    __API_HEADER = struct.Struct(">8s2sB2s")
+
     def __init__(self, frame_id, x64bit_addr, x16bit_addr, transmit_options, command, parameter=None):
         """
         Class constructor. Instantiates a new :class:`.RemoteATCommandPacket` object with the provided parameters.
@@ -677,12 +689,13 @@ class RemoteATCommandPacket(XBeeAPIPacket):
         if raw[3] != ApiFrameType.REMOTE_AT_COMMAND_REQUEST.code:
             raise InvalidPacketException("This packet is not a remote AT command request packet.")
 
+        x64bit_addr, x16bit_addr, transmit_options, command = RemoteATCommandPacket.__API_HEADER.unpack_from(raw, 5)
         return RemoteATCommandPacket(
                 raw[4],
-                XBee64BitAddress(raw[5:12]),
-                XBee16BitAddress(raw[13:15]),
-                raw[15],
-                str(raw[16:18]),
+                XBee64BitAddress(x64bit_addr),
+                XBee16BitAddress(x16bit_addr),
+                transmit_options,
+                command.decode(),
                 raw[18:-1]
         )
 
@@ -702,11 +715,12 @@ class RemoteATCommandPacket(XBeeAPIPacket):
         .. seealso::
            | :meth:`.XBeeAPIPacket._get_api_packet_spec_data`
         """
-        ret = self.__x64bit_addr.address
-        ret += self.__x16bit_addr.address
-        ret.append(self.__transmit_options)
-        ret += bytearray(self.__command, 'utf8')
-        return ret if self.__parameter is None else ret + self.__parameter
+        parameter = self.__parameter if self.__parameter is not None else b""
+        ret = bytearray(RemoteATCommandPacket.__API_HEADER.size + len(parameter))
+        RemoteATCommandPacket.__API_HEADER.pack_into(ret, 0, self.__x64bit_addr.address, self.__x16bit_addr.address,
+                                                     self.__transmit_options, bytearray(self.__command, "utf8"))
+        ret[RemoteATCommandPacket.__API_HEADER.size:] = parameter
+        return ret
 
     def _get_api_packet_spec_data_dict(self):
         """
@@ -867,6 +881,9 @@ class RemoteATCommandResponsePacket(XBeeAPIPacket):
 
     __MIN_PACKET_LENGTH = 19
 
+    # 64-bit addr. + 16-bit addr. + AT command + command status.
+    __API_HEADER = struct.Struct(">8s2s2sB")
+
     def __init__(self, frame_id, x64bit_addr, x16bit_addr, command, response_status, comm_value=None):
         """
         Class constructor. Instantiates a new :class:`.RemoteATCommandResponsePacket` object with the provided
@@ -936,9 +953,10 @@ class RemoteATCommandResponsePacket(XBeeAPIPacket):
         if raw[3] != ApiFrameType.REMOTE_AT_COMMAND_RESPONSE.code:
             raise InvalidPacketException("This packet is not a remote AT command response packet.")
 
-        return RemoteATCommandResponsePacket(raw[4], XBee64BitAddress(raw[5:13]),
-                                             XBee16BitAddress(raw[13:15]), str(raw[15:17].decode()),
-                                             ATCommandStatus.get(raw[17]), raw[18:-1])
+        x64bit_addr, x16bit_addr, command, status = RemoteATCommandResponsePacket.__API_HEADER.unpack_from(raw, 5)
+        return RemoteATCommandResponsePacket(raw[4], XBee64BitAddress(x64bit_addr),
+                                             XBee16BitAddress(x16bit_addr), command.decode(),
+                                             ATCommandStatus.get(status), raw[18:-1])
 
     def needs_id(self):
         """
@@ -956,17 +974,18 @@ class RemoteATCommandResponsePacket(XBeeAPIPacket):
         .. seealso::
            | :meth:`.XBeeAPIPacket._get_api_packet_spec_data`
         """
-        ret = self.__x64bit_addr.address
-        ret += self.__x16bit_addr.address
-        ret += bytearray(self.__command)
-        ret.append(self.__response_status.code)
-        if self.__comm_value is not None:
-            ret += self.__comm_value
+        comm_value = self.__comm_value if self.__comm_value is not None else b""
+        ret = bytearray(RemoteATCommandResponsePacket.__API_HEADER.size + len(comm_value))
+        RemoteATCommandResponsePacket.__API_HEADER.pack_into(ret, 0, self.__x64bit_addr.address,
+                                                             self.__x16bit_addr.address,
+                                                             bytearray(self.__command, "utf8"),
+                                                             self.__response_status.code)
+        ret[RemoteATCommandResponsePacket.__API_HEADER.size:] = comm_value
         return ret
 
     def _get_api_packet_spec_data_dict(self):
-        return {DictKeys.X4BIT_ADDR:    self.__x64bit_addr.address,
-                DictKeys.X6BIT_ADDR:    self.__x16bit_addr.address,
+        return {DictKeys.X64BIT_ADDR:   self.__x64bit_addr.address,
+                DictKeys.X16BIT_ADDR:   self.__x16bit_addr.address,
                 DictKeys.COMMAND:       self.__command,
                 DictKeys.AT_CMD_STATUS: self.__response_status,
                 DictKeys.RF_DATA:       list(self.__comm_value) if self.__comm_value is not None else None}
@@ -1146,6 +1165,9 @@ class TransmitPacket(XBeeAPIPacket):
 
     __MIN_PACKET_LENGTH = 18
 
+    # 64-bit addr. + 16-bit addr. + broadcast radius + transmit options.
+    __API_HEADER = struct.Struct(">8s2sBB")
+
     def __init__(self, frame_id, x64bit_addr, x16bit_addr, broadcast_radius, transmit_options, rf_data=None):
         """
         Class constructor. Instantiates a new :class:`.TransmitPacket` object with the provided parameters.
@@ -1210,9 +1232,10 @@ class TransmitPacket(XBeeAPIPacket):
         if raw[3] != ApiFrameType.TRANSMIT_REQUEST.code:
             raise InvalidPacketException("This packet is not a transmit request packet.")
 
-        return TransmitPacket(raw[4], XBee64BitAddress(raw[5:13]),
-                              XBee16BitAddress(raw[13:15]), raw[15],
-                              raw[16], raw[17:-1])
+        x64bit_addr, x16bit_addr, broadcast_radius, transmit_options = TransmitPacket.__API_HEADER.unpack_from(raw, 5)
+        return TransmitPacket(raw[4], XBee64BitAddress(x64bit_addr),
+                              XBee16BitAddress(x16bit_addr), broadcast_radius,
+                              transmit_options, raw[17:-1])
 
     def needs_id(self):
         """
@@ -1230,12 +1253,11 @@ class TransmitPacket(XBeeAPIPacket):
         .. seealso::
            | :meth:`.XBeeAPIPacket._get_api_packet_spec_data`
         """
-        ret = self.__x64bit_addr.address
-        ret += self.__x16bit_addr.address
-        ret.append(self.__broadcast_radius)
-        ret.append(self.__transmit_options)
-        if self.__rf_data is not None:
-            return ret + self.__rf_data
+        rf_data = self.__rf_data if self.__rf_data is not None else b""
+        ret = bytearray(TransmitPacket.__API_HEADER.size + len(rf_data))
+        TransmitPacket.__API_HEADER.pack_into(ret, 0, self.__x64bit_addr.address, self.__x16bit_addr.address,
+                                              self.__broadcast_radius, self.__transmit_options)
+        ret[TransmitPacket.__API_HEADER.size:] = rf_data
         return ret
 
     def _get_api_packet_spec_data_dict(self):
@@ -1245,8 +1267,8 @@ class TransmitPacket(XBeeAPIPacket):
         .. seealso::
            | :meth:`.XBeeAPIPacket._get_api_packet_spec_data_dict`
         """
-        return {DictKeys.X4BIT_ADDR:       self.__x64bit_addr.address,
-                DictKeys.X6BIT_ADDR:       self.__x16bit_addr.address,
+        return {DictKeys.X64BIT_ADDR:      self.__x64bit_addr.address,
+                DictKeys.X16BIT_ADDR:      self.__x16bit_addr.address,
                 DictKeys.BROADCAST_RADIUS: self.__broadcast_radius,
                 DictKeys.TRANSMIT_OPTIONS: self.__transmit_options,
                 DictKeys.RF_DATA:          list(self.__rf_data) if self.__rf_data is not None else None}
@@ -1397,6 +1419,9 @@ class TransmitStatusPacket(XBeeAPIPacket):
 
     __MIN_PACKET_LENGTH = 11
 
+    # 16-bit addr. + transmit retry count + delivery status + discovery status.
+    __API_DATA = struct.Struct(">2sBBB")
+
     def __init__(self, frame_id, x16bit_addr, transmit_retry_count, transmit_status=TransmitStatus.SUCCESS,
                  discovery_status=DiscoveryStatus.NO_DISCOVERY_OVERHEAD):
         """
@@ -1462,8 +1487,10 @@ class TransmitStatusPacket(XBeeAPIPacket):
         if raw[3] != ApiFrameType.TRANSMIT_STATUS.code:
             raise InvalidPacketException("This packet is not a transmit status packet.")
 
-        return TransmitStatusPacket(raw[4], XBee16BitAddress(raw[5:7]), raw[7],
-                                    TransmitStatus.get(raw[8]), DiscoveryStatus.get(raw[9]))
+        x16bit_addr, retry_count, transmit_status, discovery_status = \
+            TransmitStatusPacket.__API_DATA.unpack_from(raw, 5)
+        return TransmitStatusPacket(raw[4], XBee16BitAddress(x16bit_addr), retry_count,
+                                    TransmitStatus.get(transmit_status), DiscoveryStatus.get(discovery_status))
 
     def needs_id(self):
         """
@@ -1481,11 +1508,9 @@ class TransmitStatusPacket(XBeeAPIPacket):
         .. seealso::
            | :meth:`.XBeeAPIPacket._get_api_packet_spec_data`
         """
-        ret = self.__x16bit_addr.address
-        ret.append(self.__transmit_retry_count)
-        ret.append(self.__transmit_status.code)
-        ret.append(self.__discovery_status.code)
-        return ret
+        return bytearray(TransmitStatusPacket.__API_DATA.pack(self.__x16bit_addr.address, self.__transmit_retry_count,
+                                                              self.__transmit_status.code,
+                                                              self.__discovery_status.code))
 
     def _get_api_packet_spec_data_dict(self):
         """
@@ -1819,7 +1844,7 @@ class IODataSampleRxIndicatorPacket(XBeeAPIPacket):
         """
         ret = self.__x64bit_addr.address
         ret += self.__x16bit_addr.address
-        ret.append(self.__receive_options.code)
+        ret.append(self.__receive_options)
         if self.__rf_data is not None:
             ret += self.__rf_data
         return ret
@@ -2065,6 +2090,10 @@ class ExplicitAddressingPacket(XBeeAPIPacket):
 
     __MIN_PACKET_LENGTH = 24
 
+    # 64-bit addr. + 16-bit addr. + source endpoint + destination endpoint +
+    # cluster ID + profile ID + broadcast radius + transmit options.
+    __API_HEADER = struct.Struct(">8s2sBBHHBB")
+
     def __init__(self, frame_id, x64bit_addr, x16bit_addr, source_endpoint, dest_endpoint, cluster_id,
                  profile_id, broadcast_radius=0x00, transmit_options=0x00, rf_data=None):
         """
@@ -2148,9 +2177,11 @@ class ExplicitAddressingPacket(XBeeAPIPacket):
         if raw[3] != ApiFrameType.EXPLICIT_ADDRESSING.code:
             raise InvalidPacketException("This packet is not an explicit addressing packet")
 
-        return ExplicitAddressingPacket(raw[4], XBee64BitAddress(raw[5:13]), XBee16BitAddress(raw[13:15]),
-                                        raw[15], raw[16], utils.bytes_to_int(raw[17:19]),
-                                        utils.bytes_to_int(raw[19:21]), raw[21], raw[22], raw[23:-1])
+        (x64bit_addr, x16bit_addr, source_endpoint, dest_endpoint, cluster_id, profile_id,
+         broadcast_radius, transmit_options) = ExplicitAddressingPacket.__API_HEADER.unpack_from(raw, 5)
+        return ExplicitAddressingPacket(raw[4], XBee64BitAddress(x64bit_addr), XBee16BitAddress(x16bit_addr),
+                                        source_endpoint, dest_endpoint, cluster_id,
+                                        profile_id, broadcast_radius, transmit_options, raw[23:-1])
 
     def needs_id(self):
         """
@@ -2168,16 +2199,13 @@ class ExplicitAddressingPacket(XBeeAPIPacket):
         .. seealso::
            | :meth:`.XBeeAPIPacket._get_api_packet_spec_data`
         """
-        raw = self.__x64_addr.address
-        raw += self.__x16_addr.address
-        raw.append(self.__source_endpoint)
-        raw.append(self.__dest_endpoint)
-        raw += utils.int_to_bytes(self.__cluster_id, 2)
-        raw += utils.int_to_bytes(self.__profile_id, 2)
-        raw.append(self.__broadcast_radius)
-        raw.append(self.__transmit_options)
-        if self.__rf_data is not None:
-            raw += self.__rf_data
+        rf_data = self.__rf_data if self.__rf_data is not None else b""
+        raw = bytearray(ExplicitAddressingPacket.__API_HEADER.size + len(rf_data))
+        ExplicitAddressingPacket.__API_HEADER.pack_into(raw, 0, self.__x64_addr.address, self.__x16_addr.address,
+                                                        self.__source_endpoint, self.__dest_endpoint,
+                                                        self.__cluster_id, self.__profile_id,
+                                                        self.__broadcast_radius, self.__transmit_options)
+        raw[ExplicitAddressingPacket.__API_HEADER.size:] = rf_data
         return raw
 
     def _get_api_packet_spec_data_dict(self):
@@ -2433,6 +2461,10 @@ class ExplicitRXIndicatorPacket(XBeeAPIPacket):
 
     __MIN_PACKET_LENGTH = 22
 
+    # 64-bit addr. + 16-bit addr. + source endpoint + destination endpoint +
+    # cluster ID + profile ID + receive options.
+    __API_HEADER = struct.Struct(">8s2sBBHHB")
+
     def __init__(self, x64bit_addr, x16bit_addr, source_endpoint,
                  dest_endpoint, cluster_id, profile_id, receive_options, rf_data=None):
         """
@@ -2509,9 +2541,11 @@ class ExplicitRXIndicatorPacket(XBeeAPIPacket):
         if raw[3] != ApiFrameType.EXPLICIT_RX_INDICATOR.code:
             raise InvalidPacketException("This packet is not an explicit RX indicator packet.")
 
-        return ExplicitRXIndicatorPacket(XBee64BitAddress(raw[4:12]), XBee16BitAddress(raw[12:14]), raw[14], raw[15],
-                                         utils.bytes_to_int(raw[16:18]), utils.bytes_to_int(raw[18:20]),
-                                         raw[20], raw[21:-1])
+        (x64bit_addr, x16bit_addr, source_endpoint, dest_endpoint, cluster_id, profile_id,
+         receive_options) = ExplicitRXIndicatorPacket.__API_HEADER.unpack_from(raw, 4)
+        return ExplicitRXIndicatorPacket(XBee64BitAddress(x64bit_addr), XBee16BitAddress(x16bit_addr),
+                                         source_endpoint, dest_endpoint, cluster_id, profile_id,
+                                         receive_options, raw[21:-1])
 
     def needs_id(self):
         """
@@ -2529,15 +2563,13 @@ class ExplicitRXIndicatorPacket(XBeeAPIPacket):
         .. seealso::
            | :meth:`.XBeeAPIPacket._get_api_packet_spec_data`
         """
-        raw = self.__x64bit_addr.address
-        raw += self.__x16bit_addr.address
-        raw.append(self.__source_endpoint)
-        raw.append(self.__dest_endpoint)
-        raw += utils.int_to_bytes(self.__cluster_id)
-        raw += utils.int_to_bytes(self.__profile_id)
-        raw.append(self.__receive_options)
-        if self.__rf_data is not None:
-            raw += self.__rf_data
+        rf_data = self.__rf_data if self.__rf_data is not None else b""
+        raw = bytearray(ExplicitRXIndicatorPacket.__API_HEADER.size + len(rf_data))
+        ExplicitRXIndicatorPacket.__API_HEADER.pack_into(raw, 0, self.__x64bit_addr.address,
+                                                         self.__x16bit_addr.address, self.__source_endpoint,
+                                                         self.__dest_endpoint, self.__cluster_id,
+                                                         self.__profile_id, self.__receive_options)
+        raw[ExplicitRXIndicatorPacket.__API_HEADER.size:] = rf_data
         return raw
 
     def _get_api_packet_spec_data_dict(self):
@@ -2746,3 +2778,715 @@ class ExplicitRXIndicatorPacket(XBeeAPIPacket):
 
     rf_data = property(__get_rf_data, __set_rf_data)
     """Bytearray. Received RF data."""
+
+
+class NodeIdentificationIndicatorPacket(XBeeAPIPacket):
+    """
+    This class represents a Node Identification Indicator packet. Packet is
+    built using the parameters of the constructor or providing a valid API
+    payload.
+
+    This frame is received when a remote device transmits a node
+    identification message to identify itself: when the commissioning
+    pushbutton is pressed or, if join notification is enabled (``JN=1``),
+    when the device joins the network or is power cycled.
+
+    The data portion of this frame is similar to a network discovery
+    response. The device type identifier and the RSSI are only present if
+    they are enabled in the ``NO`` (network discovery options) parameter.
+
+    .. seealso::
+       | :class:`.NodeIdentificationEvent`
+       | :class:`.Role`
+       | :class:`.XBeeAPIPacket`
+    """
+
+    __MIN_PACKET_LENGTH = 35
+
+    def __init__(self, x64bit_addr, x16bit_addr, receive_options, x16bit_remote_addr, x64bit_remote_addr,
+                 node_id, x16bit_parent_addr, device_type, source_event, profile_id, manufacturer_id,
+                 device_type_id=None, rssi=None):
+        """
+        Class constructor. Instantiates a new :class:`.NodeIdentificationIndicatorPacket` object with the
+        provided parameters.
+
+        Args:
+            x64bit_addr (:class:`.XBee64BitAddress`): the 64-bit address of the sender.
+            x16bit_addr (:class:`.XBee16BitAddress`): the 16-bit address of the sender.
+            receive_options (Integer): bitfield indicating the receive options.
+            x16bit_remote_addr (:class:`.XBee16BitAddress`): the 16-bit address of the identified device.
+            x64bit_remote_addr (:class:`.XBee64BitAddress`): the 64-bit address of the identified device.
+            node_id (String): the node identifier of the identified device.
+            x16bit_parent_addr (:class:`.XBee16BitAddress`): the 16-bit address of the parent of the identified
+                device, :attr:`.XBee16BitAddress.UNKNOWN_ADDRESS` if it has no parent.
+            device_type (:class:`.Role`): the role of the identified device in the network.
+            source_event (:class:`.NodeIdentificationEvent`): the event that caused the identification.
+            profile_id (Integer): Digi profile ID. Must be between 0 and 0xFFFF.
+            manufacturer_id (Integer): Digi manufacturer ID. Must be between 0 and 0xFFFF.
+            device_type_id (Integer, optional): the device type identifier (``DD``). Optional.
+            rssi (Integer, optional): RSSI of the last hop. Optional.
+
+        Raises:
+            ValueError: if ``profile_id`` or ``manufacturer_id`` are less than 0 or greater than 0xFFFF.
+
+        .. seealso::
+           | :class:`.NodeIdentificationEvent`
+           | :class:`.Role`
+           | :class:`.XBee16BitAddress`
+           | :class:`.XBee64BitAddress`
+           | :class:`.XBeeAPIPacket`
+        """
+        if profile_id < 0 or profile_id > 0xFFFF:
+            raise ValueError("Profile id must be between 0 and 0xFFFF.")
+        if manufacturer_id < 0 or manufacturer_id > 0xFFFF:
+            raise ValueError("Manufacturer id must be between 0 and 0xFFFF.")
+
+        super().__init__(ApiFrameType.NODE_ID_INDICATOR)
+        self.__x64bit_addr = x64bit_addr
+        self.__x16bit_addr = x16bit_addr
+        self.__receive_options = receive_options
+        self.__x16bit_remote_addr = x16bit_remote_addr
+        self.__x64bit_remote_addr = x64bit_remote_addr
+        self.__node_id = node_id
+        self.__x16bit_parent_addr = x16bit_parent_addr
+        self.__device_type = device_type
+        self.__source_event = source_event
+        self.__profile_id = profile_id
+        self.__manufacturer_id = manufacturer_id
+        self.__device_type_id = device_type_id
+        self.__rssi = rssi
+
+    @staticmethod
+    def create_packet(raw, operating_mode):
+        """
+        Override method.
+
+        Returns:
+            :class:`.NodeIdentificationIndicatorPacket`.
+
+        Raises:
+            InvalidPacketException: if the bytearray length is less than 35. (start delim. + length (2 bytes) + frame
+                type + 64bit addr. + 16bit addr. + receive options + remote 16bit addr. + remote 64bit addr. +
+                node ID terminator + parent 16bit addr. + device type + source event + profile ID (2 bytes) +
+                manufacturer ID (2 bytes) + checksum = 35 bytes).
+            InvalidPacketException: if the length field of 'raw' is different than its real length. (length field: bytes
+                2 and 3)
+            InvalidPacketException: if the first byte of 'raw' is not the header byte. See :class:`.SpecialByte`.
+            InvalidPacketException: if the calculated checksum is different than the checksum field value (last byte).
+            InvalidPacketException: if operating_mode mode is not supported.
+            InvalidPacketException: if the frame type is different than :attr:`.ApiFrameType.NODE_ID_INDICATOR`.
+            InvalidPacketException: if the node identifier is not terminated or the frame is truncated after it.
+
+        .. seealso::
+           | :meth:`.XBeePacket.create_packet`
+           | :meth:`.XBeeAPIPacket._check_api_packet`
+        """
+        if operating_mode != OperatingMode.ESCAPED_API_MODE and operating_mode != OperatingMode.API_MODE:
+            raise InvalidOperatingModeException(operating_mode.name + " is not supported.")
+
+        raw = XBeeAPIPacket._unescape_data(raw) if operating_mode == OperatingMode.ESCAPED_API_MODE else raw
+        XBeeAPIPacket._check_api_packet(raw, min_length=NodeIdentificationIndicatorPacket.__MIN_PACKET_LENGTH)
+
+        if raw[3] != ApiFrameType.NODE_ID_INDICATOR.code:
+            raise InvalidPacketException("This packet is not a node identification indicator packet.")
+
+        # Node identifier starts at byte 25 and goes to the next 0x00.
+        end = raw.find(0x00, 25, len(raw) - 1)
+        if end == -1 or len(raw) - 1 < end + 9:
+            raise InvalidPacketException("Node identification indicator packet is not complete.")
+
+        # Remaining bytes are the optional device type identifier and RSSI.
+        extra = raw[end + 9:-1]
+        device_type_id = utils.bytes_to_int(extra[0:4]) if len(extra) >= 4 else None
+        rssi = extra[-1] if len(extra) in (1, 5) else None
+
+        return NodeIdentificationIndicatorPacket(XBee64BitAddress(raw[4:12]), XBee16BitAddress(raw[12:14]),
+                                                 raw[14], XBee16BitAddress(raw[15:17]),
+                                                 XBee64BitAddress(raw[17:25]), raw[25:end].decode(),
+                                                 XBee16BitAddress(raw[end + 1:end + 3]), Role.get(raw[end + 3]),
+                                                 NodeIdentificationEvent.get(raw[end + 4]),
+                                                 utils.bytes_to_int(raw[end + 5:end + 7]),
+                                                 utils.bytes_to_int(raw[end + 7:end + 9]),
+                                                 device_type_id, rssi)
+
+    def needs_id(self):
+        """
+        Override method.
+
+        .. seealso::
+           | :meth:`.XBeeAPIPacket.needs_id`
+        """
+        return False
+
+    def _get_api_packet_spec_data(self):
+        """
+        Override method.
+
+        .. seealso::
+           | :meth:`.XBeeAPIPacket._get_api_packet_spec_data`
+        """
+        ret = self.__x64bit_addr.address
+        ret += self.__x16bit_addr.address
+        ret.append(self.__receive_options)
+        ret += self.__x16bit_remote_addr.address
+        ret += self.__x64bit_remote_addr.address
+        ret += bytearray(self.__node_id, "utf8")
+        ret.append(0x00)
+        ret += self.__x16bit_parent_addr.address
+        ret.append(self.__device_type.code)
+        ret.append(self.__source_event.code)
+        ret += utils.int_to_bytes(self.__profile_id, num_bytes=2)
+        ret += utils.int_to_bytes(self.__manufacturer_id, num_bytes=2)
+        if self.__device_type_id is not None:
+            ret += utils.int_to_bytes(self.__device_type_id, num_bytes=4)
+        if self.__rssi is not None:
+            ret.append(self.__rssi)
+        return ret
+
+    def _get_api_packet_spec_data_dict(self):
+        """
+        Override method.
+
+        .. seealso::
+           | :meth:`.XBeeAPIPacket._get_api_packet_spec_data_dict`
+        """
+        return {DictKeys.X64BIT_ADDR:        self.__x64bit_addr.address,
+                DictKeys.X16BIT_ADDR:        self.__x16bit_addr.address,
+                DictKeys.RECEIVE_OPTIONS:    self.__receive_options,
+                DictKeys.REMOTE_X16BIT_ADDR: self.__x16bit_remote_addr.address,
+                DictKeys.REMOTE_X64BIT_ADDR: self.__x64bit_remote_addr.address,
+                DictKeys.NODE_ID:            self.__node_id,
+                DictKeys.PARENT_X16BIT_ADDR: self.__x16bit_parent_addr.address,
+                DictKeys.DEVICE_TYPE:        self.__device_type,
+                DictKeys.SOURCE_EVENT:       self.__source_event,
+                DictKeys.PROFILE_ID:         self.__profile_id,
+                DictKeys.MANUFACTURER_ID:    self.__manufacturer_id,
+                DictKeys.DEVICE_TYPE_ID:     self.__device_type_id,
+                DictKeys.RSSI:               self.__rssi}
+
+    def __get_64bit_addr(self):
+        """
+        Returns the 64-bit address of the sender.
+
+        Returns:
+            :class:`.XBee64BitAddress`: the 64-bit address of the sender.
+
+        .. seealso::
+           | :class:`.XBee64BitAddress`
+        """
+        return self.__x64bit_addr
+
+    def __get_16bit_addr(self):
+        """
+        Returns the 16-bit address of the sender.
+
+        Returns:
+            :class:`.XBee16BitAddress`: the 16-bit address of the sender.
+
+        .. seealso::
+           | :class:`.XBee16BitAddress`
+        """
+        return self.__x16bit_addr
+
+    def __get_options(self):
+        """
+        Returns the receive options bitfield.
+
+        Returns:
+            Integer: the receive options bitfield.
+
+        .. seealso::
+           | :class:`.ReceiveOptions`
+        """
+        return self.__receive_options
+
+    def __get_16bit_remote_addr(self):
+        """
+        Returns the 16-bit address of the identified device.
+
+        Returns:
+            :class:`.XBee16BitAddress`: the 16-bit address of the identified device.
+
+        .. seealso::
+           | :class:`.XBee16BitAddress`
+        """
+        return self.__x16bit_remote_addr
+
+    def __get_64bit_remote_addr(self):
+        """
+        Returns the 64-bit address of the identified device.
+
+        Returns:
+            :class:`.XBee64BitAddress`: the 64-bit address of the identified device.
+
+        .. seealso::
+           | :class:`.XBee64BitAddress`
+        """
+        return self.__x64bit_remote_addr
+
+    def __get_node_id(self):
+        """
+        Returns the node identifier of the identified device.
+
+        Returns:
+            String: the node identifier of the identified device.
+        """
+        return self.__node_id
+
+    def __get_16bit_parent_addr(self):
+        """
+        Returns the 16-bit address of the parent of the identified device.
+
+        Returns:
+            :class:`.XBee16BitAddress`: the 16-bit parent address, :attr:`.XBee16BitAddress.UNKNOWN_ADDRESS`
+                if the identified device has no parent.
+
+        .. seealso::
+           | :class:`.XBee16BitAddress`
+        """
+        return self.__x16bit_parent_addr
+
+    def __get_device_type(self):
+        """
+        Returns the role of the identified device in the network.
+
+        Returns:
+            :class:`.Role`: the role of the identified device.
+
+        .. seealso::
+           | :class:`.Role`
+        """
+        return self.__device_type
+
+    def __get_source_event(self):
+        """
+        Returns the event that caused the identification.
+
+        Returns:
+            :class:`.NodeIdentificationEvent`: the source event.
+
+        .. seealso::
+           | :class:`.NodeIdentificationEvent`
+        """
+        return self.__source_event
+
+    def __get_profile_id(self):
+        """
+        Returns the Digi profile ID of the identified device.
+
+        Returns:
+            Integer: the Digi profile ID.
+        """
+        return self.__profile_id
+
+    def __get_manufacturer_id(self):
+        """
+        Returns the Digi manufacturer ID of the identified device.
+
+        Returns:
+            Integer: the Digi manufacturer ID.
+        """
+        return self.__manufacturer_id
+
+    def __get_device_type_id(self):
+        """
+        Returns the device type identifier (``DD``) of the identified device.
+
+        Returns:
+            Integer: the device type identifier, ``None`` if it was not included in the frame.
+        """
+        return self.__device_type_id
+
+    def __get_rssi(self):
+        """
+        Returns the RSSI of the last hop.
+
+        Returns:
+            Integer: the RSSI of the last hop, ``None`` if it was not included in the frame.
+        """
+        return self.__rssi
+
+    x64bit_source_addr = property(__get_64bit_addr)
+    """:class:`.XBee64BitAddress`. 64-bit address of the sender."""
+
+    x16bit_source_addr = property(__get_16bit_addr)
+    """:class:`.XBee16BitAddress`. 16-bit address of the sender."""
+
+    receive_options = property(__get_options)
+    """Integer. Receive options bitfield."""
+
+    x16bit_remote_addr = property(__get_16bit_remote_addr)
+    """:class:`.XBee16BitAddress`. 16-bit address of the identified device."""
+
+    x64bit_remote_addr = property(__get_64bit_remote_addr)
+    """:class:`.XBee64BitAddress`. 64-bit address of the identified device."""
+
+    node_id = property(__get_node_id)
+    """String. Node identifier of the identified device."""
+
+    x16bit_parent_addr = property(__get_16bit_parent_addr)
+    """:class:`.XBee16BitAddress`. 16-bit address of the parent of the identified device."""
+
+    device_type = property(__get_device_type)
+    """:class:`.Role`. Role of the identified device."""
+
+    source_event = property(__get_source_event)
+    """:class:`.NodeIdentificationEvent`. Event that caused the identification."""
+
+    profile_id = property(__get_profile_id)
+    """Integer. Digi profile ID."""
+
+    manufacturer_id = property(__get_manufacturer_id)
+    """Integer. Digi manufacturer ID."""
+
+    device_type_id = property(__get_device_type_id)
+    """Integer. Device type identifier, ``None`` if not included."""
+
+    rssi = property(__get_rssi)
+    """Integer. RSSI of the last hop, ``None`` if not included."""
+
+
+class TransmitTemplate(object):
+    """
+    This class represents a reusable template to send data to the same
+    destination with the same options.
+
+    The template encodes once the part of the frame that does not change
+    between transmissions (destination addresses, options and, for explicit
+    transmissions, endpoints, cluster ID and profile ID) and its partial
+    checksum. Every frame built from the template only adds the frame ID and
+    the payload, so its cost is proportional to the payload.
+
+    If endpoints, cluster ID and profile ID are provided, the template builds
+    explicit addressing frames, otherwise it builds transmit request frames.
+
+    .. seealso::
+       | :class:`.ExplicitAddressingPacket`
+       | :class:`.PreparedTransmitPacket`
+       | :class:`.TransmitPacket`
+    """
+
+    def __init__(self, x64bit_addr, x16bit_addr, broadcast_radius=0, transmit_options=0,
+                 src_endpoint=None, dest_endpoint=None, cluster_id=None, profile_id=None):
+        """
+        Class constructor. Instantiates a new :class:`.TransmitTemplate` object with the provided parameters.
+
+        Args:
+            x64bit_addr (:class:`.XBee64BitAddress`): the 64-bit destination address.
+            x16bit_addr (:class:`.XBee16BitAddress`): the 16-bit destination address.
+            broadcast_radius (Integer, optional, default=0): maximum number of hops a broadcast transmission can
+                occur.
+            transmit_options (Integer, optional, default=0): bitfield of supported transmission options.
+            src_endpoint (Integer, optional): source endpoint of the explicit transmissions.
+            dest_endpoint (Integer, optional): destination endpoint of the explicit transmissions.
+            cluster_id (Integer, optional): cluster ID of the explicit transmissions.
+            profile_id (Integer, optional): profile ID of the explicit transmissions.
+
+        Raises:
+            ValueError: if only some of ``src_endpoint``, ``dest_endpoint``, ``cluster_id`` and ``profile_id`` are
+                provided.
+            All exceptions raised by :meth:`.TransmitPacket.__init__` or :meth:`.ExplicitAddressingPacket.__init__`.
+
+        .. seealso::
+           | :class:`.TransmitOptions`
+           | :class:`.XBee16BitAddress`
+           | :class:`.XBee64BitAddress`
+        """
+        explicit_params = (src_endpoint, dest_endpoint, cluster_id, profile_id)
+        if any(x is None for x in explicit_params) and any(x is not None for x in explicit_params):
+            raise ValueError("Source and destination endpoints, cluster ID and profile ID must be all provided "
+                             "or none of them.")
+
+        self.__x64bit_addr = x64bit_addr
+        self.__broadcast_radius = broadcast_radius
+        self.__transmit_options = transmit_options
+        self.__src_endpoint = src_endpoint
+        self.__dest_endpoint = dest_endpoint
+        self.__cluster_id = cluster_id
+        self.__profile_id = profile_id
+        self.__explicit = src_endpoint is not None
+        self.__packet = None
+        self.__header = None
+        self.__set_16bit_addr(x16bit_addr)
+
+    def __encode(self, x16bit_addr):
+        """
+        Encodes the fixed part of the frames built from this template.
+
+        Args:
+            x16bit_addr (:class:`.XBee16BitAddress`): the 16-bit destination address.
+        """
+        if self.__explicit:
+            packet = ExplicitAddressingPacket(0, self.__x64bit_addr, x16bit_addr, self.__src_endpoint,
+                                              self.__dest_endpoint, self.__cluster_id, self.__profile_id,
+                                              self.__broadcast_radius, self.__transmit_options)
+        else:
+            packet = TransmitPacket(0, self.__x64bit_addr, x16bit_addr, self.__broadcast_radius,
+                                    self.__transmit_options)
+        # Start delimiter + length (patched on each frame) + frame type + frame ID (patched on each frame) + fixed
+        # fields. The frame ID is 0, so the partial checksum does not include it.
+        header = bytearray((SpecialByte.HEADER_BYTE.code, 0, 0))
+        header += packet.get_frame_spec_data()
+        # Replace both at once, frames may be being built in other threads.
+        self.__packet, self.__header = packet, (header, sum(header[3:]))
+
+    def build_packet(self, frame_id, rf_data):
+        """
+        Returns a packet to send the provided data with this template.
+
+        Args:
+            frame_id (Integer): the frame ID of the packet.
+            rf_data (Bytearray): the RF data to send.
+
+        Returns:
+            :class:`.PreparedTransmitPacket`: the packet to send.
+
+        Raises:
+            ValueError: if ``frame_id`` is less than 0 or greater than 255.
+        """
+        return PreparedTransmitPacket(self, frame_id, rf_data)
+
+    def _build_frame(self, frame_id, rf_data, escaped=False):
+        """
+        Returns the raw frame to send the provided data with this template,
+        copying the encoded part and patching only the length, the frame ID,
+        the payload and the checksum.
+
+        This is only for internal use.
+
+        Args:
+            frame_id (Integer): the frame ID of the frame.
+            rf_data (Bytearray): the RF data to send.
+            escaped (Boolean, optional, default=``False``): ``True`` to escape the frame.
+
+        Returns:
+            Bytearray: the raw frame, ready to be sent by the serial port.
+
+        Raises:
+            ValueError: if the frame is too long.
+        """
+        header, partial_checksum = self.__header
+        header_len = len(header)
+        length = header_len - 3 + len(rf_data)
+        if length > 0xFFFF:
+            raise ValueError("The frame specific data length must be between 0 and 0xFFFF.")
+
+        frame = bytearray(header_len + len(rf_data) + 1)
+        frame[:header_len] = header
+        frame[1] = length >> 8
+        frame[2] = length & 0xFF
+        frame[4] = frame_id
+        frame[header_len:-1] = rf_data
+        frame[-1] = 0xFF - ((partial_checksum + frame_id + sum(rf_data)) & 0xFF)
+        if escaped:
+            return XBeePacket._escape_data(memoryview(frame)[1:], bytearray((frame[0],)))
+        return frame
+
+    def _get_header_data(self):
+        """
+        Returns the encoded fixed fields of the frames built from this
+        template, without frame type and frame ID.
+
+        This is only for internal use.
+
+        Returns:
+            Bytearray: the encoded fixed fields.
+        """
+        return self.__header[0][5:]
+
+    def _get_header_data_dict(self):
+        """
+        Similar to :meth:`.TransmitTemplate._get_header_data` but returns
+        the fields as dictionary.
+
+        This is only for internal use.
+
+        Returns:
+            Dictionary: the fixed fields.
+        """
+        return self.__packet._get_api_packet_spec_data_dict()
+
+    def __get_frame_type(self):
+        """
+        Returns the frame type of the frames built from this template.
+
+        Returns:
+            :class:`.ApiFrameType`: the frame type.
+        """
+        return ApiFrameType.EXPLICIT_ADDRESSING if self.__explicit else ApiFrameType.TRANSMIT_REQUEST
+
+    def __get_64bit_addr(self):
+        """
+        Returns the 64-bit destination address.
+
+        Returns:
+            :class:`.XBee64BitAddress`: the 64-bit destination address.
+        """
+        return self.__x64bit_addr
+
+    def __get_16bit_addr(self):
+        """
+        Returns the 16-bit destination address.
+
+        Returns:
+            :class:`.XBee16BitAddress`: the 16-bit destination address.
+        """
+        return self.__packet.x16bit_dest_addr
+
+    def __set_16bit_addr(self, x16bit_addr):
+        """
+        Sets the 16-bit destination address, encoding again the fixed part of
+        the frames.
+
+        Args:
+            x16bit_addr (:class:`.XBee16BitAddress`): the new 16-bit destination address.
+        """
+        self.__encode(x16bit_addr)
+
+    def __get_transmit_options(self):
+        """
+        Returns the transmit options bitfield.
+
+        Returns:
+            Integer: the transmit options bitfield.
+        """
+        return self.__transmit_options
+
+    frame_type = property(__get_frame_type)
+    """:class:`.ApiFrameType`. Frame type of the frames built from the template."""
+
+    x64bit_dest_addr = property(__get_64bit_addr)
+    """:class:`.XBee64BitAddress`. 64-bit destination address."""
+
+    x16bit_dest_addr = property(__get_16bit_addr, __set_16bit_addr)
+    """:class:`.XBee16BitAddress`. 16-bit destination address."""
+
+    transmit_options = property(__get_transmit_options)
+    """Integer. Transmit options bitfield."""
+
+
+class PreparedTransmitPacket(XBeeAPIPacket):
+    """
+    This class represents a transmit request or explicit addressing packet
+    built from a :class:`.TransmitTemplate`.
+
+    Its raw frame is the one of a :class:`.TransmitPacket` or an
+    :class:`.ExplicitAddressingPacket` (depending on the template), but it is
+    built copying the part encoded by the template.
+
+    .. seealso::
+       | :class:`.TransmitTemplate`
+       | :class:`.XBeeAPIPacket`
+    """
+
+    def __init__(self, template, frame_id, rf_data):
+        """
+        Class constructor. Instantiates a new :class:`.PreparedTransmitPacket` object with the provided
+        parameters.
+
+        Args:
+            template (:class:`.TransmitTemplate`): the template of the packet.
+            frame_id (Integer): the frame ID of the packet.
+            rf_data (Bytearray): the RF data to send.
+
+        Raises:
+            ValueError: if ``frame_id`` is less than 0 or greater than 255.
+
+        .. seealso::
+           | :class:`.TransmitTemplate`
+           | :class:`.XBeeAPIPacket`
+        """
+        if frame_id > 255 or frame_id < 0:
+            raise ValueError("frame_id must be between 0 and 255.")
+
+        super().__init__(template.frame_type)
+        self._frame_id = frame_id
+        self.__template = template
+        self.__rf_data = rf_data
+
+    def output(self, escaped=False):
+        """
+        Override method.
+
+        .. seealso::
+           | :meth:`.XBeePacket.output`
+           | :meth:`.TransmitTemplate._build_frame`
+        """
+        return self.__template._build_frame(self._frame_id, self.__rf_data, escaped)
+
+    def needs_id(self):
+        """
+        Override method.
+
+        .. seealso::
+           | :meth:`.XBeeAPIPacket.needs_id`
+        """
+        return True
+
+    def _get_api_packet_spec_data(self):
+        """
+        Override method.
+
+        .. seealso::
+           | :meth:`.XBeeAPIPacket._get_api_packet_spec_data`
+        """
+        return self.__template._get_header_data() + self.__rf_data
+
+    def _get_api_packet_spec_data_dict(self):
+        """
+        Override method.
+
+        .. seealso::
+           | :meth:`.XBeeAPIPacket._get_api_packet_spec_data_dict`
+        """
+        data = self.__template._get_header_data_dict()
+        data[DictKeys.RF_DATA] = list(self.__rf_data)
+        return data
+
+    def __get_template(self):
+        """
+        Returns the template of the packet.
+
+        Returns:
+            :class:`.TransmitTemplate`: the template of the packet.
+        """
+        return self.__template
+
+    def __get_64bit_addr(self):
+        """
+        Returns the 64-bit destination address.
+
+        Returns:
+            :class:`.XBee64BitAddress`: the 64-bit destination address.
+        """
+        return self.__template.x64bit_dest_addr
+
+    def __get_16bit_addr(self):
+        """
+        Returns the 16-bit destination address.
+
+        Returns:
+            :class:`.XBee16BitAddress`: the 16-bit destination address.
+        """
+        return self.__template.x16bit_dest_addr
+
+    def __get_rf_data(self):
+        """
+        Returns the RF data to send.
+
+        Returns:
+            Bytearray: the RF data to send.
+        """
+        return self.__rf_data
+
+    template = property(__get_template)
+    """:class:`.TransmitTemplate`. Template of the packet."""
+
+    x64bit_dest_addr = property(__get_64bit_addr)
+    """:class:`.XBee64BitAddress`. 64-bit destination address."""
+
+    x16bit_dest_addr = property(__get_16bit_addr)
+    """:class:`.XBee16BitAddress`. 16-bit destination address."""
+
+    rf_data = property(__get_rf_data)
+    """Bytearray. RF data to send."""
@@ -89,7 +89,7 @@ class DeviceRequestPacket(XBeeAPIPacket):
             raise InvalidPacketException("This packet is not a device request packet.")
 
         target_length = raw[7]
-        return DeviceRequestPacket(raw[4], str(raw[8:8 + target_length]), raw[8 + target_length:-1])
+        return DeviceRequestPacket(raw[4], raw[8:8 + target_length].decode(), raw[8 + target_length:-1])
 
     def needs_id(self):
         """
@@ -720,8 +720,8 @@ class SendDataRequestPacket(XBeeAPIPacket):
         path_length = raw[5]
         content_type_length = raw[6 + path_length]
         return SendDataRequestPacket(raw[4],
-                                     str(raw[6:6 + path_length]),
-                                     str(raw[6 + path_length + 1:6 + path_length + 1 + content_type_length]),
+                                     raw[6:6 + path_length].decode(),
+                                     raw[6 + path_length + 1:6 + path_length + 1 + content_type_length].decode(),
                                      SendDataRequestOptions.get(raw[6 + path_length + 2 + content_type_length]),
                                      raw[6 + path_length + 3 + content_type_length:-1])
 
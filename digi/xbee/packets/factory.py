@@ -11,6 +11,7 @@ from digi.xbee.packets.devicecloud import *
 from digi.xbee.packets.network import *
 from digi.xbee.packets.raw import *
 from digi.xbee.packets.wifi import *
+from digi.xbee.packets.zigbee import *
 from digi.xbee.packets.aft import ApiFrameType
 from digi.xbee.models.mode import OperatingMode
 
@@ -93,6 +94,45 @@ non-escaped data.
 """
 
 
+# Packet class of each supported frame type, indexed by its code.
+__PACKET_CLASSES = {
+    ApiFrameType.GENERIC.code: GenericXBeePacket,
+    ApiFrameType.AT_COMMAND.code: ATCommPacket,
+    ApiFrameType.AT_COMMAND_RESPONSE.code: ATCommResponsePacket,
+    ApiFrameType.RECEIVE_PACKET.code: ReceivePacket,
+    ApiFrameType.RX_64.code: RX64Packet,
+    ApiFrameType.RX_16.code: RX16Packet,
+    ApiFrameType.REMOTE_AT_COMMAND_REQUEST.code: RemoteATCommandPacket,
+    ApiFrameType.REMOTE_AT_COMMAND_RESPONSE.code: RemoteATCommandResponsePacket,
+    ApiFrameType.TRANSMIT_REQUEST.code: TransmitPacket,
+    ApiFrameType.TRANSMIT_STATUS.code: TransmitStatusPacket,
+    ApiFrameType.MODEM_STATUS.code: ModemStatusPacket,
+    ApiFrameType.TX_STATUS.code: TXStatusPacket,
+    ApiFrameType.RX_IO_16.code: RX16IOPacket,
+    ApiFrameType.RX_IO_64.code: RX64IOPacket,
+    ApiFrameType.IO_DATA_SAMPLE_RX_INDICATOR.code: IODataSampleRxIndicatorPacket,
+    ApiFrameType.NODE_ID_INDICATOR.code: NodeIdentificationIndicatorPacket,
+    ApiFrameType.EXPLICIT_ADDRESSING.code: ExplicitAddressingPacket,
+    ApiFrameType.EXPLICIT_RX_INDICATOR.code: ExplicitRXIndicatorPacket,
+    ApiFrameType.TX_SMS.code: TXSMSPacket,
+    ApiFrameType.TX_IPV4.code: TXIPv4Packet,
+    ApiFrameType.RX_SMS.code: RXSMSPacket,
+    ApiFrameType.RX_IPV4.code: RXIPv4Packet,
+    ApiFrameType.REMOTE_AT_COMMAND_REQUEST_WIFI.code: RemoteATCommandWifiPacket,
+    ApiFrameType.SEND_DATA_REQUEST.code: SendDataRequestPacket,
+    ApiFrameType.DEVICE_RESPONSE.code: DeviceResponsePacket,
+    ApiFrameType.REMOTE_AT_COMMAND_RESPONSE_WIFI.code: RemoteATCommandResponseWifiPacket,
+    ApiFrameType.IO_DATA_SAMPLE_RX_INDICATOR_WIFI.code: IODataSampleRxIndicatorWifiPacket,
+    ApiFrameType.SEND_DATA_RESPONSE.code: SendDataResponsePacket,
+    ApiFrameType.DEVICE_REQUEST.code: DeviceRequestPacket,
+    ApiFrameType.DEVICE_RESPONSE_STATUS.code: DeviceResponseStatusPacket,
+    ApiFrameType.FRAME_ERROR.code: FrameErrorPacket,
+    ApiFrameType.CREATE_SOURCE_ROUTE.code: CreateSourceRoutePacket,
+    ApiFrameType.ROUTE_RECORD_INDICATOR.code: RouteRecordIndicatorPacket,
+    ApiFrameType.MANY_TO_ONE_ROUTE_REQUEST.code: ManyToOneRouteRequestPacket,
+}
+
+
 def build_frame(packet_bytearray, operating_mode=OperatingMode.API_MODE):
     """
     Creates a packet from raw data.
@@ -107,97 +147,12 @@ def build_frame(packet_bytearray, operating_mode=OperatingMode.API_MODE):
     .. seealso::
        | :class:`.OperatingMode`
     """
-    frame_type = ApiFrameType.get(packet_bytearray[3])
-
-    if frame_type == ApiFrameType.GENERIC:
-        return GenericXBeePacket.create_packet(packet_bytearray, operating_mode)
-
-    elif frame_type == ApiFrameType.AT_COMMAND:
-        return ATCommPacket.create_packet(packet_bytearray, operating_mode)
-
-    elif frame_type == ApiFrameType.AT_COMMAND_RESPONSE:
-        return ATCommResponsePacket.create_packet(packet_bytearray, operating_mode)
-
-    elif frame_type == ApiFrameType.RECEIVE_PACKET:
-        return ReceivePacket.create_packet(packet_bytearray, operating_mode)
-
-    elif frame_type == ApiFrameType.RX_64:
-        return RX64Packet.create_packet(packet_bytearray, operating_mode)
-
-    elif frame_type == ApiFrameType.RX_16:
-        return RX16Packet.create_packet(packet_bytearray, operating_mode)
-
-    elif frame_type == ApiFrameType.REMOTE_AT_COMMAND_REQUEST:
-        return RemoteATCommandPacket.create_packet(packet_bytearray, operating_mode)
-
-    elif frame_type == ApiFrameType.REMOTE_AT_COMMAND_RESPONSE:
-        return RemoteATCommandResponsePacket.create_packet(packet_bytearray, operating_mode)
-
-    elif frame_type == ApiFrameType.TRANSMIT_REQUEST:
-        return TransmitPacket.create_packet(packet_bytearray, operating_mode)
-
-    elif frame_type == ApiFrameType.TRANSMIT_STATUS:
-        return TransmitStatusPacket.create_packet(packet_bytearray, operating_mode)
-
-    elif frame_type == ApiFrameType.MODEM_STATUS:
-        return ModemStatusPacket.create_packet(packet_bytearray, operating_mode)
-
-    elif frame_type == ApiFrameType.TX_STATUS:
-        return TXStatusPacket.create_packet(packet_bytearray, operating_mode)
-
-    elif frame_type == ApiFrameType.RX_IO_16:
-        return RX16IOPacket.create_packet(packet_bytearray, operating_mode)
-
-    elif frame_type == ApiFrameType.RX_IO_64:
-        return RX64IOPacket.create_packet(packet_bytearray, operating_mode)
-
-    elif frame_type == ApiFrameType.IO_DATA_SAMPLE_RX_INDICATOR:
-        return IODataSampleRxIndicatorPacket.create_packet(packet_bytearray, operating_mode)
-
-    elif frame_type == ApiFrameType.EXPLICIT_ADDRESSING:
-        return ExplicitAddressingPacket.create_packet(packet_bytearray, operating_mode)
-
-    elif frame_type == ApiFrameType.EXPLICIT_RX_INDICATOR:
-        return ExplicitRXIndicatorPacket.create_packet(packet_bytearray, operating_mode)
-
-    elif frame_type == ApiFrameType.TX_SMS:
-        return TXSMSPacket.create_packet(packet_bytearray, operating_mode)
-
-    elif frame_type == ApiFrameType.TX_IPV4:
-        return TXIPv4Packet.create_packet(packet_bytearray, operating_mode)
-
-    elif frame_type == ApiFrameType.RX_SMS:
-        return RXSMSPacket.create_packet(packet_bytearray, operating_mode)
-
-    elif frame_type == ApiFrameType.RX_IPV4:
-        return RXIPv4Packet.create_packet(packet_bytearray, operating_mode)
-
-    elif frame_type == ApiFrameType.REMOTE_AT_COMMAND_REQUEST_WIFI:
-        return RemoteATCommandWifiPacket.create_packet(packet_bytearray, operating_mode)
-
-    elif frame_type == ApiFrameType.SEND_DATA_REQUEST:
-        return SendDataRequestPacket.create_packet(packet_bytearray, operating_mode)
-
-    elif frame_type == ApiFrameType.DEVICE_RESPONSE:
-        return DeviceResponsePacket.create_packet(packet_bytearray, operating_mode)
-
-    elif frame_type == ApiFrameType.REMOTE_AT_COMMAND_RESPONSE_WIFI:
-        return RemoteATCommandResponseWifiPacket.create_packet(packet_bytearray, operating_mode)
-
-    elif frame_type == ApiFrameType.IO_DATA_SAMPLE_RX_INDICATOR_WIFI:
-        return IODataSampleRxIndicatorWifiPacket.create_packet(packet_bytearray, operating_mode)
-
-    elif frame_type == ApiFrameType.SEND_DATA_RESPONSE:
-        return SendDataResponsePacket.create_packet(packet_bytearray, operating_mode)
-
-    elif frame_type == ApiFrameType.DEVICE_REQUEST:
-        return DeviceRequestPacket.create_packet(packet_bytearray, operating_mode)
-
-    elif frame_type == ApiFrameType.DEVICE_RESPONSE_STATUS:
-        return DeviceResponseStatusPacket.create_packet(packet_bytearray, operating_mode)
-
-    elif frame_type == ApiFrameType.FRAME_ERROR:
-        return FrameErrorPacket.create_packet(packet_bytearray, operating_mode)
-
-    else:
-        raise NotImplementedError("Frame type " + str(frame_type) + " is not supported.")
+    # Unescape the frame before looking at its type, the length field may be escaped.
+    if operating_mode == OperatingMode.ESCAPED_API_MODE:
+        packet_bytearray = XBeePacket._unescape_data(packet_bytearray)
+        operating_mode = OperatingMode.API_MODE
+
+    packet_class = __PACKET_CLASSES.get(packet_bytearray[3])
+    if packet_class is None:
+        raise NotImplementedError("Frame type " + str(ApiFrameType.get(packet_bytearray[3])) + " is not supported.")
+    return packet_class.create_packet(packet_bytearray, operating_mode)
@@ -88,8 +88,8 @@ class RXIPv4Packet(XBeeAPIPacket):
         if _raw[3] != ApiFrameType.RX_IPV4.code:
             raise InvalidPacketException("This packet is not an RXIPv4Packet.")
 
-        return RXIPv4Packet(IPv4Address(bytes(raw[4:8])), utils.bytes_to_int(raw[8:10]),
-                            utils.bytes_to_int(raw[10:12]), IPProtocol.get(raw[12]),
+        return RXIPv4Packet(IPv4Address(bytes(_raw[4:8])), utils.bytes_to_int(_raw[8:10]),
+                            utils.bytes_to_int(_raw[10:12]), IPProtocol.get(_raw[12]),
                             _raw[14:-1])
 
     def needs_id(self):
@@ -99,7 +99,7 @@ class RXIPv4Packet(XBeeAPIPacket):
         .. seealso::
            | :meth:`.XBeeAPIPacket.needs_id`
         """
-        return True
+        return False
 
     def __get_source_address(self):
         """
@@ -92,7 +92,7 @@ class IODataSampleRxIndicatorWifiPacket(XBeeAPIPacket):
         if raw[3] != ApiFrameType.IO_DATA_SAMPLE_RX_INDICATOR_WIFI.code:
             raise InvalidPacketException("This packet is not an IO data sample RX indicator Wi-Fi packet.")
 
-        return IODataSampleRxIndicatorWifiPacket(IPv4Address(bytes(raw[4:8])), raw[7], raw[8], raw[9:-1])
+        return IODataSampleRxIndicatorWifiPacket(IPv4Address(bytes(raw[4:8])), raw[8], raw[9], raw[10:-1])
 
     def needs_id(self):
         """
@@ -401,7 +401,9 @@ class RemoteATCommandWifiPacket(XBeeAPIPacket):
         .. seealso::
            | :meth:`.XBeeAPIPacket._get_api_packet_spec_data`
         """
-        ret = bytearray(self.__dest_address.packed)
+        # The destination address field is 8 bytes long, the IP address is in the last 4.
+        ret = bytearray(4)
+        ret += self.__dest_address.packed
         ret += utils.int_to_bytes(self.__transmit_options, num_bytes=1)
         ret += bytearray(self.__command, 'utf8')
         if self.__parameter is not None:
@@ -628,7 +630,9 @@ class RemoteATCommandResponseWifiPacket(XBeeAPIPacket):
         .. seealso::
            | :meth:`.XBeeAPIPacket._get_api_packet_spec_data`
         """
-        ret = bytearray(self.__source_address.packed)
+        # The source address field is 8 bytes long, the IP address is in the last 4.
+        ret = bytearray(4)
+        ret += self.__source_address.packed
         ret += bytearray(self.__command, "utf8")
         ret += utils.int_to_bytes(self.__response_status.code, num_bytes=1)
         if self.__comm_value is not None:
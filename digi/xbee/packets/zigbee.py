@@ -0,0 +1,636 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2017 Digi International Inc. All Rights Reserved.
+
+from digi.xbee.packets.base import XBeeAPIPacket, DictKeys
+from digi.xbee.models.address import XBee64BitAddress, XBee16BitAddress
+from digi.xbee.exception import InvalidOperatingModeException, InvalidPacketException
+from digi.xbee.packets.aft import ApiFrameType
+from digi.xbee.models.mode import OperatingMode
+
+
+class RouteRecordIndicatorPacket(XBeeAPIPacket):
+    """
+    This class represents a ZigBee Route Record Indicator packet. Packet is
+    built using the parameters of the constructor or providing a valid API
+    payload.
+
+    The route record indicator is received whenever a device sends a ZigBee
+    route record command. This is used with many-to-one routing to create
+    source routes for devices in a network.
+
+    The hops are the 16-bit addresses of the intermediate devices, excluding
+    the source and the destination, in the order expected by the Create Source
+    Route packet.
+
+    .. seealso::
+       | :class:`.CreateSourceRoutePacket`
+       | :class:`.XBeeAPIPacket`
+    """
+
+    __MIN_PACKET_LENGTH = 17
+
+    def __init__(self, x64bit_addr, x16bit_addr, receive_options, hops=None):
+        """
+        Class constructor. Instantiates a new :class:`.RouteRecordIndicatorPacket` object with the provided
+        parameters.
+
+        Args:
+            x64bit_addr (:class:`.XBee64BitAddress`): the 64-bit source address.
+            x16bit_addr (:class:`.XBee16BitAddress`): the 16-bit source address.
+            receive_options (Integer): bitfield indicating the receive options.
+            hops (List, optional): list of :class:`.XBee16BitAddress` of the intermediate hops. Optional.
+
+        Raises:
+            ValueError: if the number of hops is greater than 255.
+
+        .. seealso::
+           | :class:`.ReceiveOptions`
+           | :class:`.XBee16BitAddress`
+           | :class:`.XBee64BitAddress`
+           | :class:`.XBeeAPIPacket`
+        """
+        if hops is not None and len(hops) > 255:
+            raise ValueError("Number of hops must be between 0 and 255.")
+
+        super().__init__(ApiFrameType.ROUTE_RECORD_INDICATOR)
+        self.__x64bit_addr = x64bit_addr
+        self.__x16bit_addr = x16bit_addr
+        self.__receive_options = receive_options
+        self.__hops = list(hops) if hops is not None else []
+
+    @staticmethod
+    def create_packet(raw, operating_mode):
+        """
+        Override method.
+
+        Returns:
+            :class:`.RouteRecordIndicatorPacket`.
+
+        Raises:
+            InvalidPacketException: if the bytearray length is less than 17. (start delim. + length (2 bytes) + frame
+                type + 64bit addr. + 16bit addr. + receive options + number of hops + checksum = 17 bytes).
+            InvalidPacketException: if the length field of 'raw' is different than its real length. (length field: bytes
+                2 and 3)
+            InvalidPacketException: if the first byte of 'raw' is not the header byte. See :class:`.SpecialByte`.
+            InvalidPacketException: if the calculated checksum is different than the checksum field value (last byte).
+            InvalidPacketException: if operating_mode mode is not supported.
+            InvalidPacketException: if the frame type is different than :attr:`.ApiFrameType.ROUTE_RECORD_INDICATOR`.
+            InvalidPacketException: if the number of hops does not match the addresses of the packet.
+
+        .. seealso::
+           | :meth:`.XBeePacket.create_packet`
+           | :meth:`.XBeeAPIPacket._check_api_packet`
+        """
+        if operating_mode != OperatingMode.ESCAPED_API_MODE and operating_mode != OperatingMode.API_MODE:
+            raise InvalidOperatingModeException(operating_mode.name + " is not supported.")
+
+        raw = XBeeAPIPacket._unescape_data(raw) if operating_mode == OperatingMode.ESCAPED_API_MODE else raw
+        XBeeAPIPacket._check_api_packet(raw, min_length=RouteRecordIndicatorPacket.__MIN_PACKET_LENGTH)
+
+        if raw[3] != ApiFrameType.ROUTE_RECORD_INDICATOR.code:
+            raise InvalidPacketException("This packet is not a route record indicator packet.")
+
+        num_hops = raw[15]
+        if len(raw[16:-1]) != num_hops * 2:
+            raise InvalidPacketException("Specified number of hops does not match with the length of addresses.")
+
+        hops = [XBee16BitAddress(raw[i:i + 2]) for i in range(16, 16 + num_hops * 2, 2)]
+
+        return RouteRecordIndicatorPacket(XBee64BitAddress(raw[4:12]), XBee16BitAddress(raw[12:14]), raw[14], hops)
+
+    def needs_id(self):
+        """
+        Override method.
+
+        .. seealso::
+           | :meth:`.XBeeAPIPacket.needs_id`
+        """
+        return False
+
+    def _get_api_packet_spec_data(self):
+        """
+        Override method.
+
+        .. seealso::
+           | :meth:`.XBeeAPIPacket._get_api_packet_spec_data`
+        """
+        ret = self.__x64bit_addr.address
+        ret += self.__x16bit_addr.address
+        ret.append(self.__receive_options)
+        ret.append(len(self.__hops))
+        for hop in self.__hops:
+            ret += hop.address
+        return ret
+
+    def _get_api_packet_spec_data_dict(self):
+        """
+        Override method.
+
+        .. seealso::
+           | :meth:`.XBeeAPIPacket._get_api_packet_spec_data_dict`
+        """
+        return {DictKeys.X64BIT_ADDR:     self.__x64bit_addr.address,
+                DictKeys.X16BIT_ADDR:     self.__x16bit_addr.address,
+                DictKeys.RECEIVE_OPTIONS: self.__receive_options,
+                DictKeys.NUM_OF_HOPS:     len(self.__hops),
+                DictKeys.HOPS:            [hop.address for hop in self.__hops]}
+
+    def __get_64bit_addr(self):
+        """
+        Returns the 64-bit source address.
+
+        Returns:
+            :class:`.XBee64BitAddress`: the 64-bit source address.
+
+        .. seealso::
+           | :class:`.XBee64BitAddress`
+        """
+        return self.__x64bit_addr
+
+    def __set_64bit_addr(self, x64bit_addr):
+        """
+        Sets the 64-bit source address.
+
+        Args:
+            x64bit_addr (:class:`.XBee64BitAddress`): the new 64-bit source address.
+
+        .. seealso::
+           | :class:`.XBee64BitAddress`
+        """
+        self.__x64bit_addr = x64bit_addr
+
+    def __get_16bit_addr(self):
+        """
+        Returns the 16-bit source address.
+
+        Returns:
+            :class:`.XBee16BitAddress`: the 16-bit source address.
+
+        .. seealso::
+           | :class:`.XBee16BitAddress`
+        """
+        return self.__x16bit_addr
+
+    def __set_16bit_addr(self, x16bit_addr):
+        """
+        Sets the 16-bit source address.
+
+        Args:
+            x16bit_addr (:class:`.XBee16BitAddress`): the new 16-bit source address.
+
+        .. seealso::
+           | :class:`.XBee16BitAddress`
+        """
+        self.__x16bit_addr = x16bit_addr
+
+    def __get_options(self):
+        """
+        Returns the receive options bitfield.
+
+        Returns:
+            Integer: the receive options bitfield.
+
+        .. seealso::
+           | :class:`.ReceiveOptions`
+        """
+        return self.__receive_options
+
+    def __set_options(self, receive_options):
+        """
+        Sets the receive options bitfield.
+
+        Args:
+            receive_options (Integer): the new receive options bitfield.
+
+        .. seealso::
+           | :class:`.ReceiveOptions`
+        """
+        self.__receive_options = receive_options
+
+    def __get_hops(self):
+        """
+        Returns the 16-bit addresses of the intermediate hops.
+
+        Returns:
+            List: list of :class:`.XBee16BitAddress` of the intermediate hops.
+        """
+        return list(self.__hops)
+
+    def __set_hops(self, hops):
+        """
+        Sets the 16-bit addresses of the intermediate hops.
+
+        Args:
+            hops (List): the new list of :class:`.XBee16BitAddress` of the intermediate hops.
+
+        Raises:
+            ValueError: if the number of hops is greater than 255.
+        """
+        if hops is not None and len(hops) > 255:
+            raise ValueError("Number of hops must be between 0 and 255.")
+        self.__hops = list(hops) if hops is not None else []
+
+    x64bit_source_addr = property(__get_64bit_addr, __set_64bit_addr)
+    """:class:`.XBee64BitAddress`. 64-bit source address."""
+
+    x16bit_source_addr = property(__get_16bit_addr, __set_16bit_addr)
+    """:class:`.XBee16BitAddress`. 16-bit source address."""
+
+    receive_options = property(__get_options, __set_options)
+    """Integer. Receive options bitfield."""
+
+    hops = property(__get_hops, __set_hops)
+    """List. 16-bit addresses of the intermediate hops."""
+
+
+class ManyToOneRouteRequestPacket(XBeeAPIPacket):
+    """
+    This class represents a ZigBee Many-to-One Route Request Indicator packet.
+    Packet is built using the parameters of the constructor or providing a
+    valid API payload.
+
+    This packet is received when a many-to-one route request is received from
+    a remote concentrator, which becomes the destination of the route records
+    of the devices of the network.
+
+    .. seealso::
+       | :class:`.RouteRecordIndicatorPacket`
+       | :class:`.XBeeAPIPacket`
+    """
+
+    __MIN_PACKET_LENGTH = 16
+
+    def __init__(self, x64bit_addr, x16bit_addr):
+        """
+        Class constructor. Instantiates a new :class:`.ManyToOneRouteRequestPacket` object with the provided
+        parameters.
+
+        Args:
+            x64bit_addr (:class:`.XBee64BitAddress`): the 64-bit address of the concentrator.
+            x16bit_addr (:class:`.XBee16BitAddress`): the 16-bit address of the concentrator.
+
+        .. seealso::
+           | :class:`.XBee16BitAddress`
+           | :class:`.XBee64BitAddress`
+           | :class:`.XBeeAPIPacket`
+        """
+        super().__init__(ApiFrameType.MANY_TO_ONE_ROUTE_REQUEST)
+        self.__x64bit_addr = x64bit_addr
+        self.__x16bit_addr = x16bit_addr
+
+    @staticmethod
+    def create_packet(raw, operating_mode):
+        """
+        Override method.
+
+        Returns:
+            :class:`.ManyToOneRouteRequestPacket`.
+
+        Raises:
+            InvalidPacketException: if the bytearray length is less than 16. (start delim. + length (2 bytes) + frame
+                type + 64bit addr. + 16bit addr. + reserved + checksum = 16 bytes).
+            InvalidPacketException: if the length field of 'raw' is different than its real length. (length field: bytes
+                2 and 3)
+            InvalidPacketException: if the first byte of 'raw' is not the header byte. See :class:`.SpecialByte`.
+            InvalidPacketException: if the calculated checksum is different than the checksum field value (last byte).
+            InvalidPacketException: if operating_mode mode is not supported.
+            InvalidPacketException: if the frame type is different than
+                :attr:`.ApiFrameType.MANY_TO_ONE_ROUTE_REQUEST`.
+
+        .. seealso::
+           | :meth:`.XBeePacket.create_packet`
+           | :meth:`.XBeeAPIPacket._check_api_packet`
+        """
+        if operating_mode != OperatingMode.ESCAPED_API_MODE and operating_mode != OperatingMode.API_MODE:
+            raise InvalidOperatingModeException(operating_mode.name + " is not supported.")
+
+        raw = XBeeAPIPacket._unescape_data(raw) if operating_mode == OperatingMode.ESCAPED_API_MODE else raw
+        XBeeAPIPacket._check_api_packet(raw, min_length=ManyToOneRouteRequestPacket.__MIN_PACKET_LENGTH)
+
+        if raw[3] != ApiFrameType.MANY_TO_ONE_ROUTE_REQUEST.code:
+            raise InvalidPacketException("This packet is not a many-to-one route request packet.")
+
+        return ManyToOneRouteRequestPacket(XBee64BitAddress(raw[4:12]), XBee16BitAddress(raw[12:14]))
+
+    def needs_id(self):
+        """
+        Override method.
+
+        .. seealso::
+           | :meth:`.XBeeAPIPacket.needs_id`
+        """
+        return False
+
+    def _get_api_packet_spec_data(self):
+        """
+        Override method.
+
+        .. seealso::
+           | :meth:`.XBeeAPIPacket._get_api_packet_spec_data`
+        """
+        ret = self.__x64bit_addr.address
+        ret += self.__x16bit_addr.address
+        ret.append(0x00)  # Reserved.
+        return ret
+
+    def _get_api_packet_spec_data_dict(self):
+        """
+        Override method.
+
+        .. seealso::
+           | :meth:`.XBeeAPIPacket._get_api_packet_spec_data_dict`
+        """
+        return {DictKeys.X64BIT_ADDR: self.__x64bit_addr.address,
+                DictKeys.X16BIT_ADDR: self.__x16bit_addr.address,
+                DictKeys.RESERVED:    0x00}
+
+    def __get_64bit_addr(self):
+        """
+        Returns the 64-bit address of the concentrator.
+
+        Returns:
+            :class:`.XBee64BitAddress`: the 64-bit address of the concentrator.
+
+        .. seealso::
+           | :class:`.XBee64BitAddress`
+        """
+        return self.__x64bit_addr
+
+    def __set_64bit_addr(self, x64bit_addr):
+        """
+        Sets the 64-bit address of the concentrator.
+
+        Args:
+            x64bit_addr (:class:`.XBee64BitAddress`): the new 64-bit address of the concentrator.
+
+        .. seealso::
+           | :class:`.XBee64BitAddress`
+        """
+        self.__x64bit_addr = x64bit_addr
+
+    def __get_16bit_addr(self):
+        """
+        Returns the 16-bit address of the concentrator.
+
+        Returns:
+            :class:`.XBee16BitAddress`: the 16-bit address of the concentrator.
+
+        .. seealso::
+           | :class:`.XBee16BitAddress`
+        """
+        return self.__x16bit_addr
+
+    def __set_16bit_addr(self, x16bit_addr):
+        """
+        Sets the 16-bit address of the concentrator.
+
+        Args:
+            x16bit_addr (:class:`.XBee16BitAddress`): the new 16-bit address of the concentrator.
+
+        .. seealso::
+           | :class:`.XBee16BitAddress`
+        """
+        self.__x16bit_addr = x16bit_addr
+
+    x64bit_source_addr = property(__get_64bit_addr, __set_64bit_addr)
+    """:class:`.XBee64BitAddress`. 64-bit address of the concentrator."""
+
+    x16bit_source_addr = property(__get_16bit_addr, __set_16bit_addr)
+    """:class:`.XBee16BitAddress`. 16-bit address of the concentrator."""
+
+
+class CreateSourceRoutePacket(XBeeAPIPacket):
+    """
+    This class represents a ZigBee Create Source Route packet. Packet is built
+    using the parameters of the constructor or providing a valid API payload.
+
+    This packet creates a source route in the local device. A source route
+    specifies the complete route a packet should traverse to get from source
+    to destination, so it must be sent before transmitting data to a remote
+    device whose route is known (for example, from a route record).
+
+    The hops are the 16-bit addresses of the intermediate devices, excluding
+    the source and the destination, starting with the neighbor of the
+    destination.
+
+    .. seealso::
+       | :class:`.RouteRecordIndicatorPacket`
+       | :class:`.XBeeAPIPacket`
+    """
+
+    __MIN_PACKET_LENGTH = 18
+
+    def __init__(self, frame_id, x64bit_addr, x16bit_addr, route_options=0, hops=None):
+        """
+        Class constructor. Instantiates a new :class:`.CreateSourceRoutePacket` object with the provided
+        parameters.
+
+        Args:
+            frame_id (Integer): the frame ID of the packet. It should be 0, this packet has no response.
+            x64bit_addr (:class:`.XBee64BitAddress`): the 64-bit destination address.
+            x16bit_addr (:class:`.XBee16BitAddress`): the 16-bit destination address.
+            route_options (Integer, optional, default=0): route command options. Optional.
+            hops (List, optional): list of :class:`.XBee16BitAddress` of the intermediate hops. Optional.
+
+        Raises:
+            ValueError: if ``frame_id`` is less than 0 or greater than 255.
+            ValueError: if the number of hops is greater than 255.
+
+        .. seealso::
+           | :class:`.XBee16BitAddress`
+           | :class:`.XBee64BitAddress`
+           | :class:`.XBeeAPIPacket`
+        """
+        if frame_id < 0 or frame_id > 255:
+            raise ValueError("Frame id must be between 0 and 255.")
+        if hops is not None and len(hops) > 255:
+            raise ValueError("Number of hops must be between 0 and 255.")
+
+        super().__init__(ApiFrameType.CREATE_SOURCE_ROUTE)
+        self._frame_id = frame_id
+        self.__x64bit_addr = x64bit_addr
+        self.__x16bit_addr = x16bit_addr
+        self.__route_options = route_options
+        self.__hops = list(hops) if hops is not None else []
+
+    @staticmethod
+    def create_packet(raw, operating_mode):
+        """
+        Override method.
+
+        Returns:
+            :class:`.CreateSourceRoutePacket`.
+
+        Raises:
+            InvalidPacketException: if the bytearray length is less than 18. (start delim. + length (2 bytes) + frame
+                type + frame id + 64bit addr. + 16bit addr. + route options + number of hops + checksum = 18 bytes).
+            InvalidPacketException: if the length field of 'raw' is different than its real length. (length field: bytes
+                2 and 3)
+            InvalidPacketException: if the first byte of 'raw' is not the header byte. See :class:`.SpecialByte`.
+            InvalidPacketException: if the calculated checksum is different than the checksum field value (last byte).
+            InvalidPacketException: if operating_mode mode is not supported.
+            InvalidPacketException: if the frame type is different than :attr:`.ApiFrameType.CREATE_SOURCE_ROUTE`.
+            InvalidPacketException: if the number of hops does not match the addresses of the packet.
+
+        .. seealso::
+           | :meth:`.XBeePacket.create_packet`
+           | :meth:`.XBeeAPIPacket._check_api_packet`
+        """
+        if operating_mode != OperatingMode.ESCAPED_API_MODE and operating_mode != OperatingMode.API_MODE:
+            raise InvalidOperatingModeException(operating_mode.name + " is not supported.")
+
+        raw = XBeeAPIPacket._unescape_data(raw) if operating_mode == OperatingMode.ESCAPED_API_MODE else raw
+        XBeeAPIPacket._check_api_packet(raw, min_length=CreateSourceRoutePacket.__MIN_PACKET_LENGTH)
+
+        if raw[3] != ApiFrameType.CREATE_SOURCE_ROUTE.code:
+            raise InvalidPacketException("This packet is not a create source route packet.")
+
+        num_hops = raw[16]
+        if len(raw[17:-1]) != num_hops * 2:
+            raise InvalidPacketException("Specified number of hops does not match with the length of addresses.")
+
+        hops = [XBee16BitAddress(raw[i:i + 2]) for i in range(17, 17 + num_hops * 2, 2)]
+
+        return CreateSourceRoutePacket(raw[4], XBee64BitAddress(raw[5:13]), XBee16BitAddress(raw[13:15]),
+                                       raw[15], hops)
+
+    def needs_id(self):
+        """
+        Override method.
+
+        .. seealso::
+           | :meth:`.XBeeAPIPacket.needs_id`
+        """
+        return True
+
+    def _get_api_packet_spec_data(self):
+        """
+        Override method.
+
+        .. seealso::
+           | :meth:`.XBeeAPIPacket._get_api_packet_spec_data`
+        """
+        ret = self.__x64bit_addr.address
+        ret += self.__x16bit_addr.address
+        ret.append(self.__route_options)
+        ret.append(len(self.__hops))
+        for hop in self.__hops:
+            ret += hop.address
+        return ret
+
+    def _get_api_packet_spec_data_dict(self):
+        """
+        Override method.
+
+        .. seealso::
+           | :meth:`.XBeeAPIPacket._get_api_packet_spec_data_dict`
+        """
+        return {DictKeys.X64BIT_ADDR:       self.__x64bit_addr.address,
+                DictKeys.X16BIT_ADDR:       self.__x16bit_addr.address,
+                DictKeys.ROUTE_CMD_OPTIONS: self.__route_options,
+                DictKeys.NUM_OF_HOPS:       len(self.__hops),
+                DictKeys.HOPS:              [hop.address for hop in self.__hops]}
+
+    def __get_64bit_addr(self):
+        """
+        Returns the 64-bit destination address.
+
+        Returns:
+            :class:`.XBee64BitAddress`: the 64-bit destination address.
+
+        .. seealso::
+           | :class:`.XBee64BitAddress`
+        """
+        return self.__x64bit_addr
+
+    def __set_64bit_addr(self, x64bit_addr):
+        """
+        Sets the 64-bit destination address.
+
+        Args:
+            x64bit_addr (:class:`.XBee64BitAddress`): the new 64-bit destination address.
+
+        .. seealso::
+           | :class:`.XBee64BitAddress`
+        """
+        self.__x64bit_addr = x64bit_addr
+
+    def __get_16bit_addr(self):
+        """
+        Returns the 16-bit destination address.
+
+        Returns:
+            :class:`.XBee16BitAddress`: the 16-bit destination address.
+
+        .. seealso::
+           | :class:`.XBee16BitAddress`
+        """
+        return self.__x16bit_addr
+
+    def __set_16bit_addr(self, x16bit_addr):
+        """
+        Sets the 16-bit destination address.
+
+        Args:
+            x16bit_addr (:class:`.XBee16BitAddress`): the new 16-bit destination address.
+
+        .. seealso::
+           | :class:`.XBee16BitAddress`
+        """
+        self.__x16bit_addr = x16bit_addr
+
+    def __get_route_options(self):
+        """
+        Returns the route command options.
+
+        Returns:
+            Integer: the route command options.
+        """
+        return self.__route_options
+
+    def __set_route_options(self, route_options):
+        """
+        Sets the route command options.
+
+        Args:
+            route_options (Integer): the new route command options.
+        """
+        self.__route_options = route_options
+
+    def __get_hops(self):
+        """
+        Returns the 16-bit addresses of the intermediate hops.
+
+        Returns:
+            List: list of :class:`.XBee16BitAddress` of the intermediate hops.
+        """
+        return list(self.__hops)
+
+    def __set_hops(self, hops):
+        """
+        Sets the 16-bit addresses of the intermediate hops.
+
+        Args:
+            hops (List): the new list of :class:`.XBee16BitAddress` of the intermediate hops.
+
+        Raises:
+            ValueError: if the number of hops is greater than 255.
+        """
+        if hops is not None and len(hops) > 255:
+            raise ValueError("Number of hops must be between 0 and 255.")
+        self.__hops = list(hops) if hops is not None else []
+
+    x64bit_dest_addr = property(__get_64bit_addr, __set_64bit_addr)
+    """:class:`.XBee64BitAddress`. 64-bit destination address."""
+
+    x16bit_dest_addr = property(__get_16bit_addr, __set_16bit_addr)
+    """:class:`.XBee16BitAddress`. 16-bit destination address."""
+
+    route_options = property(__get_route_options, __set_route_options)
+    """Integer. Route command options."""
+
+    hops = property(__get_hops, __set_hops)
+    """List. 16-bit addresses of the intermediate hops."""
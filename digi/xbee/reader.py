@@ -4,13 +4,16 @@
 #
 # Copyright (c) 2017 Digi International Inc. All Rights Reserved.
 
+from collections import OrderedDict
 from queue import Queue, Empty
+import copy
 import logging
 import threading
 import time
 
 import digi.xbee.devices
 from digi.xbee.models.atcomm import SpecialByte
+from digi.xbee.models.mode import OperatingMode
 from digi.xbee.models.address import XBee64BitAddress, XBee16BitAddress
 from digi.xbee.models.message import XBeeMessage, ExplicitXBeeMessage, IPMessage, \
     SMSMessage
@@ -18,10 +21,12 @@ from digi.xbee.models.options import ReceiveOptions
 from digi.xbee.models.protocol import XBeeProtocol
 from digi.xbee.packets import factory
 from digi.xbee.packets.aft import ApiFrameType
+from digi.xbee.packets.base import XBeePacket
 from digi.xbee.packets.common import ReceivePacket
 from digi.xbee.packets.raw import RX64Packet, RX16Packet
 from digi.xbee.util import utils
-from digi.xbee.exception import TimeoutException
+from digi.xbee.util.metrics import MetricsRegistry
+from digi.xbee.exception import TimeoutException, InvalidPacketException
 from digi.xbee.io import IOSample
 
 
@@ -113,7 +118,7 @@ class IOSampleReceived(XBeeEvent):
     The callbacks that handle this event will receive the following arguments:
         1. io_sample (:class:`.IOSample`): the received IO sample.
         2. sender (:class:`.RemoteXBeeDevice`): the remote XBee device who has sent the packet.
-        3. time (Integer): the time in which the packet was received.
+        3. time (Integer): the :func:`time.monotonic_ns` value when the packet was read from the serial port.
 
     .. seealso::
        | :class:`.IOSample`
@@ -289,36 +294,78 @@ class PacketListener(threading.Thread):
                 raw_packet = self.__try_read_packet()
 
                 if raw_packet is not None:
+                    # Reception time, before any processing delays it.
+                    timestamp = time.monotonic_ns()
+
                     # If the current protocol is 802.15.4, the packet may have to be discarded.
                     if (self.__xbee_device.get_protocol() == XBeeProtocol.RAW_802_15_4 and
                        not self.__check_packet_802_15_4(raw_packet)):
                         continue
 
-                    # Build the packet.
-                    read_packet = factory.build_frame(raw_packet, self.__xbee_device.operating_mode)
+                    metrics = self.__xbee_device.get_metrics()
+
+                    # Build the packet (it has already been unescaped).
+                    try:
+                        read_packet = factory.build_frame(raw_packet, OperatingMode.API_MODE)
+                    except InvalidPacketException as e:
+                        # Wrong length or checksum, keep reading from the next frame.
+                        if metrics is not None:
+                            metrics.increment(MetricsRegistry.FRAMING_ERRORS)
+                        self._log.error("Invalid frame discarded: %s" % str(e))
+                        continue
+                    read_packet.timestamp = timestamp
+                    if metrics is not None:
+                        metrics._frame_received(read_packet, len(raw_packet))
                     self._log.debug(self.__xbee_device.LOG_PATTERN.format(port=self.__xbee_device.serial_port.port,
                                                                           event="RECEIVED",
                                                                           opmode=self.__xbee_device.operating_mode,
                                                                           content=utils.hex_to_string(raw_packet)))
 
-                    # Add the packet to the queue.
-                    self.__add_packet_queue(read_packet)
-
-                    # If the packet has information about a remote device, extract it
-                    # and add/update this remote device to/in this XBee's network.
-                    remote = self.__try_add_remote_device(read_packet)
+                    # Drop copies of frames already received (mesh retries, other gateways).
+                    dup_filter = self.__xbee_device.get_duplicate_filter()
+                    if dup_filter is not None and dup_filter.is_duplicate(read_packet):
+                        continue
 
-                    # Execute API internal callbacks.
-                    self.__packet_received_API(read_packet)
+                    # Decode the payload before anyone else sees it.
+                    self.__decode_payload(read_packet)
 
-                    # Execute all user callbacks.
-                    self.__execute_user_callbacks(read_packet, remote)
+                    # Every message of a batched payload is processed as a separate packet.
+                    for packet in self.__unpack_batch(read_packet):
+                        self.__process_packet(packet)
         except Exception as e:
             self.__xbee_device.serial_port.close()
             self._log.exception(e)
         finally:
             self.__stop = True
 
+    def __process_packet(self, xbee_packet):
+        """
+        Queues the provided packet and notifies it to the API and user
+        callbacks.
+
+        Args:
+            xbee_packet (:class:`.XBeeAPIPacket`): the received packet.
+        """
+        # Add the packet to the queue.
+        self.__add_packet_queue(xbee_packet)
+
+        # If the packet has information about a remote device, extract it
+        # and add/update this remote device to/in this XBee's network.
+        remote = self.__try_add_remote_device(xbee_packet)
+
+        # Execute API internal callbacks.
+        self.__packet_received_API(xbee_packet)
+
+        # Execute all user callbacks.
+        metrics = self.__xbee_device.get_metrics()
+        if metrics is None:
+            self.__execute_user_callbacks(xbee_packet, remote)
+        else:
+            start = time.perf_counter()
+            self.__execute_user_callbacks(xbee_packet, remote)
+            metrics.observe(MetricsRegistry.CALLBACK_TIME, time.perf_counter() - start,
+                            label=xbee_packet.get_frame_type())
+
     def stop(self):
         """
         Stops listening.
@@ -551,13 +598,13 @@ class PacketListener(threading.Thread):
                 xbee_packet.get_frame_type() == ApiFrameType.RECEIVE_PACKET):
             _data = xbee_packet.rf_data
             is_broadcast = xbee_packet.receive_options == ReceiveOptions.BROADCAST_PACKET
-            self.__data_received(XBeeMessage(_data, remote, time.clock(), is_broadcast))
+            self.__data_received(XBeeMessage(_data, remote, xbee_packet.timestamp, is_broadcast))
             self._log.info(self._LOG_PATTERN.format(port=self.__xbee_device.serial_port.port,
                                                     event="RECEIVED",
                                                     fr_type="DATA",
                                                     sender=str(remote.get_64bit_addr()) if remote is not None
                                                     else "None",
-                                                    more_data=utils.hex_to_string(xbee_packet.rf_data)))
+                                                    more_data=utils.hex_to_string(_data)))
 
         # Modem status callbacks
         elif xbee_packet.get_frame_type() == ApiFrameType.MODEM_STATUS:
@@ -573,7 +620,17 @@ class PacketListener(threading.Thread):
         elif (xbee_packet.get_frame_type() == ApiFrameType.RX_IO_16 or
               xbee_packet.get_frame_type() == ApiFrameType.RX_IO_64 or
               xbee_packet.get_frame_type() == ApiFrameType.IO_DATA_SAMPLE_RX_INDICATOR):
-            self.__io_sample_received(xbee_packet.io_sample, remote, time.clock())
+            # Filter and store the sample with its reception time, not the processing one.
+            received = xbee_packet.timestamp / 1e9 if xbee_packet.timestamp is not None else None
+            # Drop samples that did not change enough before storing and notifying them.
+            io_sample_filter = self.__xbee_device.get_io_sample_filter()
+            if (io_sample_filter is not None
+                    and not io_sample_filter.is_interesting(remote, xbee_packet.io_sample, received)):
+                return
+            io_sample_store = self.__xbee_device.get_io_sample_store()
+            if io_sample_store is not None:
+                io_sample_store.add_sample(remote, xbee_packet.io_sample, received)
+            self.__io_sample_received(xbee_packet.io_sample, remote, xbee_packet.timestamp)
             self._log.info(self._LOG_PATTERN.format(port=self.__xbee_device.serial_port.port,
                                                     event="RECEIVED",
                                                     fr_type="IOSAMPLE",
@@ -584,37 +641,89 @@ class PacketListener(threading.Thread):
         # Explicit packet callbacks
         elif xbee_packet.get_frame_type() == ApiFrameType.EXPLICIT_RX_INDICATOR:
             is_broadcast = False
+            message = PacketListener.__expl_to_message(remote, is_broadcast, xbee_packet)
             # If it's 'special' packet, notify the data_received callbacks too:
             if self.__is_special_explicit_packet(xbee_packet):
-                self.__data_received(XBeeMessage(xbee_packet.rf_data, remote, time.clock(), is_broadcast))
-            self.__explicit_packet_received(PacketListener.__expl_to_message(remote, is_broadcast, xbee_packet))
+                self.__data_received(XBeeMessage(xbee_packet.rf_data, remote, xbee_packet.timestamp, is_broadcast))
+            self.__explicit_packet_received(message)
             self._log.info(self._LOG_PATTERN.format(port=self.__xbee_device.serial_port.port,
                                                     event="RECEIVED",
                                                     fr_type="EXPLICIT DATA",
                                                     sender=str(remote.get_64bit_addr()) if remote is not None
                                                     else "None",
-                                                    more_data=utils.hex_to_string(xbee_packet.rf_data)))
+                                                    more_data=utils.hex_to_string(message.data)))
 
         # IP data
         elif xbee_packet.get_frame_type() == ApiFrameType.RX_IPV4:
-            self.__ip_data_received(
-                IPMessage(xbee_packet.source_address, xbee_packet.source_port,
-                          xbee_packet.dest_port, xbee_packet.ip_protocol, xbee_packet.data))
+            message = IPMessage(xbee_packet.source_address, xbee_packet.source_port,
+                                xbee_packet.dest_port, xbee_packet.ip_protocol, xbee_packet.data,
+                                xbee_packet.timestamp)
+            self.__ip_data_received(message)
             self._log.info(self._LOG_PATTERN.format(port=self.__xbee_device.serial_port.port,
                                                     event="RECEIVED",
                                                     fr_type="IP DATA",
                                                     sender=str(xbee_packet.source_address),
-                                                    more_data=utils.hex_to_string(xbee_packet.data)))
+                                                    more_data=utils.hex_to_string(message.data)))
 
         # SMS
         elif xbee_packet.get_frame_type() == ApiFrameType.RX_SMS:
-            self.__sms_received(SMSMessage(xbee_packet.phone_number, xbee_packet.data))
+            self.__sms_received(SMSMessage(xbee_packet.phone_number, xbee_packet.data, xbee_packet.timestamp))
             self._log.info(self._LOG_PATTERN.format(port=self.__xbee_device.serial_port.port,
                                                     event="RECEIVED",
                                                     fr_type="SMS",
                                                     sender=str(xbee_packet.phone_number),
                                                     more_data=xbee_packet.data))
 
+    def __decode_payload(self, xbee_packet):
+        """
+        Decodes the payload of the provided data packet with the codec of the
+        XBee device, if any.
+
+        Args:
+            xbee_packet (:class:`.XBeeAPIPacket`): the received packet.
+
+        .. seealso::
+           | :meth:`.XBeeDevice.set_payload_codec`
+        """
+        codec = self.__xbee_device.get_payload_codec()
+        if codec is not None and xbee_packet.get_frame_type() in (ApiFrameType.RECEIVE_PACKET,
+                                                                  ApiFrameType.RX_64,
+                                                                  ApiFrameType.RX_16,
+                                                                  ApiFrameType.EXPLICIT_RX_INDICATOR):
+            xbee_packet.rf_data = codec.decode(xbee_packet.rf_data)
+
+    def __unpack_batch(self, xbee_packet):
+        """
+        Returns the packets of every message of the provided packet, if it is
+        a data packet with a batched payload and the XBee device unpacks them.
+
+        Args:
+            xbee_packet (:class:`.XBeeAPIPacket`): the received packet.
+
+        Returns:
+            List: the packets to process, ``xbee_packet`` alone if its payload is not batched.
+
+        .. seealso::
+           | :class:`.MessageBatcher`
+        """
+        if (not self.__xbee_device.is_batch_unpacking() or
+                xbee_packet.get_frame_type() not in (ApiFrameType.RECEIVE_PACKET,
+                                                     ApiFrameType.RX_64,
+                                                     ApiFrameType.RX_16,
+                                                     ApiFrameType.EXPLICIT_RX_INDICATOR)):
+            return [xbee_packet]
+
+        messages = digi.xbee.devices.MessageBatcher.unpack_messages(xbee_packet.rf_data)
+        if messages is None:
+            return [xbee_packet]
+
+        packets = []
+        for message in messages:
+            packet = copy.copy(xbee_packet)
+            packet.rf_data = message
+            packets.append(packet)
+        return packets
+
     def __try_read_packet(self):
         """
         Reads the next packet. Starts to read when finds the start delimiter.
@@ -626,14 +735,24 @@ class PacketListener(threading.Thread):
         If the method can't read a complete and correct packet,
         it will return ``None``.
 
+        If the XBee device works in escaped API mode, the packet is
+        unescaped while it is read.
+
         Returns:
             Bytearray: the read packet as bytearray if a packet is read, ``None`` otherwise.
         """
+        discarded = 0
         try:
             xbee_packet = bytearray(1)
             xbee_packet[0] = self.__serial_port.read_byte()
             while xbee_packet[0] != SpecialByte.HEADER_BYTE.value:
+                discarded += 1
                 xbee_packet[0] = self.__serial_port.read_byte()
+            if self.__xbee_device.operating_mode == OperatingMode.ESCAPED_API_MODE:
+                self.__read_unescaped_bytes(2, xbee_packet)
+                length = utils.length_to_int(xbee_packet[1:3])
+                self.__read_unescaped_bytes(length + 1, xbee_packet)
+                return xbee_packet
             packet_length = self.__serial_port.read_bytes(2)
             xbee_packet += packet_length
             length = utils.length_to_int(packet_length)
@@ -642,6 +761,35 @@ class PacketListener(threading.Thread):
             return xbee_packet
         except TimeoutException:
             return None
+        finally:
+            if discarded > 0:
+                metrics = self.__xbee_device.get_metrics()
+                if metrics is not None:
+                    metrics.increment(MetricsRegistry.DISCARDED_BYTES, discarded)
+
+    def __read_unescaped_bytes(self, num_bytes, buffer):
+        """
+        Reads the provided number of unescaped bytes from the serial port and
+        appends them to the given buffer.
+
+        Escaped data is always longer than the unescaped one, so the bytes
+        pending to be read are requested in bulk and unescaped at once.
+
+        Args:
+            num_bytes (Integer): the number of unescaped bytes to read.
+            buffer (Bytearray): the bytearray to append the unescaped bytes to.
+
+        Raises:
+            TimeoutException: if the bytes cannot be read before the read timeout expires.
+        """
+        target = len(buffer) + num_bytes
+        while len(buffer) < target:
+            data = self.__serial_port.read_bytes(target - len(buffer))
+            # An escape byte cannot be an escaped byte, so if it is the last
+            # one, the byte it escapes has not been read yet.
+            if data[-1] == SpecialByte.ESCAPE_BYTE.value:
+                data += self.__serial_port.read_bytes(1)
+            XBeePacket._unescape_data(data, buffer)
 
     def __create_remote_device_from_packet(self, xbee_packet):
         """
@@ -747,6 +895,8 @@ class PacketListener(threading.Thread):
         else:
             new_packet = ReceivePacket(xbee_packet.x64bit_source_addr, xbee_packet.x16bit_source_addr,
                                        xbee_packet.receive_options, xbee_packet.rf_data)
+        # The new packet was received when the explicit one was.
+        new_packet.timestamp = xbee_packet.timestamp
         return new_packet
 
     def __add_packet_queue(self, xbee_packet):
@@ -761,12 +911,12 @@ class PacketListener(threading.Thread):
         # Data packets.
         if xbee_packet.get_frame_type() in [ApiFrameType.RECEIVE_PACKET, ApiFrameType.RX_64, ApiFrameType.RX_16]:
             if self.__data_xbee_queue.full():
-                self.__data_xbee_queue.get()
+                self.__drop_packet(self.__data_xbee_queue.get())
             self.__data_xbee_queue.put_nowait(xbee_packet)
         # Explicit packets.
         if xbee_packet.get_frame_type() == ApiFrameType.EXPLICIT_RX_INDICATOR:
             if self.__explicit_xbee_queue.full():
-                self.__explicit_xbee_queue.get()
+                self.__drop_packet(self.__explicit_xbee_queue.get())
             self.__explicit_xbee_queue.put_nowait(xbee_packet)
             # Check if the explicit packet is 'special'.
             if self.__is_special_explicit_packet(xbee_packet):
@@ -775,14 +925,25 @@ class PacketListener(threading.Thread):
         # IP packets.
         elif xbee_packet.get_frame_type() == ApiFrameType.RX_IPV4:
             if self.__ip_xbee_queue.full():
-                self.__ip_xbee_queue.get()
+                self.__drop_packet(self.__ip_xbee_queue.get())
             self.__ip_xbee_queue.put_nowait(xbee_packet)
         # Rest of packets.
         else:
             if self.__xbee_queue.full():
-                self.__xbee_queue.get()
+                self.__drop_packet(self.__xbee_queue.get())
             self.__xbee_queue.put_nowait(xbee_packet)
 
+    def __drop_packet(self, xbee_packet):
+        """
+        Counts a packet dropped from a full queue.
+
+        Args:
+            xbee_packet (:class:`.XBeeAPIPacket`): the dropped packet.
+        """
+        metrics = self.__xbee_device.get_metrics()
+        if metrics is not None and xbee_packet is not None:
+            metrics.increment(MetricsRegistry.QUEUE_DROPS, label=xbee_packet.get_frame_type())
+
     @staticmethod
     def __expl_to_message(remote, broadcast, xbee_packet):
         """
@@ -797,11 +958,213 @@ class PacketListener(threading.Thread):
         Returns:
             :class:`.ExplicitXBeeMessage`: the explicit message generated from the provided parameters.
         """
-        return ExplicitXBeeMessage(xbee_packet.rf_data, remote, time.clock(), xbee_packet.source_endpoint,
+        return ExplicitXBeeMessage(xbee_packet.rf_data, remote, xbee_packet.timestamp, xbee_packet.source_endpoint,
                                    xbee_packet.dest_endpoint, xbee_packet.cluster_id,
                                    xbee_packet.profile_id, broadcast)
 
 
+class DuplicateFilter(object):
+    """
+    This class detects received frames that are copies of others received
+    shortly before, such as mesh retries or a broadcast heard by several
+    local XBee devices.
+
+    Two frames are considered the same if they have the same frame type,
+    source address and payload and they are received within the time window
+    of the filter. A frame sent twice on purpose within the window is also
+    considered a duplicate.
+
+    IO sample frames are not checked by default: periodic samples are often
+    identical, and dropping them would leave gaps in the sampled series.
+
+    The same filter can be shared by several local XBee devices, so a frame
+    received by all of them is processed only once.
+
+    .. seealso::
+       | :meth:`.XBeeDevice.set_duplicate_filter`
+    """
+
+    __DEFAULT_WINDOW = 1  # seconds
+    """
+    Default time window in which a frame is a duplicate of a previous one.
+    """
+
+    __DEFAULT_MAX_ENTRIES = 1024
+    """
+    Default maximum number of frames remembered.
+    """
+
+    IO_SAMPLE_FRAME_TYPES = frozenset((ApiFrameType.RX_IO_16, ApiFrameType.RX_IO_64,
+                                       ApiFrameType.IO_DATA_SAMPLE_RX_INDICATOR,
+                                       ApiFrameType.IO_DATA_SAMPLE_RX_INDICATOR_WIFI))
+    """
+    Frame types of the IO sample frames, not checked by default.
+    """
+
+    def __init__(self, window=__DEFAULT_WINDOW, max_entries=__DEFAULT_MAX_ENTRIES, frame_types=None):
+        """
+        Class constructor. Instantiates a new :class:`.DuplicateFilter` object with the provided parameters.
+
+        Args:
+            window (Float, optional, default=1): time window (in seconds) in which a frame is a duplicate of a
+                previous one.
+            max_entries (Integer, optional, default=1024): maximum number of frames remembered. When it is
+                reached, the oldest ones are forgotten.
+            frame_types (List, optional): the frame types (:class:`.ApiFrameType`) to check. ``None`` to check
+                all of them but the IO sample ones (see :attr:`.DuplicateFilter.IO_SAMPLE_FRAME_TYPES`).
+
+        Raises:
+            ValueError: if ``window`` or ``max_entries`` is not greater than 0.
+        """
+        if window <= 0:
+            raise ValueError("Window must be greater than 0")
+        if max_entries <= 0:
+            raise ValueError("Maximum number of entries must be greater than 0")
+
+        self.__window = window
+        self.__max_entries = max_entries
+        self.__frame_types = frozenset(frame_types) if frame_types is not None else None
+        self.__entries = OrderedDict()  # {Integer: Float}, oldest first.
+        self.__lock = threading.Lock()
+        self.__checked = 0
+        self.__hits = 0
+
+    def is_duplicate(self, xbee_packet):
+        """
+        Returns whether the provided frame is a duplicate of a frame received
+        within the time window, and remembers it otherwise.
+
+        Only frames with source address and payload, of the frame types of
+        the filter, are checked.
+
+        Args:
+            xbee_packet (:class:`.XBeeAPIPacket`): the received frame.
+
+        Returns:
+            Boolean: ``True`` if the frame is a duplicate, ``False`` otherwise.
+        """
+        frame_type = xbee_packet.get_frame_type()
+        if self.__frame_types is None:
+            if frame_type in DuplicateFilter.IO_SAMPLE_FRAME_TYPES:
+                return False
+        elif frame_type not in self.__frame_types:
+            return False
+
+        key = DuplicateFilter.__get_key(xbee_packet)
+        if key is None:
+            return False
+
+        now = time.monotonic()
+        with self.__lock:
+            self.__checked += 1
+            entries = self.__entries
+            # Forget the frames out of the window (the oldest are first).
+            deadline = now - self.__window
+            while entries:
+                oldest_key = next(iter(entries))
+                if entries[oldest_key] > deadline and len(entries) < self.__max_entries:
+                    break
+                del entries[oldest_key]
+            if key in entries:
+                self.__hits += 1
+                return True
+            entries[key] = now
+            return False
+
+    def reset(self):
+        """
+        Forgets all the frames received and resets the counters.
+        """
+        with self.__lock:
+            self.__entries.clear()
+            self.__checked = 0
+            self.__hits = 0
+
+    @staticmethod
+    def __get_key(xbee_packet):
+        """
+        Returns the key that identifies the provided frame.
+
+        Args:
+            xbee_packet (:class:`.XBeeAPIPacket`): the frame.
+
+        Returns:
+            Integer: the key of the frame, ``None`` if it has no source address or payload.
+        """
+        payload = getattr(xbee_packet, "rf_data", None)
+        if payload is None:
+            return None
+        if hasattr(xbee_packet, "x64bit_source_addr"):
+            source = xbee_packet.x64bit_source_addr.address
+        elif hasattr(xbee_packet, "x16bit_source_addr"):
+            source = xbee_packet.x16bit_source_addr.address
+        else:
+            return None
+        return hash((xbee_packet.get_frame_type().code, bytes(source), bytes(payload)))
+
+    def __get_window(self):
+        """
+        Returns the time window of the filter.
+
+        Returns:
+            Float: the time window in seconds.
+        """
+        return self.__window
+
+    def __get_frame_types(self):
+        """
+        Returns the frame types checked by the filter.
+
+        Returns:
+            Frozenset: the frame types (:class:`.ApiFrameType`) checked, ``None`` if all of them but the IO
+                sample ones are checked.
+        """
+        return self.__frame_types
+
+    def __get_checked(self):
+        """
+        Returns the number of frames checked.
+
+        Returns:
+            Integer: the number of frames checked.
+        """
+        return self.__checked
+
+    def __get_hits(self):
+        """
+        Returns the number of duplicate frames detected.
+
+        Returns:
+            Integer: the number of duplicate frames.
+        """
+        return self.__hits
+
+    def __get_hit_rate(self):
+        """
+        Returns the ratio of checked frames that were duplicates.
+
+        Returns:
+            Float: the ratio of duplicate frames, from 0 to 1.
+        """
+        checked = self.__checked
+        return self.__hits / checked if checked else 0.0
+
+    window = property(__get_window)
+    """Float. Time window (in seconds) in which a frame is a duplicate of a previous one."""
+
+    frame_types = property(__get_frame_types)
+    """Frozenset. Frame types checked, ``None`` if all of them but the IO sample ones are checked."""
+
+    checked = property(__get_checked)
+    """Integer. Number of frames checked."""
+
+    hits = property(__get_hits)
+    """Integer. Number of duplicate frames detected."""
+
+    hit_rate = property(__get_hit_rate)
+    """Float. Ratio of checked frames that were duplicates, from 0 to 1."""
+
+
 class XBeeQueue(Queue):
     """
     This class represents an XBee queue.
@@ -871,22 +1234,8 @@ class XBeeQueue(Queue):
             TimeoutException: if timeout is not ``None`` and there isn't any packet available that has
                 been sent by ``remote_xbee_device`` before the timeout expires.
         """
-        if timeout is None:
-            with self.mutex:
-                for xbee_packet in self.queue:
-                    if self.__remote_device_match(xbee_packet, remote_xbee_device):
-                        self.queue.remove(xbee_packet)
-                        return xbee_packet
-            return None
-        else:
-            xbee_packet = self.get_by_remote(remote_xbee_device, None)
-            dead_line = time.clock() + timeout
-            while xbee_packet is None and dead_line > time.clock():
-                time.sleep(0.1)
-                xbee_packet = self.get_by_remote(remote_xbee_device, None)
-            if xbee_packet is None:
-                raise TimeoutException()
-            return xbee_packet
+        return self.__get_matching(lambda xbee_packet: self.__remote_device_match(xbee_packet, remote_xbee_device),
+                                   timeout)
 
     def get_by_ip(self, ip_addr, timeout=None):
         """
@@ -909,22 +1258,7 @@ class XBeeQueue(Queue):
             TimeoutException: if timeout is not ``None`` and there isn't any packet available that has
                 been sent by ``remote_xbee_device`` before the timeout expires.
         """
-        if timeout is None:
-            with self.mutex:
-                for xbee_packet in self.queue:
-                    if self.__ip_addr_match(xbee_packet, ip_addr):
-                        self.queue.remove(xbee_packet)
-                        return xbee_packet
-            return None
-        else:
-            xbee_packet = self.get_by_ip(ip_addr, None)
-            dead_line = time.clock() + timeout
-            while xbee_packet is None and dead_line > time.clock():
-                time.sleep(0.1)
-                xbee_packet = self.get_by_ip(ip_addr, None)
-            if xbee_packet is None:
-                raise TimeoutException()
-            return xbee_packet
+        return self.__get_matching(lambda xbee_packet: self.__ip_addr_match(xbee_packet, ip_addr), timeout)
 
     def flush(self):
         """
@@ -933,6 +1267,50 @@ class XBeeQueue(Queue):
         with self.mutex:
             self.queue.clear()
 
+    def _put(self, item):
+        """
+        Override.
+
+        Wakes up all the threads waiting for a packet, not only one, as each
+        of them may be waiting for packets from a different sender.
+        """
+        Queue._put(self, item)
+        self.not_empty.notify_all()
+
+    def __get_matching(self, match, timeout):
+        """
+        Removes and returns the first element of the queue that matches,
+        waiting for it until the timeout expires.
+
+        The thread sleeps until a new packet is added to the queue or the
+        timeout expires, instead of checking the queue periodically.
+
+        Args:
+            match (Function): receives a packet and returns whether it is the one to get.
+            timeout (Integer): timeout in seconds, ``None`` to not wait.
+
+        Returns:
+            :class:`.XBeeAPIPacket`: the first matching packet, ``None`` if there is not any and ``timeout`` is
+                ``None``.
+
+        Raises:
+            TimeoutException: if ``timeout`` is not ``None`` and there isn't any matching packet before the
+                timeout expires.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.not_empty:
+            while True:
+                for xbee_packet in self.queue:
+                    if match(xbee_packet):
+                        self.queue.remove(xbee_packet)
+                        return xbee_packet
+                if deadline is None:
+                    return None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutException()
+                self.not_empty.wait(remaining)
+
     @staticmethod
     def __remote_device_match(xbee_packet, remote_xbee_device):
         """
@@ -0,0 +1,204 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2017 Digi International Inc. All Rights Reserved.
+
+import zlib
+
+
+class PayloadCodec(object):
+    """
+    This class compresses and decompresses the payloads exchanged between XBee
+    devices managed by this library.
+
+    Payloads are compressed with raw DEFLATE (no zlib header nor trailer, to
+    save airtime). Compressed payloads start with a marker byte, a header byte
+    that tells how they are encoded and a check byte (the low byte of the
+    CRC-32 of the original payload), so both ends of a link must use a codec
+    (with the same preset dictionary, if any) to exchange them.
+
+    Payloads that are too small or that compression does not reduce are sent
+    as they are, so they never grow. Only those starting with the marker byte
+    are wrapped in a header, so they cannot be mistaken for encoded ones.
+
+    Decoding is lenient: payloads without the marker and a known header, that
+    cannot be decompressed or whose check byte does not match are returned as
+    they are, so data from devices that do not use a codec is still
+    delivered unchanged.
+
+    .. seealso::
+       | :meth:`.XBeeDevice.set_payload_codec`
+    """
+
+    MARKER = 0xDC
+    """
+    First byte of every encoded payload.
+    """
+
+    HEADER_STORED = 0xFA
+    """
+    Header byte of payloads sent uncompressed that start with the marker byte.
+    """
+
+    HEADER_DEFLATE = 0xFB
+    """
+    Header byte of payloads compressed without preset dictionary.
+    """
+
+    HEADER_DEFLATE_DICT = 0xFC
+    """
+    Header byte of payloads compressed with a preset dictionary. It is
+    followed by the identifier of the dictionary.
+    """
+
+    __MIN_ENCODED_SIZE = 3
+    """
+    Size of the marker, header and check bytes.
+    """
+
+    __WBITS = -15
+    """
+    Raw DEFLATE stream with the maximum window size.
+    """
+
+    __DEFAULT_MIN_SIZE = 16
+    """
+    Payloads smaller than this number of bytes are never compressed.
+    """
+
+    __MAX_DECODED_SIZE = 0xFFFF
+    """
+    Maximum size of a decompressed payload.
+    """
+
+    def __init__(self, level=zlib.Z_BEST_COMPRESSION, dictionary=None, min_size=__DEFAULT_MIN_SIZE):
+        """
+        Class constructor. Instantiates a new :class:`.PayloadCodec` object with the provided parameters.
+
+        Args:
+            level (Integer, optional, default=9): compression level, from 0 to 9.
+            dictionary (Bytearray, optional): preset dictionary shared by both ends of the link. It should
+                contain the byte sequences most payloads repeat (field names, for example).
+            min_size (Integer, optional, default=16): payloads smaller than this number of bytes are never
+                compressed.
+
+        Raises:
+            ValueError: if ``level`` is not between 0 and 9 or ``min_size`` is negative.
+        """
+        if level < 0 or level > 9:
+            raise ValueError("level must be between 0 and 9.")
+        if min_size < 0:
+            raise ValueError("min_size cannot be negative.")
+
+        self.__level = level
+        self.__dictionary = bytes(dictionary) if dictionary else None
+        self.__dictionary_id = zlib.adler32(self.__dictionary) & 0xFF if self.__dictionary else None
+        self.__min_size = min_size
+
+    def encode(self, data):
+        """
+        Encodes the provided payload.
+
+        Args:
+            data (Bytearray): the payload to encode.
+
+        Returns:
+            Bytearray: the encoded payload, ``data`` itself if it is sent as it is.
+        """
+        check = zlib.crc32(data) & 0xFF
+        if len(data) >= self.__min_size:
+            if self.__dictionary is None:
+                header = bytearray((PayloadCodec.MARKER, PayloadCodec.HEADER_DEFLATE, check))
+                compressor = zlib.compressobj(self.__level, zlib.DEFLATED, PayloadCodec.__WBITS)
+            else:
+                header = bytearray((PayloadCodec.MARKER, PayloadCodec.HEADER_DEFLATE_DICT, check,
+                                    self.__dictionary_id))
+                compressor = zlib.compressobj(self.__level, zlib.DEFLATED, PayloadCodec.__WBITS,
+                                              zdict=self.__dictionary)
+            header += compressor.compress(data)
+            header += compressor.flush()
+            if len(header) < len(data):
+                return header
+
+        if len(data) == 0 or data[0] != PayloadCodec.MARKER:
+            return data
+        encoded = bytearray((PayloadCodec.MARKER, PayloadCodec.HEADER_STORED, check))
+        encoded += data
+        return encoded
+
+    def decode(self, data):
+        """
+        Decodes the provided payload.
+
+        Args:
+            data (Bytearray): the payload to decode.
+
+        Returns:
+            Bytearray: the decoded payload, or ``data`` if it was not encoded by a codec or cannot be decoded.
+        """
+        if len(data) < PayloadCodec.__MIN_ENCODED_SIZE or data[0] != PayloadCodec.MARKER:
+            return data
+
+        header = data[1]
+        check = data[2]
+        if header == PayloadCodec.HEADER_STORED:
+            # Only payloads starting with the marker are stored with a header.
+            decoded = data[3:]
+            if len(decoded) == 0 or decoded[0] != PayloadCodec.MARKER or zlib.crc32(decoded) & 0xFF != check:
+                return data
+            return decoded
+        if header == PayloadCodec.HEADER_DEFLATE:
+            decompressor = zlib.decompressobj(PayloadCodec.__WBITS)
+            compressed = memoryview(data)[3:]
+        elif header == PayloadCodec.HEADER_DEFLATE_DICT:
+            if self.__dictionary is None or len(data) < 4 or data[3] != self.__dictionary_id:
+                return data
+            decompressor = zlib.decompressobj(PayloadCodec.__WBITS, zdict=self.__dictionary)
+            compressed = memoryview(data)[4:]
+        else:
+            return data
+
+        try:
+            decoded = decompressor.decompress(compressed, PayloadCodec.__MAX_DECODED_SIZE)
+        except zlib.error:
+            return data
+        if not decompressor.eof or decompressor.unconsumed_tail or zlib.crc32(decoded) & 0xFF != check:
+            return data
+        return bytearray(decoded)
+
+    def __get_level(self):
+        """
+        Returns the compression level.
+
+        Returns:
+            Integer: the compression level.
+        """
+        return self.__level
+
+    def __get_dictionary(self):
+        """
+        Returns the preset dictionary.
+
+        Returns:
+            Bytes: the preset dictionary, ``None`` if the codec does not use it.
+        """
+        return self.__dictionary
+
+    def __get_min_size(self):
+        """
+        Returns the minimum size of the payloads to compress.
+
+        Returns:
+            Integer: the minimum size of the payloads to compress.
+        """
+        return self.__min_size
+
+    level = property(__get_level)
+    """Integer. Compression level."""
+
+    dictionary = property(__get_dictionary)
+    """Bytes. Preset dictionary, ``None`` if the codec does not use it."""
+
+    min_size = property(__get_min_size)
+    """Integer. Payloads smaller than this number of bytes are never compressed."""
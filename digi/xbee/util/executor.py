@@ -0,0 +1,354 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2017 Digi International Inc. All Rights Reserved.
+
+from collections import deque
+import logging
+import threading
+
+from digi.xbee.exception import XBeeException, TimeoutException
+
+
+class Task(object):
+    """
+    This class represents a job submitted to a :class:`.TaskExecutor`. It
+    allows to wait for the job, get its result and cancel it.
+
+    A task that has not started yet is never run once cancelled. A running
+    task cannot be interrupted: cancelling it calls its cancel function (if
+    any) and marks it as cancelled, so the job can check
+    :meth:`.Task.is_cancelled` and finish early.
+
+    .. seealso::
+       | :meth:`.TaskExecutor.submit`
+    """
+
+    __PENDING = 0
+    __RUNNING = 1
+    __FINISHED = 2
+
+    def __init__(self, function, args, kwargs, on_cancel=None):
+        """
+        Class constructor. Instantiates a new :class:`.Task` object with the provided parameters.
+
+        Args:
+            function (Function): the function to run.
+            args (Tuple): the positional arguments of the function.
+            kwargs (Dictionary): the keyword arguments of the function.
+            on_cancel (Function, optional): function without arguments called when the task is cancelled
+                while running.
+        """
+        self.__function = function
+        self.__args = args
+        self.__kwargs = kwargs
+        self.__on_cancel = on_cancel
+        self.__state = Task.__PENDING
+        self.__cancelled = False
+        self.__started = False
+        self.__result = None
+        self.__exception = None
+        self.__done = threading.Event()
+        self.__lock = threading.Lock()
+
+    def cancel(self):
+        """
+        Cancels the task.
+
+        Returns:
+            Boolean: ``True`` if the task was cancelled, ``False`` if it had already finished or been
+                cancelled.
+        """
+        with self.__lock:
+            if self.__state == Task.__FINISHED or self.__cancelled:
+                return False
+            self.__cancelled = True
+            pending = self.__state == Task.__PENDING
+            if pending:
+                self.__state = Task.__FINISHED
+        if pending:
+            self.__done.set()
+        elif self.__on_cancel is not None:
+            self.__on_cancel()
+        return True
+
+    def is_cancelled(self):
+        """
+        Returns whether the task has been cancelled.
+
+        Returns:
+            Boolean: ``True`` if the task has been cancelled, ``False`` otherwise.
+        """
+        return self.__cancelled
+
+    def has_started(self):
+        """
+        Returns whether the function of the task has been started. A task
+        cancelled before starting never starts.
+
+        Returns:
+            Boolean: ``True`` if the function has been started, ``False`` otherwise.
+        """
+        return self.__started
+
+    def is_running(self):
+        """
+        Returns whether the task is running.
+
+        Returns:
+            Boolean: ``True`` if the task is running, ``False`` otherwise.
+        """
+        return self.__state == Task.__RUNNING
+
+    def is_done(self):
+        """
+        Returns whether the task has finished, either because it has been run
+        or because it was cancelled before starting.
+
+        Returns:
+            Boolean: ``True`` if the task has finished, ``False`` otherwise.
+        """
+        return self.__done.is_set()
+
+    def wait(self, timeout=None):
+        """
+        Blocks until the task finishes or the timeout expires.
+
+        Args:
+            timeout (Float, optional): maximum number of seconds to wait, ``None`` to wait forever.
+
+        Returns:
+            Boolean: ``True`` if the task has finished, ``False`` if the timeout expired.
+        """
+        return self.__done.wait(timeout)
+
+    def get_result(self, timeout=None):
+        """
+        Blocks until the task finishes and returns the value returned by its
+        function.
+
+        Args:
+            timeout (Float, optional): maximum number of seconds to wait, ``None`` to wait forever.
+
+        Returns:
+            The value returned by the function of the task.
+
+        Raises:
+            TimeoutException: if the task does not finish before the timeout expires.
+            XBeeException: if the task was cancelled before starting.
+            Exception: the exception raised by the function of the task, if any.
+        """
+        if not self.__done.wait(timeout):
+            raise TimeoutException()
+        if self.__exception is not None:
+            raise self.__exception
+        if self.__cancelled and self.__function is not None:
+            raise XBeeException("Task cancelled before starting")
+        return self.__result
+
+    def _run(self):
+        """
+        Runs the function of the task unless it has been cancelled.
+
+        Returns:
+            Boolean: ``True`` if the function was run, ``False`` if the task was cancelled.
+        """
+        with self.__lock:
+            if self.__state != Task.__PENDING:
+                return False
+            self.__state = Task.__RUNNING
+            self.__started = True
+
+        function, self.__function = self.__function, None
+        try:
+            self.__result = function(*self.__args, **self.__kwargs)
+        except Exception as e:
+            self.__exception = e
+        finally:
+            self.__args = self.__kwargs = None
+            with self.__lock:
+                self.__state = Task.__FINISHED
+            self.__done.set()
+        return True
+
+    def __get_exception(self):
+        """
+        Returns the exception raised by the function of the task.
+
+        Returns:
+            Exception: the exception raised by the function, ``None`` if it did not raise any or has not finished.
+        """
+        return self.__exception
+
+    exception = property(__get_exception)
+    """Exception. Exception raised by the function of the task, ``None`` if it did not raise any."""
+
+
+class TaskExecutor(object):
+    """
+    This class runs the background jobs of the library in a bounded pool of
+    worker threads.
+
+    Worker threads are created on demand, up to the maximum number of
+    workers, and finish after being idle for some seconds, so the number of
+    threads is predictable no matter how many jobs are submitted. Jobs that
+    arrive while all the workers are busy wait in order.
+
+    An executor can be shared by several devices, so a gateway with many
+    radios can run all their jobs with a fixed number of threads.
+
+    .. seealso::
+       | :class:`.Task`
+       | :meth:`.XBeeDevice.set_executor`
+    """
+
+    __DEFAULT_MAX_WORKERS = 4
+    """
+    Default maximum number of worker threads.
+    """
+
+    __IDLE_TIMEOUT = 30
+    """
+    Seconds a worker thread waits for new jobs before finishing.
+    """
+
+    _log = logging.getLogger(__name__)
+    """
+    Logger.
+    """
+
+    def __init__(self, max_workers=__DEFAULT_MAX_WORKERS, name="XBeeExecutor"):
+        """
+        Class constructor. Instantiates a new :class:`.TaskExecutor` object with the provided parameters.
+
+        Args:
+            max_workers (Integer, optional, default=4): maximum number of jobs running at the same time.
+            name (String, optional): prefix of the names of the worker threads.
+
+        Raises:
+            ValueError: if ``max_workers`` is not greater than 0.
+        """
+        if max_workers <= 0:
+            raise ValueError("Maximum number of workers must be greater than 0")
+
+        self.__max_workers = max_workers
+        self.__name = name
+        self.__tasks = deque()
+        self.__workers = 0
+        self.__busy_workers = 0
+        self.__shutdown = False
+        self.__condition = threading.Condition()
+
+    def submit(self, function, *args, on_cancel=None, **kwargs):
+        """
+        Schedules the provided function to be run by a worker thread.
+
+        Args:
+            function (Function): the function to run.
+            *args: positional arguments of the function.
+            on_cancel (Function, optional): function without arguments called if the task is cancelled while
+                running.
+            **kwargs: keyword arguments of the function.
+
+        Returns:
+            :class:`.Task`: the handle of the scheduled job.
+
+        Raises:
+            XBeeException: if the executor has been shut down.
+        """
+        task = Task(function, args, kwargs, on_cancel=on_cancel)
+        with self.__condition:
+            if self.__shutdown:
+                raise XBeeException("Executor shut down")
+            self.__tasks.append(task)
+            self.__condition.notify()
+            if self.__workers < self.__max_workers and self.__busy_workers + len(self.__tasks) > self.__workers:
+                self.__workers += 1
+                threading.Thread(target=self.__work, name="%s-%d" % (self.__name, self.__workers),
+                                 daemon=True).start()
+        return task
+
+    def shutdown(self, cancel_pending=False):
+        """
+        Stops accepting new jobs. Worker threads finish once the jobs already
+        submitted have been run.
+
+        Args:
+            cancel_pending (Boolean, optional, default=``False``): ``True`` to cancel the jobs that have not
+                started yet.
+        """
+        with self.__condition:
+            self.__shutdown = True
+            pending = list(self.__tasks) if cancel_pending else []
+            self.__condition.notify_all()
+        for task in pending:
+            task.cancel()
+
+    def is_shutdown(self):
+        """
+        Returns whether the executor has been shut down.
+
+        Returns:
+            Boolean: ``True`` if the executor has been shut down, ``False`` otherwise.
+        """
+        return self.__shutdown
+
+    def __work(self):
+        """
+        Runs the jobs of the queue until the executor is shut down or there
+        are no jobs for :attr:`__IDLE_TIMEOUT` seconds.
+        """
+        while True:
+            with self.__condition:
+                while not self.__tasks:
+                    if self.__shutdown or not self.__condition.wait(TaskExecutor.__IDLE_TIMEOUT):
+                        if not self.__tasks:
+                            self.__workers -= 1
+                            return
+                task = self.__tasks.popleft()
+                self.__busy_workers += 1
+
+            try:
+                task._run()
+            except Exception as e:
+                self._log.exception(e)
+            finally:
+                with self.__condition:
+                    self.__busy_workers -= 1
+
+    def __get_max_workers(self):
+        """
+        Returns the maximum number of jobs running at the same time.
+
+        Returns:
+            Integer: the maximum number of worker threads.
+        """
+        return self.__max_workers
+
+    def __get_workers(self):
+        """
+        Returns the number of worker threads alive.
+
+        Returns:
+            Integer: the number of worker threads.
+        """
+        return self.__workers
+
+    def __get_pending(self):
+        """
+        Returns the number of jobs waiting for a worker thread.
+
+        Returns:
+            Integer: the number of pending jobs.
+        """
+        return len(self.__tasks)
+
+    max_workers = property(__get_max_workers)
+    """Integer. Maximum number of jobs running at the same time."""
+
+    workers = property(__get_workers)
+    """Integer. Number of worker threads alive."""
+
+    pending = property(__get_pending)
+    """Integer. Number of jobs waiting for a worker thread."""
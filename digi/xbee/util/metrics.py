@@ -0,0 +1,405 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2017 Digi International Inc. All Rights Reserved.
+
+from bisect import bisect_left
+import threading
+import time
+
+from digi.xbee.packets.aft import ApiFrameType
+
+
+class Histogram(object):
+    """
+    This class counts values in a fixed set of buckets, so it keeps the
+    distribution of a measurement (a latency, for example) in constant
+    memory.
+
+    Each bucket counts the values less than or equal to its upper bound and
+    greater than the previous bound. Values greater than the last bound are
+    counted in an extra overflow bucket.
+
+    .. seealso::
+       | :class:`.MetricsRegistry`
+    """
+
+    DEFAULT_BOUNDS = tuple(0.0001 * 2 ** i for i in range(20))
+    """
+    Default upper bounds of the buckets, in seconds: from 100 us to 52 s.
+    """
+
+    def __init__(self, bounds=DEFAULT_BOUNDS):
+        """
+        Class constructor. Instantiates a new :class:`.Histogram` object with the provided parameters.
+
+        Args:
+            bounds (Tuple, optional): increasing upper bounds of the buckets. Defaults to
+                :attr:`.Histogram.DEFAULT_BOUNDS`.
+
+        Raises:
+            ValueError: if ``bounds`` is empty or not increasing.
+        """
+        if not bounds:
+            raise ValueError("Histogram must have at least one bucket")
+        if any(bounds[i] >= bounds[i + 1] for i in range(len(bounds) - 1)):
+            raise ValueError("Bucket bounds must be increasing")
+
+        self.__bounds = tuple(bounds)
+        self.__buckets = [0] * (len(bounds) + 1)
+        self.__count = 0
+        self.__sum = 0
+        self.__min = None
+        self.__max = None
+
+    def add(self, value):
+        """
+        Counts the provided value.
+
+        Args:
+            value (Float): the value to count.
+        """
+        self.__buckets[bisect_left(self.__bounds, value)] += 1
+        self.__count += 1
+        self.__sum += value
+        if self.__min is None or value < self.__min:
+            self.__min = value
+        if self.__max is None or value > self.__max:
+            self.__max = value
+
+    def get_percentile(self, percent):
+        """
+        Returns an approximation of the provided percentile: the upper bound
+        of the bucket it falls in, limited to the maximum value counted.
+
+        Args:
+            percent (Float): the percentile, from 0 to 100.
+
+        Returns:
+            Float: the approximated percentile, ``None`` if no value has been counted.
+
+        Raises:
+            ValueError: if ``percent`` is not between 0 and 100.
+        """
+        if percent < 0 or percent > 100:
+            raise ValueError("Percent must be between 0 and 100")
+        if self.__count == 0:
+            return None
+
+        rank = percent * self.__count / 100
+        accumulated = 0
+        for i, bucket in enumerate(self.__buckets):
+            accumulated += bucket
+            if bucket > 0 and accumulated >= rank:
+                if i == len(self.__bounds):
+                    return self.__max
+                return min(self.__bounds[i], self.__max)
+        return self.__max
+
+    def to_dict(self):
+        """
+        Returns the statistics of the histogram in a dictionary.
+
+        Returns:
+            Dictionary: ``count``, ``sum``, ``min``, ``max``, ``mean``, ``p50``, ``p90`` and ``p99`` of the
+                counted values, and ``buckets``, a list of (upper bound, count) tuples of the non-empty
+                buckets (the upper bound of the overflow bucket is ``None``).
+        """
+        buckets = []
+        for i, bucket in enumerate(self.__buckets):
+            if bucket > 0:
+                buckets.append((self.__bounds[i] if i < len(self.__bounds) else None, bucket))
+        return {"count": self.__count,
+                "sum": self.__sum,
+                "min": self.__min,
+                "max": self.__max,
+                "mean": self.__sum / self.__count if self.__count > 0 else None,
+                "p50": self.get_percentile(50),
+                "p90": self.get_percentile(90),
+                "p99": self.get_percentile(99),
+                "buckets": buckets}
+
+    def __get_bounds(self):
+        """
+        Returns the upper bounds of the buckets.
+
+        Returns:
+            Tuple: the upper bounds of the buckets.
+        """
+        return self.__bounds
+
+    def __get_count(self):
+        """
+        Returns the number of values counted.
+
+        Returns:
+            Integer: the number of values counted.
+        """
+        return self.__count
+
+    def __get_sum(self):
+        """
+        Returns the sum of the values counted.
+
+        Returns:
+            Float: the sum of the values counted.
+        """
+        return self.__sum
+
+    def __get_min(self):
+        """
+        Returns the minimum value counted.
+
+        Returns:
+            Float: the minimum value, ``None`` if no value has been counted.
+        """
+        return self.__min
+
+    def __get_max(self):
+        """
+        Returns the maximum value counted.
+
+        Returns:
+            Float: the maximum value, ``None`` if no value has been counted.
+        """
+        return self.__max
+
+    bounds = property(__get_bounds)
+    """Tuple. Upper bounds of the buckets."""
+
+    count = property(__get_count)
+    """Integer. Number of values counted."""
+
+    sum = property(__get_sum)
+    """Float. Sum of the values counted."""
+
+    min = property(__get_min)
+    """Float. Minimum value counted, ``None`` if no value has been counted."""
+
+    max = property(__get_max)
+    """Float. Maximum value counted, ``None`` if no value has been counted."""
+
+
+class MetricsRegistry(object):
+    """
+    This class collects counters and latency histograms of the activity of
+    an XBee device and its packet listener.
+
+    Metrics are collected only while a registry is set in the XBee device,
+    so they cost nothing otherwise. Counters and histograms are identified by
+    a name and, optionally, a label (the :class:`.ApiFrameType` of the frames
+    or the AT command, for example):
+
+    - :attr:`.MetricsRegistry.FRAMES_IN` and :attr:`.MetricsRegistry.BYTES_IN`:
+      frames received and their bytes, by frame type.
+    - :attr:`.MetricsRegistry.FRAMES_OUT` and :attr:`.MetricsRegistry.BYTES_OUT`:
+      frames sent and their bytes, by frame type.
+    - :attr:`.MetricsRegistry.FRAMING_ERRORS`: received frames discarded
+      because of a wrong length or checksum.
+    - :attr:`.MetricsRegistry.DISCARDED_BYTES`: bytes discarded while looking
+      for the start delimiter of a frame.
+    - :attr:`.MetricsRegistry.QUEUE_DROPS`: received packets dropped from a
+      full queue, by frame type.
+    - :attr:`.MetricsRegistry.SYNC_TIMEOUTS`: synchronous operations without
+      response, by frame type of the request.
+    - :attr:`.MetricsRegistry.AT_COMMAND_RTT`: seconds from sending an AT
+      command (local or remote) to receiving its response, by command.
+    - :attr:`.MetricsRegistry.TRANSMIT_STATUS_LATENCY`: seconds from sending a
+      transmit request to receiving its transmit status, by frame type of the
+      request.
+    - :attr:`.MetricsRegistry.CALLBACK_TIME`: seconds spent in the user
+      callbacks of each received packet, by frame type.
+
+    Byte counts are the size of the frames without escaping.
+
+    .. seealso::
+       | :class:`.Histogram`
+       | :meth:`.XBeeDevice.set_metrics`
+    """
+
+    FRAMES_IN = "frames_in"
+    BYTES_IN = "bytes_in"
+    FRAMES_OUT = "frames_out"
+    BYTES_OUT = "bytes_out"
+    FRAMING_ERRORS = "framing_errors"
+    DISCARDED_BYTES = "discarded_bytes"
+    QUEUE_DROPS = "queue_drops"
+    SYNC_TIMEOUTS = "sync_timeouts"
+    AT_COMMAND_RTT = "at_command_rtt"
+    TRANSMIT_STATUS_LATENCY = "transmit_status_latency"
+    CALLBACK_TIME = "callback_time"
+
+    __AT_RESPONSES = {
+        ApiFrameType.AT_COMMAND: ApiFrameType.AT_COMMAND_RESPONSE,
+        ApiFrameType.REMOTE_AT_COMMAND_REQUEST: ApiFrameType.REMOTE_AT_COMMAND_RESPONSE,
+        ApiFrameType.REMOTE_AT_COMMAND_REQUEST_WIFI: ApiFrameType.REMOTE_AT_COMMAND_RESPONSE_WIFI,
+    }
+    """
+    Response frame type of each AT command frame type.
+    """
+
+    __TRANSMIT_RESPONSES = {
+        ApiFrameType.TRANSMIT_REQUEST: ApiFrameType.TRANSMIT_STATUS,
+        ApiFrameType.EXPLICIT_ADDRESSING: ApiFrameType.TRANSMIT_STATUS,
+        ApiFrameType.TX_64: ApiFrameType.TX_STATUS,
+        ApiFrameType.TX_16: ApiFrameType.TX_STATUS,
+        ApiFrameType.TX_IPV4: ApiFrameType.TX_STATUS,
+        ApiFrameType.TX_SMS: ApiFrameType.TX_STATUS,
+    }
+    """
+    Transmit status frame type of each transmit request frame type.
+    """
+
+    def __init__(self):
+        """
+        Class constructor. Instantiates a new :class:`.MetricsRegistry` object.
+        """
+        self.__counters = {}  # {String: {label: Integer}}
+        self.__histograms = {}  # {String: {label: Histogram}}
+        self.__requests = {}  # {(ApiFrameType, Integer): (String, label, Integer)}
+        self.__start_time = time.monotonic()
+        self.__lock = threading.Lock()
+
+    def increment(self, name, amount=1, label=None):
+        """
+        Increments the provided counter.
+
+        Args:
+            name (String): the name of the counter.
+            amount (Integer, optional, default=1): the amount to add.
+            label (optional): the label of the counter, ``None`` for none.
+        """
+        with self.__lock:
+            counters = self.__counters.get(name)
+            if counters is None:
+                counters = self.__counters[name] = {}
+            counters[label] = counters.get(label, 0) + amount
+
+    def observe(self, name, value, label=None):
+        """
+        Adds the provided value to a histogram.
+
+        Args:
+            name (String): the name of the histogram.
+            value (Float): the value to add.
+            label (optional): the label of the histogram, ``None`` for none.
+        """
+        with self.__lock:
+            histograms = self.__histograms.get(name)
+            if histograms is None:
+                histograms = self.__histograms[name] = {}
+            histogram = histograms.get(label)
+            if histogram is None:
+                histogram = histograms[label] = Histogram()
+            histogram.add(value)
+
+    def get_counter(self, name, label=None):
+        """
+        Returns the value of the provided counter.
+
+        Args:
+            name (String): the name of the counter.
+            label (optional): the label of the counter, ``None`` to get the sum of all the labels.
+
+        Returns:
+            Integer: the value of the counter.
+        """
+        with self.__lock:
+            counters = self.__counters.get(name, {})
+            if label is None:
+                return sum(counters.values())
+            return counters.get(label, 0)
+
+    def get_histogram(self, name, label=None):
+        """
+        Returns the statistics of the provided histogram.
+
+        Args:
+            name (String): the name of the histogram.
+            label (optional): the label of the histogram, ``None`` for none.
+
+        Returns:
+            Dictionary: the statistics of the histogram (see :meth:`.Histogram.to_dict`), ``None`` if no
+                value has been added to it.
+        """
+        with self.__lock:
+            histogram = self.__histograms.get(name, {}).get(label)
+            return histogram.to_dict() if histogram is not None else None
+
+    def snapshot(self):
+        """
+        Returns a copy of all the metrics collected.
+
+        Returns:
+            Dictionary: ``uptime`` (seconds since the registry was created or reset), ``counters``
+                (``{name: {label: value}}``) and ``histograms`` (``{name: {label: statistics}}``, see
+                :meth:`.Histogram.to_dict`).
+        """
+        with self.__lock:
+            return {"uptime": time.monotonic() - self.__start_time,
+                    "counters": {name: dict(counters) for name, counters in self.__counters.items()},
+                    "histograms": {name: {label: histogram.to_dict() for label, histogram in histograms.items()}
+                                   for name, histograms in self.__histograms.items()}}
+
+    def reset(self):
+        """
+        Clears all the metrics collected.
+        """
+        with self.__lock:
+            self.__counters.clear()
+            self.__histograms.clear()
+            self.__requests.clear()
+            self.__start_time = time.monotonic()
+
+    def _frame_sent(self, packet, num_bytes):
+        """
+        Counts a frame that is going to be sent and, if it expects a response,
+        remembers when it was sent to measure the response latency.
+
+        This is only for internal use.
+
+        Args:
+            packet (:class:`.XBeeAPIPacket`): the packet to send.
+            num_bytes (Integer): the size of the frame.
+        """
+        frame_type = packet.get_frame_type()
+        self.increment(MetricsRegistry.FRAMES_OUT, label=frame_type)
+        self.increment(MetricsRegistry.BYTES_OUT, num_bytes, label=frame_type)
+
+        if not packet.needs_id() or packet.frame_id == 0:
+            return
+        if frame_type in MetricsRegistry.__AT_RESPONSES:
+            response_type = MetricsRegistry.__AT_RESPONSES[frame_type]
+            request = (MetricsRegistry.AT_COMMAND_RTT, packet.command, time.monotonic_ns())
+        elif frame_type in MetricsRegistry.__TRANSMIT_RESPONSES:
+            response_type = MetricsRegistry.__TRANSMIT_RESPONSES[frame_type]
+            request = (MetricsRegistry.TRANSMIT_STATUS_LATENCY, frame_type, time.monotonic_ns())
+        else:
+            return
+        # Frame IDs are reused, so the entries are overwritten instead of growing.
+        with self.__lock:
+            self.__requests[(response_type, packet.frame_id)] = request
+
+    def _frame_received(self, packet, num_bytes):
+        """
+        Counts a received frame and, if it is the response of a sent one,
+        measures its latency.
+
+        This is only for internal use.
+
+        Args:
+            packet (:class:`.XBeeAPIPacket`): the received packet.
+            num_bytes (Integer): the size of the frame.
+        """
+        frame_type = packet.get_frame_type()
+        self.increment(MetricsRegistry.FRAMES_IN, label=frame_type)
+        self.increment(MetricsRegistry.BYTES_IN, num_bytes, label=frame_type)
+
+        if not self.__requests or not packet.needs_id():
+            return
+        with self.__lock:
+            request = self.__requests.pop((frame_type, packet.frame_id), None)
+        if request is not None:
+            received = packet.timestamp if packet.timestamp is not None else time.monotonic_ns()
+            self.observe(request[0], (received - request[2]) / 1e9, label=request[1])
@@ -7,12 +7,9 @@
 import logging
 
 
-# Number of bits to extract with the mask (__MASK)
+# Number of bits of a byte.
 __MASK_NUM_BITS = 8
 
-# Bit mask to extract the less important __MAS_NUM_BITS bits of a number.
-__MASK = 0xFF
-
 
 def is_bit_enabled(number, position):
     """
@@ -86,18 +83,10 @@ def int_to_bytes(number, num_bytes=None):
         <type 'bytearray'>
         
     """
-    byte_array = bytearray()
-    byte_array.insert(0, number & __MASK)
-    number >>= __MASK_NUM_BITS
-    while number != 0:
-        byte_array.insert(0, number & __MASK)
-        number >>= __MASK_NUM_BITS
-
-    if num_bytes is not None:
-        while len(byte_array) < num_bytes:
-            byte_array.insert(0, 0x00)
-
-    return byte_array
+    length = max(1, (number.bit_length() + __MASK_NUM_BITS - 1) // __MASK_NUM_BITS)
+    if num_bytes is not None and num_bytes > length:
+        length = num_bytes
+    return bytearray(number.to_bytes(length, "big"))
 
 
 def length_to_int(byte_array):
@@ -147,9 +136,7 @@ def bytes_to_int(byte_array):
         >>> print(bytes_to_int(b))
         2730
     """
-    if len(byte_array) == 0:
-        return 0
-    return int("".join(["%02X" % i for i in byte_array]), 16)
+    return int.from_bytes(byte_array, "big")
 
 
 def ascii_to_int(ni):
@@ -224,10 +211,7 @@ def int_to_length(number):
     """
     if number < 0 or number > 0xFFFF:
         raise ValueError("The number must be between 0 and 0xFFFF.")
-    length = int_to_bytes(number)
-    if len(length) < 2:
-        length.insert(0, 0)
-    return length
+    return bytearray(number.to_bytes(2, "big"))
 
 
 def hex_to_string(byte_array):
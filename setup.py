@@ -29,7 +29,7 @@ setup(
     packages=find_packages(exclude=('unit_test*', 'functional_tests*', 'demos*')),
     keywords=['xbee', 'IOT', 'wireless', 'radio frequency'],
     license='Mozilla Public License 2.0 (MPL 2.0)',
-    python_requires='>=3',
+    python_requires='>=3.7',
     install_requires=[
         'pyserial>=3',
     ],
@@ -43,6 +43,8 @@ setup(
         'Topic :: Games/Entertainment',
         'License :: OSI Approved :: Mozilla Public License 2.0 (MPL 2.0)',
         'Programming Language :: Python :: 3',
+        'Programming Language :: Python :: 3 :: Only',
+        'Programming Language :: Python :: 3.7',
         'Operating System :: OS Independent',
     ],
 )